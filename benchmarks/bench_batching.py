@@ -0,0 +1,90 @@
+"""Compare request throughput and latency with and without request coalescing.
+
+Simulates concurrent clients each scoring one message at a time, either by
+calling EmotionCalculator.calculate_emotion directly or through a MicroBatcher.
+
+Usage:
+    python benchmarks/bench_batching.py --clients 64 --requests 4000
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Callable, List, Tuple
+
+from corpus import generate_corpus
+
+from emotion_calculator import EmotionCalculator
+from emotion_calculator.core.batching import MicroBatcher
+from emotion_calculator.core.semantic import SemanticAnalyzer
+
+
+def run_clients(call: Callable[[str], object], texts: List[str], clients: int) -> Tuple[float, List[float]]:
+    """Send every text from concurrent client threads; return elapsed time and latencies."""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    iterator = iter(texts)
+    
+    def client() -> None:
+        while True:
+            with lock:
+                text = next(iterator, None)
+            if text is None:
+                return
+            start = time.perf_counter()
+            call(text)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+    
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def report(label: str, elapsed: float, latencies: List[float]) -> None:
+    """Print throughput and latency percentiles for one run."""
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:>10}: {len(latencies) / elapsed:8.1f} req/s   "
+        f"p50 {quantiles[49] * 1000:7.2f} ms   p99 {quantiles[98] * 1000:7.2f} ms"
+    )
+
+
+def main() -> None:
+    """Run the direct and coalesced scenarios."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--blank", action="store_true", help="Use a blank spaCy pipeline (no model download)")
+    args = parser.parse_args()
+    
+    if args.blank:
+        import spacy
+        calculator = EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=spacy.blank("en")))
+    else:
+        calculator = EmotionCalculator()
+    texts = [record["text"] for record in generate_corpus(args.requests, max_words=30)]
+    calculator.calculate_emotion(texts[0])  # Load the model before timing
+    
+    report("direct", *run_clients(calculator.calculate_emotion, texts, args.clients))
+    
+    batcher = MicroBatcher(
+        calculator.calculate_emotions, 
+        max_batch_size=args.max_batch_size, 
+        max_wait=args.max_wait_ms / 1000.0
+    )
+    report("coalesced", *run_clients(batcher.process, texts, args.clients))
+    print(f"mean batch size: {batcher.stats()['mean_batch_size']:.1f}")
+    batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark the scaling of ParallelEmotionCalculator with the number of workers.
+
+Usage:
+    python benchmarks/bench_parallel.py --messages 20000 --max-workers 32
+"""
+
+import argparse
+import functools
+import multiprocessing
+import time
+from typing import List
+
+from corpus import generate_corpus
+
+from emotion_calculator.core.parallel import ParallelEmotionCalculator
+
+
+def worker_counts(max_workers: int) -> List[int]:
+    """Return 1, 2, 4, ... up to and including max_workers."""
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main() -> None:
+    """Run the scaling benchmark and print one line per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000, help="Number of messages to score")
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--profile", default="fast", help="Analyzer profile loaded by the workers")
+    parser.add_argument("--blank", action="store_true", help="Use a blank spaCy pipeline (no model download)")
+    args = parser.parse_args()
+    
+    records = generate_corpus(args.messages, max_words=40)
+    texts = [record["text"] for record in records]
+    relationships = [record["relationship"] for record in records]
+    nlp_factory = None
+    if args.blank:
+        import spacy
+        nlp_factory = functools.partial(spacy.blank, "en")
+    
+    print(f"{'workers':>8} {'seconds':>9} {'msgs/sec':>10} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        with ParallelEmotionCalculator(
+            workers=workers, chunk_size=args.chunk_size, profile=args.profile, nlp_factory=nlp_factory
+        ) as calculator:
+            # Warm up so model loading in the initializers is not timed
+            calculator.calculate_emotions(texts[:workers * args.chunk_size])
+            start = time.perf_counter()
+            calculator.calculate_emotions(texts, relationships=relationships)
+            elapsed = time.perf_counter() - start
+        
+        rate = len(texts) / elapsed
+        baseline = baseline or rate
+        speedup = rate / baseline
+        print(f"{workers:>8} {elapsed:>9.2f} {rate:>10.1f} {speedup:>8.2f} {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
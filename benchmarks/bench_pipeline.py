@@ -0,0 +1,293 @@
+"""Measure per-stage latency and throughput of the emotion pipeline, with regression checks.
+
+Stages timed one message at a time:
+    semantic   SemanticAnalyzer.analyze
+    context    ContextJudge.determine_context
+    mapping    EmotionMapper.map_emotions
+    end_to_end EmotionCalculator.calculate_emotion
+and one batch at a time:
+    batch      EmotionCalculator.calculate_emotions
+
+Also reports model load time and peak RSS. Results can be saved as a JSON
+baseline and later runs compared against it; the script exits with status 1
+when a metric regresses by more than the threshold.
+
+Usage:
+    python benchmarks/bench_pipeline.py --messages 2000 --save-baseline benchmarks/baselines/local.json
+    python benchmarks/bench_pipeline.py --messages 2000 --compare benchmarks/baselines/local.json --threshold 0.15
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from corpus import generate_corpus
+
+from emotion_calculator.core import nlp_registry
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+
+# Metrics compared against a baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "p50_ms": False,
+    "p99_ms": False,
+    "msgs_per_sec": True,
+}
+
+# Run settings that make results incomparable when they differ from the baseline's
+COMPARED_SETTINGS = ("model", "profile", "sentiment", "fast_path", "batch_size")
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], messages: int) -> Dict[str, float]:
+    """Summarize per-call latencies (seconds) for calls covering the given number of messages."""
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        "calls": len(ordered),
+        "mean_ms": total / len(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p90_ms": percentile(ordered, 0.90) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        "msgs_per_sec": messages / total if total else 0.0,
+    }
+
+
+def time_calls(call: Callable[[Any], Any], items: Sequence[Any], warmup: int) -> List[float]:
+    """Call once per item and return the latency of every call after the warmup."""
+    for item in items[:warmup]:
+        call(item)
+    latencies = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # Keep collector pauses out of the per-call numbers
+    try:
+        for item in items[warmup:]:
+            start = time.perf_counter()
+            call(item)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return latencies
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, if the platform reports it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every stage and return the results."""
+    records = generate_corpus(args.messages + args.warmup, seed=args.seed, max_words=args.max_words)
+    texts = [record["text"] for record in records]
+    relationships = [record["relationship"] for record in records]
+    
+    start = time.perf_counter()
+    if args.blank:
+        import spacy
+        nlp = spacy.blank("en")
+    else:
+        nlp = nlp_registry.get_nlp(args.model, args.profile)
+    model_load_seconds = time.perf_counter() - start
+    rss_after_load = peak_rss_mb()
+    
+    analyzer = SemanticAnalyzer(nlp=nlp, profile=args.profile, sentiment=args.sentiment)
+    calculator = EmotionCalculator(semantic_analyzer=analyzer, fast_path=args.fast_path)
+    analyzer.analyze(texts[0])  # Load lazy resources (sentiment lexicons) before timing
+    
+    stages: Dict[str, Dict[str, float]] = {}
+    analyses = [analyzer.analyze(text) for text in texts]
+    contexts = [calculator.context_judge.determine_context(relationship=r) for r in relationships]
+    
+    stages["semantic"] = summarize(time_calls(analyzer.analyze, texts, args.warmup), args.messages)
+    stages["context"] = summarize(
+        time_calls(lambda r: calculator.context_judge.determine_context(relationship=r), relationships, args.warmup),
+        args.messages
+    )
+    stages["mapping"] = summarize(
+        time_calls(lambda pair: calculator.emotion_mapper.map_emotions(*pair), list(zip(analyses, contexts)), args.warmup),
+        args.messages
+    )
+    stages["end_to_end"] = summarize(
+        time_calls(lambda pair: calculator.calculate_emotion(pair[0], relationship=pair[1]),
+                   list(zip(texts, relationships)), args.warmup),
+        args.messages
+    )
+    
+    batches = [
+        (texts[i:i + args.batch_size], relationships[i:i + args.batch_size])
+        for i in range(args.warmup, len(texts), args.batch_size)
+    ]
+    calculator.calculate_emotions(texts[:args.batch_size], relationships=relationships[:args.batch_size])
+    stages["batch"] = summarize(
+        time_calls(lambda batch: calculator.calculate_emotions(batch[0], relationships=batch[1],
+                                                               batch_size=args.batch_size), batches, 0),
+        args.messages
+    )
+    
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model": "blank" if args.blank else args.model,
+            "profile": args.profile,
+            "sentiment": args.sentiment,
+            "fast_path": args.fast_path,
+            "messages": args.messages,
+            "batch_size": args.batch_size,
+            "seed": args.seed,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "model_load_seconds": model_load_seconds,
+        "rss_after_load_mb": rss_after_load,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare results with a baseline.
+    
+    Args:
+        results: Results of this run
+        baseline: Results of an earlier run
+        threshold: Allowed relative regression (0.15 allows 15%)
+    
+    Returns:
+        A description of every metric regressing beyond the threshold
+    """
+    regressions = []
+    for stage, metrics in results["stages"].items():
+        base_metrics = baseline.get("stages", {}).get(stage)
+        if base_metrics is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            current, base = metrics.get(metric), base_metrics.get(metric)
+            if not current or not base:
+                continue
+            change = (current - base) / base
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{stage}.{metric}: {base:.4g} -> {current:.4g} ({change:+.1%})")
+    
+    for metric in ("peak_rss_mb", "model_load_seconds"):
+        current, base = results.get(metric), baseline.get(metric)
+        if current and base and (current - base) / base > threshold:
+            regressions.append(f"{metric}: {base:.4g} -> {current:.4g} ({(current - base) / base:+.1%})")
+    return regressions
+
+
+def check_baseline(
+    results: Dict[str, Any], 
+    baseline: Dict[str, Any], 
+    threshold: float
+) -> Tuple[List[str], List[str]]:
+    """
+    Check results against a baseline, without printing or exiting.
+    
+    Args:
+        results: Results of this run
+        baseline: Results of an earlier run
+        threshold: Allowed relative regression (0.15 allows 15%)
+    
+    Returns:
+        The regressions beyond the threshold, and warnings about stages or
+        settings that differ from the baseline's
+    """
+    warnings = []
+    base_meta, meta = baseline.get("meta", {}), results.get("meta", {})
+    for setting in COMPARED_SETTINGS:
+        if base_meta.get(setting) != meta.get(setting):
+            warnings.append(
+                f"baseline was recorded with {setting} {base_meta.get(setting)!r}, this run used {meta.get(setting)!r}"
+            )
+    base_stages = baseline.get("stages", {})
+    for stage in results["stages"]:
+        if stage not in base_stages:
+            warnings.append(f"stage {stage} is not in the baseline")
+    for stage in base_stages:
+        if stage not in results["stages"]:
+            warnings.append(f"stage {stage} of the baseline was not run")
+    return compare(results, baseline, threshold), warnings
+
+
+def report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """Print the stage table, with the change against the baseline when given."""
+    print(f"model load {results['model_load_seconds']:.2f} s   peak RSS {results['peak_rss_mb'] or 0:.0f} MiB")
+    print(f"{'stage':>10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'msgs/sec':>11} {'vs baseline':>12}")
+    for stage, metrics in results["stages"].items():
+        delta = ""
+        base = (baseline or {}).get("stages", {}).get(stage)
+        if base and base.get("msgs_per_sec"):
+            delta = f"{metrics['msgs_per_sec'] / base['msgs_per_sec'] - 1:+.1%}"
+        print(
+            f"{stage:>10} {metrics['p50_ms']:9.3f} {metrics['p90_ms']:9.3f} {metrics['p99_ms']:9.3f} "
+            f"{metrics['msgs_per_sec']:11.1f} {delta:>12}"
+        )
+
+
+def main() -> None:
+    """Run the benchmark, then save or compare baselines."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000, help="Timed messages per stage")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed messages before each stage")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--max-words", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model", default=nlp_registry.DEFAULT_MODEL)
+    parser.add_argument("--profile", default="full", choices=nlp_registry.ANALYZER_PROFILES)
+    parser.add_argument("--sentiment", default="textblob")
+    parser.add_argument("--fast-path", action="store_true")
+    parser.add_argument("--blank", action="store_true", help="Use a blank spaCy pipeline (no model download)")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--save-baseline", help="Write the results as a baseline JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative regression")
+    args = parser.parse_args()
+    
+    results = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    report(results, baseline)
+    
+    for path in (args.output, args.save_baseline):
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+    
+    if baseline is not None:
+        regressions, warnings = check_baseline(results, baseline, args.threshold)
+        for warning in warnings:
+            print(f"warning: {warning}", file=sys.stderr)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare the speed and agreement of the TextBlob and lexicon sentiment backends.
+
+Both backends score the same spaCy Docs. TextBlob's scores are the reference:
+agreement is reported as the mean absolute polarity and subjectivity error and
+the share of texts whose polarity has the same sign. A JSONL file of
+{"text": ...} records can be passed with --input instead of the synthetic corpus.
+
+Usage:
+    python benchmarks/bench_sentiment.py --texts 5000 --blank
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import List, Tuple
+
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.core.sentiment import LexiconSentiment, SentimentBackend, TextBlobSentiment
+
+WORDS = [
+    "I", "am", "not", "so", "very", "really", "happy", "sad", "angry", "good", "bad", "terrible",
+    "great", "to", "see", "you", "today", "movie", "was", "boring", "!", "never", "honest", "wow",
+]
+
+
+def time_backend(backend: SentimentBackend, docs: List, texts: List[str]) -> Tuple[float, List[Tuple[float, float]]]:
+    """Score every Doc with a backend; return elapsed seconds and the scores."""
+    start = time.perf_counter()
+    scores = [backend.score(doc, text) for doc, text in zip(docs, texts)]
+    return time.perf_counter() - start, scores
+
+
+def sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def main() -> None:
+    """Run both backends over the corpus and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=5000)
+    parser.add_argument("--input", help="JSONL file with a text field per line")
+    parser.add_argument("--blank", action="store_true", help="Use a blank spaCy pipeline (no model download)")
+    args = parser.parse_args()
+    
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            texts = [json.loads(line)["text"] for line in f if line.strip()]
+    else:
+        rng = random.Random(0)
+        texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 30))) for _ in range(args.texts)]
+    
+    if args.blank:
+        import spacy
+        analyzer = SemanticAnalyzer(nlp=spacy.blank("en"))
+    else:
+        analyzer = SemanticAnalyzer()
+    docs = list(analyzer.nlp.pipe(texts))
+    
+    textblob = TextBlobSentiment()
+    lexicon = LexiconSentiment()  # Loads the lexicon before timing
+    textblob.score(docs[0], texts[0])
+    
+    textblob_time, reference = time_backend(textblob, docs, texts)
+    lexicon_time, scores = time_backend(lexicon, docs, texts)
+    
+    for label, elapsed in (("textblob", textblob_time), ("lexicon", lexicon_time)):
+        print(f"{label:>8}: {len(texts) / elapsed:10.1f} texts/s   {elapsed * 1e6 / len(texts):8.1f} us/text")
+    print(f" speedup: {textblob_time / lexicon_time:.1f}x")
+    
+    polarity_error = sum(abs(a[0] - b[0]) for a, b in zip(reference, scores)) / len(texts)
+    subjectivity_error = sum(abs(a[1] - b[1]) for a, b in zip(reference, scores)) / len(texts)
+    agreement = sum(sign(a[0]) == sign(b[0]) for a, b in zip(reference, scores)) / len(texts)
+    print(f"polarity MAE {polarity_error:.4f}   subjectivity MAE {subjectivity_error:.4f}   "
+          f"sign agreement {agreement:.1%}")
+
+
+if __name__ == "__main__":
+    main()
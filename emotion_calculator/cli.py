@@ -1,10 +1,21 @@
 """Command-line interface for the emotion calculator."""
 
 import json
+import sys
 import argparse
 from typing import Dict, Optional
 
 from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.document import SPLIT_PATTERNS, DocumentAggregate
+from emotion_calculator.utils.profiling import PipelineProfiler
+from emotion_calculator.utils.streaming import (
+    FORMATS, 
+    ON_ERROR, 
+    RecordWriter, 
+    detect_format, 
+    read_records, 
+    score_stream
+)
 
 
 def interactive_mode(calculator: EmotionCalculator) -> None:
@@ -14,7 +25,7 @@ def interactive_mode(calculator: EmotionCalculator) -> None:
         user_input = input("\nEnter text: ")
         if user_input.lower() == 'exit':
             break
-            
+        
         relationship = input("Relationship (friend/enemy/neutral/etc.): ")
         result = calculator.calculate_emotion(user_input, relationship=relationship)
         
@@ -23,30 +34,130 @@ def interactive_mode(calculator: EmotionCalculator) -> None:
         print(f"Dominant emotion: {result.dominant_emotion}")
 
 
-def main() -> None:
-    """Main entry point for the emotion calculator CLI."""
-    parser = argparse.ArgumentParser(description="Emotion Calculator")
-    parser.add_argument("--text", help="Input text to analyze")
-    parser.add_argument("--relationship", help="Relationship to the speaker")
-    parser.add_argument("--interactive", action="store_true", help="Run in interactive mode")
+def batch_mode(calculator: EmotionCalculator, args: argparse.Namespace) -> None:
+    """Score a JSONL or CSV file (or stdin) and stream the results to a file (or stdout)."""
+    input_format = args.format or detect_format(args.input)
+    output_format = args.output_format or detect_format(args.output, default=input_format)
     
-    args = parser.parse_args()
+    input_stream = sys.stdin if args.input == "-" else open(args.input, "r", newline="", encoding="utf-8")
+    output_stream = sys.stdout if args.output in (None, "-") else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        score_stream(
+            calculator,
+            read_records(input_stream, input_format, on_error=args.on_error),
+            RecordWriter(output_stream, output_format),
+            chunk_size=args.chunk_size,
+            progress=None if args.quiet else sys.stderr
+        )
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+
+def save_features_mode(calculator: EmotionCalculator, args: argparse.Namespace) -> None:
+    """Analyze a JSONL or CSV file once and save its semantic features for re-scoring."""
+    from emotion_calculator.data.feature_store import build_feature_store  # Needs NumPy
     
-    # Initialize the emotion calculator
-    calculator = EmotionCalculator()
+    input_format = args.format or detect_format(args.input)
+    input_stream = sys.stdin if args.input == "-" else open(args.input, "r", newline="", encoding="utf-8")
+    try:
+        records = read_records(input_stream, input_format, on_error=args.on_error)
+        count = build_feature_store(calculator, records, args.save_features, 
+                                    chunk_size=args.chunk_size)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+    if not args.quiet:
+        print(f"Saved features of {count} messages to {args.save_features}", file=sys.stderr)
+
+
+def rescore_mode(calculator: EmotionCalculator, args: argparse.Namespace) -> None:
+    """Score saved features with the current emotion configuration, without running NLP."""
+    from emotion_calculator.data.feature_store import FeatureStore, rescore  # Needs NumPy
+    
+    store = FeatureStore(args.rescore)
+    batch = rescore(calculator, store, vectorized=args.vectorized)
+    output_format = args.output_format or detect_format(args.output)
+    output_stream = sys.stdout if args.output in (None, "-") else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = RecordWriter(output_stream, output_format)
+        for row, view in enumerate(batch):
+            record = {"text": view.input_text, "relationship": store.relationship(row)}
+            writer.write(record, view.emotions, view.dominant_emotion)
+        writer.flush()
+    finally:
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+
+def document_mode(calculator: EmotionCalculator, args: argparse.Namespace) -> None:
+    """Score a long document chunk by chunk, printing a JSONL timeline and then the aggregate."""
+    input_stream = sys.stdin if args.document == "-" else open(args.document, "r", encoding="utf-8")
+    aggregate = DocumentAggregate()
+    try:
+        # The file is read line by line, so memory does not grow with its size
+        for chunk, result in calculator.stream_document(
+            input_stream, 
+            relationship=args.relationship, 
+            split=args.split, 
+            batch_size=args.chunk_size
+        ):
+            aggregate.add(chunk, result)
+            print(json.dumps({
+                "index": chunk.index,
+                "start": chunk.start,
+                "end": chunk.end,
+                "emotions": result.emotions,
+                "dominant_emotion": result.dominant_emotion,
+                "sentiment": result.sentiment
+            }))
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+    print(json.dumps({"document": {
+        "chunks": aggregate.chunks,
+        "emotions": aggregate.emotions,
+        "dominant_emotion": aggregate.dominant_emotion,
+        "sentiment": aggregate.sentiment
+    }}))
+
+
+def run_mode(calculator: EmotionCalculator, args: argparse.Namespace) -> None:
+    """Run the mode selected by the command-line arguments."""
+    # Re-score saved features (no NLP) if requested
+    if args.rescore:
+        rescore_mode(calculator, args)
+        return
+    
+    # Save features of a file for later re-scoring if requested
+    if args.input and args.save_features:
+        save_features_mode(calculator, args)
+        return
+    
+    # Stream a file through the batch path if requested
+    if args.input:
+        batch_mode(calculator, args)
+        return
+    
+    # Print an emotion timeline of a long document if requested
+    if args.document:
+        document_mode(calculator, args)
+        return
     
     # Run in interactive mode if requested
     if args.interactive:
         interactive_mode(calculator)
         return
-        
+    
     # Run with provided arguments
     if args.text:
         result = calculator.calculate_emotion(args.text, relationship=args.relationship)
         print(json.dumps(result.emotions, indent=2))
         print(f"Dominant emotion: {result.dominant_emotion}")
         return
-        
+    
     # Default to demo mode if no arguments provided
     print("Emotion Calculator Demo")
     print("======================")
@@ -78,5 +189,56 @@ def main() -> None:
     interactive_mode(calculator)
 
 
+def main() -> None:
+    """Main entry point for the emotion calculator CLI."""
+    parser = argparse.ArgumentParser(description="Emotion Calculator")
+    parser.add_argument("--text", help="Input text to analyze")
+    parser.add_argument("--relationship", help="Relationship to the speaker")
+    parser.add_argument("--interactive", action="store_true", help="Run in interactive mode")
+    parser.add_argument("--input", help="JSONL or CSV file of messages to score ('-' for stdin)")
+    parser.add_argument("--output", help="File to write scored messages to (default: stdout)")
+    parser.add_argument("--format", choices=FORMATS, help="Input format (default: from file extension)")
+    parser.add_argument("--output-format", choices=FORMATS, help="Output format (default: from file extension)")
+    parser.add_argument("--document", help="Long text file to score sentence by sentence ('-' for stdin)")
+    parser.add_argument("--split", choices=list(SPLIT_PATTERNS), default="sentence", 
+                        help="How --document is split into chunks")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Messages scored per batch")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress on stderr")
+    parser.add_argument("--on-error", choices=ON_ERROR, default="fail", 
+                        help="Stop at a malformed --input row, or skip it and report it on stderr")
+    parser.add_argument("--fast-path", action="store_true", 
+                        help="Run the full NLP pipeline only on messages whose actions can matter")
+    parser.add_argument("--lexicon", action="append", 
+                        help="JSON, YAML or TSV lexicon file layered over the built-in configuration (repeatable)")
+    parser.add_argument("--save-features", metavar="DIR", 
+                        help="With --input, save semantic features to a feature store instead of scoring")
+    parser.add_argument("--rescore", metavar="DIR", 
+                        help="Score a feature store with the current configuration, skipping NLP")
+    parser.add_argument("--vectorized", action="store_true", help="Use the NumPy mapper for --rescore")
+    parser.add_argument("--profile", metavar="DIR", 
+                        help="Write cProfile stats, flame-graph stacks and per-stage allocations of the run to DIR")
+    
+    args = parser.parse_args()
+    
+    # Initialize the emotion calculator
+    lexicon = None
+    if args.lexicon:
+        from emotion_calculator.core.lexicon import load_lexicon
+        lexicon = load_lexicon(args.lexicon)
+    calculator = EmotionCalculator(fast_path=args.fast_path, lexicon=lexicon)
+    
+    if not args.profile:
+        run_mode(calculator, args)
+        return
+    
+    # Load the models first so the profile shows scoring rather than model loading
+    if not args.rescore:
+        calculator.calculate_emotion("Loading the models.")
+    with PipelineProfiler(args.profile).profile(calculator, "cli") as run:
+        run_mode(calculator, args)
+    if not args.quiet:
+        print(f"Wrote profile to {', '.join(run.paths)}", file=sys.stderr)
+
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""Input limits and admission control for serving the emotion pipeline."""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class InputTooLarge(ValueError):
+    """Raised when a text is longer than the calculator's max_text_length."""
+    
+    def __init__(self, length: int, limit: int):
+        super().__init__(f"Text has {length} characters, the limit is {limit}")
+        self.length = length
+        self.limit = limit
+
+
+class Overloaded(RuntimeError):
+    """
+    Raised when a request is not admitted.
+    
+    per_key is True when the caller's own limit was hit (too many requests
+    from one client) rather than the server's overall capacity.
+    """
+    
+    def __init__(self, message: str, retry_after: float, per_key: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.per_key = per_key
+
+
+class AdmissionController:
+    """
+    Bounds the number of requests being served, overall and per client key.
+    
+    Requests beyond the limits are rejected immediately instead of queueing,
+    so one client flooding the server cannot raise everyone's latency.
+    """
+    
+    def __init__(
+        self, 
+        max_in_flight: int = 256, 
+        max_per_key: Optional[int] = None, 
+        retry_after: float = 1.0
+    ):
+        """
+        Initialize the controller.
+        
+        Args:
+            max_in_flight: Maximum number of requests served at once
+            max_per_key: Maximum number of requests served at once per key, or None
+            retry_after: Seconds rejected clients are told to wait before retrying
+        """
+        self.max_in_flight = max_in_flight
+        self.max_per_key = max_per_key
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._in_flight = 0
+        self._per_key: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently admitted."""
+        return self._in_flight
+    
+    @contextmanager
+    def admit(self, key: Optional[str] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of a request.
+        
+        Args:
+            key: Client the request belongs to (e.g. a session id), or None
+        
+        Raises:
+            Overloaded: If the server or the key is at its limit
+        """
+        self._enter(key)
+        try:
+            yield
+        finally:
+            self._leave(key)
+    
+    def _enter(self, key: Optional[str]) -> None:
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self.rejected += 1
+                raise Overloaded("Server is at capacity", self.retry_after)
+            if key is not None and self.max_per_key is not None:
+                if self._per_key.get(key, 0) >= self.max_per_key:
+                    self.rejected += 1
+                    raise Overloaded("Too many concurrent requests for this session", self.retry_after, per_key=True)
+                self._per_key[key] = self._per_key.get(key, 0) + 1
+            self._in_flight += 1
+    
+    def _leave(self, key: Optional[str]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if key is not None and self.max_per_key is not None:
+                remaining = self._per_key.get(key, 1) - 1
+                if remaining:
+                    self._per_key[key] = remaining
+                else:
+                    self._per_key.pop(key, None)
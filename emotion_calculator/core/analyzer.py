@@ -1,27 +1,111 @@
 """Main emotion calculator module integrating all components."""
 
-from typing import Dict, Optional, Any
+import dataclasses
+from time import monotonic, perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Sequence, Tuple, Union
 
 from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.core.admission import InputTooLarge
 from emotion_calculator.core.context import ContextJudge
+from emotion_calculator.core.document import DEFAULT_MAX_CHUNK_CHARS, DocumentAggregate, iter_chunks
 from emotion_calculator.core.emotions import EmotionMapper
-from emotion_calculator.data.models import EmotionResult
+from emotion_calculator.core.incremental import Edit, SentenceCache, combine_analyses, sentence_key
+from emotion_calculator.core.lexicon import Lexicon
+from emotion_calculator.core.session import ConversationState, SessionContextStore
+from emotion_calculator.data.models import (
+    ContextResult, 
+    DocumentChunk, 
+    DocumentResult, 
+    EmotionResult, 
+    EmotionResultBatch, 
+    IncrementalResult, 
+    SemanticAnalysisResult
+)
+from emotion_calculator.utils.cache import ResultCache
+from emotion_calculator.utils.metrics import SIZE_BUCKETS, MetricsRegistry
+from emotion_calculator.utils.streaming import chunked
 
 
 class EmotionCalculator:
     """Calculates emotional responses to text based on context."""
     
-    def __init__(self):
-        """Initialize the emotion calculator with its component modules."""
-        self.semantic_analyzer = SemanticAnalyzer()
-        self.context_judge = ContextJudge()
-        self.emotion_mapper = EmotionMapper()
+    def __init__(
+        self, 
+        semantic_analyzer: Optional[SemanticAnalyzer] = None, 
+        profile: str = "full", 
+        cache: Optional[ResultCache] = None, 
+        sentiment: str = "textblob", 
+        sessions: Optional[SessionContextStore] = None, 
+        fast_path: bool = False, 
+        lexicon: Optional[Lexicon] = None, 
+        metrics: Optional[MetricsRegistry] = None, 
+        sentence_cache: Optional[SentenceCache] = None, 
+        max_text_length: Optional[int] = None
+    ):
+        """
+        Initialize the emotion calculator with its component modules.
+        
+        Args:
+            semantic_analyzer: Optional semantic analyzer to use instead of the default
+            profile: Analyzer profile used when building the default semantic analyzer
+            cache: Optional cache for semantic analyses and final results
+            sentiment: Sentiment backend used by the default semantic analyzer
+            sessions: Optional store of per-session conversation context
+            fast_path: Only send texts the action rules could apply to through the
+                full NLP pipeline; the rest are tokenized only. Emotions are identical.
+            lexicon: Emotions, triggers and relationships to use instead of the built-in ones
+            metrics: Optional registry receiving per-stage latencies, batch sizes,
+                cache hits and fast-path tier counts; also passed to the semantic
+                analyzer unless it has its own. Nothing is timed without one.
+            sentence_cache: Optional per-session cache of sentence analyses used
+                by calculate_incremental
+            max_text_length: Longest text accepted by calculate_emotion(s), or None
+        """
+        self.semantic_analyzer = semantic_analyzer or SemanticAnalyzer(profile=profile, sentiment=sentiment)
+        self.cache = cache
+        self.sessions = sessions
+        self.sentence_cache = sentence_cache
+        self.fast_path = fast_path
+        self.max_text_length = max_text_length
+        self.tier_counts = {"lexical": 0, "full": 0}
+        # Moving average of full-pipeline seconds per character, used to predict deadline misses
+        self.seconds_per_char: Optional[float] = None
+        self._batch_mapper = None
+        self.context_judge = ContextJudge(lexicon.relationships if lexicon is not None else None)
+        self.emotion_mapper = EmotionMapper(lexicon)
+        self.metrics = metrics
+        if metrics is not None:
+            self._register_metrics(metrics)
+    
+    def _register_metrics(self, metrics: MetricsRegistry) -> None:
+        """Share the registry with the semantic analyzer and expose existing counters."""
+        if getattr(self.semantic_analyzer, "metrics", False) is None:
+            self.semantic_analyzer.metrics = metrics
+        metrics.describe_histogram("batch_size", "Texts per calculate_emotions call", SIZE_BUCKETS)
+        metrics.describe_counter("degraded_results", "Results scored without the action rules they needed")
+        for tier in self.tier_counts:
+            metrics.counter_func(
+                "fast_path_texts", 
+                lambda tier=tier: self.tier_counts[tier], 
+                "Texts analyzed per fast-path tier", 
+                {"tier": tier}
+            )
+        if self.cache is not None:
+            cache = self.cache
+            for kind in ("semantic", "result"):
+                metrics.counter_func("cache_hits", lambda kind=kind: cache.hits[kind], 
+                                     "Cache lookups that found an entry", {"kind": kind})
+                metrics.counter_func("cache_misses", lambda kind=kind: cache.misses[kind], 
+                                     "Cache lookups that found nothing", {"kind": kind})
     
     def calculate_emotion(
         self, 
         text: str, 
         relationship: Optional[str] = None, 
-        additional_context: Optional[Dict] = None
+        additional_context: Optional[Dict] = None, 
+        session_id: Optional[str] = None, 
+        deadline: Optional[float] = None, 
+        degrade: bool = False
     ) -> EmotionResult:
         """
         Calculate emotional response to text input with given context.
@@ -30,24 +114,701 @@ class EmotionCalculator:
             text: The input text to respond to
             relationship: Relationship to the speaker
             additional_context: Additional context information
-            
+            session_id: Conversation the text belongs to; with a session store
+                configured, its history shapes the context and is updated with the result
+            deadline: time.monotonic() value the result is due by. When the full
+                pipeline is not expected to finish in time, the text is only
+                tokenized for sentiment and the result is flagged as degraded.
+            degrade: Skip the full pipeline regardless of the deadline
+        
         Returns:
             An EmotionResult containing the emotional response
+        
+        Raises:
+            InputTooLarge: If the text is longer than max_text_length
         """
-        # Step 1: Semantic analysis
+        self._check_length(text)
+        degrade = degrade or self._over_budget(deadline, len(text))
+        metrics = self.metrics
+        if metrics is None:
+            return self._calculate_emotion(text, relationship, additional_context, session_id, degrade)
+        start = perf_counter()
+        result = self._calculate_emotion(text, relationship, additional_context, session_id, degrade)
+        metrics.observe_stage("calculate", perf_counter() - start)
+        if result.degraded:
+            metrics.inc("degraded_results")
+        return result
+    
+    def _calculate_emotion(
+        self, 
+        text: str, 
+        relationship: Optional[str], 
+        additional_context: Optional[Dict], 
+        session_id: Optional[str], 
+        degrade: bool = False
+    ) -> EmotionResult:
+        """Score one text, through the session store or the result cache when configured."""
+        if session_id is not None and self.sessions is not None:
+            # Context depends on the conversation so far, so final results are not cached
+            state = self.sessions.get(session_id)
+            semantic_results, full = self._analyze_text(text, degrade)
+            result = self._score(text, semantic_results, relationship, additional_context, history=state)
+            result.degraded = self._is_degraded(text, full)
+            self.sessions.update(session_id, result)
+            return result
+        
+        if self.cache is None:
+            # Step 1: Semantic analysis
+            semantic_results, full = self._analyze_text(text, degrade)
+            result = self._score(text, semantic_results, relationship, additional_context)
+            result.degraded = self._is_degraded(text, full)
+            return result
+        
+        result_key = self.cache.result_key(text, relationship, additional_context, self._scoring_config())
+        cached = self.cache.get("result", result_key)
+        if cached is not None:
+            return dataclasses.replace(cached, emotions=dict(cached.emotions))
+        
+        # Step 1: Semantic analysis, reusing earlier analyses of the same text
+        semantic_results, full = self._analyze_text(text, degrade)
+        
+        result = self._score(text, semantic_results, relationship, additional_context)
+        result.degraded = self._is_degraded(text, full)
+        if not result.degraded:
+            self.cache.set(result_key, result)
+        return result
+    
+    def _analyze_text(self, text: str, degrade: bool = False) -> Tuple[SemanticAnalysisResult, bool]:
+        """
+        Analyze one text, reusing a cached analysis of the same text up to spacing.
+        
+        Returns the analysis and whether it is a full one.
+        """
+        semantic_key = None
+        if self.cache is not None:
+            semantic_key = self.cache.semantic_key(text, self.semantic_analyzer.cache_scope)
+            semantic_results = self.cache.get("semantic", semantic_key)
+            if semantic_results is not None:
+                if semantic_results.full_text != text:
+                    semantic_results = dataclasses.replace(semantic_results, full_text=text)
+                return semantic_results, True
+        
+        if degrade or self._use_lexical_tier(text):
+            # Partial analyses are not cached so full analyses never miss their features
+            return self.semantic_analyzer.analyze_lexical(text), False
+        start = perf_counter()
         semantic_results = self.semantic_analyzer.analyze(text)
+        self._record_cost(perf_counter() - start, len(text))
+        if semantic_key is not None:
+            self.cache.set(semantic_key, semantic_results)
+        return semantic_results, True
+    
+    def _scoring_config(self) -> str:
+        """Identify the analyzer, lexicon and relationships results are scored with, for result cache keys."""
+        return (
+            f"{self.semantic_analyzer.cache_scope}:"
+            f"{self.emotion_mapper.lexicon.fingerprint}:{self.context_judge.fingerprint}"
+        )
+    
+    def _check_length(self, text: str) -> None:
+        """Raise InputTooLarge if a text is longer than max_text_length."""
+        if self.max_text_length is not None and len(text) > self.max_text_length:
+            raise InputTooLarge(len(text), self.max_text_length)
+    
+    def _over_budget(self, deadline: Optional[float], chars: int) -> bool:
+        """Return whether the full pipeline is expected to miss a deadline for this many characters."""
+        if deadline is None:
+            return False
+        return deadline - monotonic() <= (self.seconds_per_char or 0.0) * chars
+    
+    def _over_budget_batch(
+        self, 
+        texts: List[str], 
+        deadlines: List[Optional[float]], 
+        degrade: List[bool]
+    ) -> List[bool]:
+        """
+        Return which texts of a batch should skip the full pipeline.
+        
+        The texts analyzed in full share one pipeline call, so each is held to
+        the expected cost of that call; texts that would miss their deadline
+        are degraded, which shrinks the call, until the rest all fit.
+        """
+        degrade = list(degrade)
+        while True:
+            chars = sum(len(text) for text, skip in zip(texts, degrade) if not skip)
+            late = [
+                index for index, (deadline, skip) in enumerate(zip(deadlines, degrade)) 
+                if not skip and self._over_budget(deadline, chars)
+            ]
+            if not late:
+                return degrade
+            for index in late:
+                degrade[index] = True
+    
+    def _record_cost(self, seconds: float, chars: int) -> None:
+        """Fold a full-pipeline timing into the seconds-per-character moving average."""
+        if chars <= 0:
+            return
+        rate = seconds / chars
+        previous = self.seconds_per_char
+        self.seconds_per_char = rate if previous is None else 0.8 * previous + 0.2 * rate
+    
+    def _is_degraded(self, text: str, full: bool) -> bool:
+        """Return whether skipping the full pipeline could have changed a text's emotions."""
+        return not full and self.emotion_mapper.could_use_actions(text)
+    
+    def _use_lexical_tier(self, text: str) -> bool:
+        """Decide whether the fast path may skip the full pipeline for a text and count the tier."""
+        if not self.fast_path:
+            return False
+        lexical = not self.emotion_mapper.could_use_actions(text)
+        self.tier_counts["lexical" if lexical else "full"] += 1
+        return lexical
+    
+    def _analyze_uncached(
+        self, 
+        texts: List[str], 
+        batch_size: int, 
+        n_process: int, 
+        degrade: Optional[List[bool]] = None
+    ) -> Tuple[List[SemanticAnalysisResult], List[bool]]:
+        """Analyze a batch of texts, skipping the full pipeline where degrade is set; also return which are full."""
+        if degrade is not None and all(degrade):
+            return self.semantic_analyzer.analyze_lexical_batch(texts, batch_size=batch_size), [False] * len(texts)
+        if not self.fast_path and (degrade is None or not any(degrade)):
+            start = perf_counter()
+            analyzed = self.semantic_analyzer.analyze_batch(texts, batch_size=batch_size, n_process=n_process)
+            self._record_cost(perf_counter() - start, sum(len(text) for text in texts))
+            return analyzed, [True] * len(texts)
+        
+        if degrade is None:
+            degrade = [False] * len(texts)
+        full = [
+            not skip and not (self.fast_path and self._use_lexical_tier(text)) 
+            for text, skip in zip(texts, degrade)
+        ]
+        full_texts = [text for text, is_full in zip(texts, full) if is_full]
+        start = perf_counter()
+        full_results = iter(self.semantic_analyzer.analyze_batch(
+            full_texts, 
+            batch_size=batch_size, 
+            n_process=n_process
+        ))
+        self._record_cost(perf_counter() - start, sum(len(text) for text in full_texts))
+        lexical_results = iter(self.semantic_analyzer.analyze_lexical_batch(
+            [text for text, is_full in zip(texts, full) if not is_full], 
+            batch_size=batch_size
+        ))
+        return [next(full_results) if is_full else next(lexical_results) for is_full in full], full
+    
+    def calculate_emotions(
+        self, 
+        texts: Sequence[str], 
+        relationships: Union[None, str, Sequence[Optional[str]]] = None, 
+        additional_context: Union[None, Dict, Sequence[Optional[Dict]]] = None, 
+        batch_size: int = 256, 
+        n_process: int = 1, 
+        columnar: bool = False, 
+        session_ids: Optional[Sequence[Optional[str]]] = None, 
+        deadline: Union[None, float, Sequence[Optional[float]]] = None, 
+        degrade: Union[bool, Sequence[bool]] = False
+    ) -> Union[List[EmotionResult], EmotionResultBatch]:
+        """
+        Calculate emotional responses for many texts in one batched pass.
+        
+        Produces the same results as calling calculate_emotion once per text,
+        but runs the semantic analysis through spaCy's nlp.pipe.
+        
+        Args:
+            texts: The input texts to respond to
+            relationships: A single relationship for every text, or one per text
+            additional_context: Additional context applied to every text, or one per text
+            batch_size: Number of texts spaCy processes per batch
+            n_process: Number of worker processes used by spaCy
+            columnar: Return a compact EmotionResultBatch instead of a list. The
+                result cache is bypassed in this mode, semantic caching still applies.
+            session_ids: Optional session per text; texts of the same session are
+                scored in input order so each sees the history of the ones before it
+            deadline: time.monotonic() value the results are due by, or one per
+                text; as in calculate_emotion, texts that are not expected to
+                finish in time skip the full pipeline. Not supported with columnar.
+            degrade: Skip the full pipeline regardless of the deadline, for every
+                text or one flag per text
+        
+        Returns:
+            A list of EmotionResult objects (or an EmotionResultBatch) in input order
+        
+        Raises:
+            InputTooLarge: If a text is longer than max_text_length
+        """
+        texts = list(texts)
+        for text in texts:
+            self._check_length(text)
+        if deadline is None or isinstance(deadline, (int, float)):
+            deadlines = [deadline] * len(texts)
+        else:
+            deadlines = list(deadline)
+            if len(deadlines) != len(texts):
+                raise ValueError("deadline must have one entry per text")
+        if isinstance(degrade, bool):
+            degrade = [degrade] * len(texts)
+        else:
+            degrade = [bool(skip) for skip in degrade]
+            if len(degrade) != len(texts):
+                raise ValueError("degrade must have one entry per text")
+        if columnar and (any(deadline is not None for deadline in deadlines) or any(degrade)):
+            raise ValueError("columnar results cannot be degraded; pass deadline or degrade without columnar")
+        degrade = self._over_budget_batch(texts, deadlines, degrade)
+        metrics = self.metrics
+        if metrics is None:
+            return self._calculate_emotions(
+                texts, relationships, additional_context, batch_size, n_process, columnar, session_ids, degrade
+            )
+        start = perf_counter()
+        results = self._calculate_emotions(
+            texts, relationships, additional_context, batch_size, n_process, columnar, session_ids, degrade
+        )
+        metrics.observe_stage("calculate", perf_counter() - start, mode="batch")
+        metrics.observe("batch_size", len(results))
+        if not columnar:
+            degraded = sum(1 for result in results if result.degraded)
+            if degraded:
+                metrics.inc("degraded_results", degraded)
+        return results
+    
+    def _calculate_emotions(
+        self, 
+        texts: Sequence[str], 
+        relationships: Union[None, str, Sequence[Optional[str]]], 
+        additional_context: Union[None, Dict, Sequence[Optional[Dict]]], 
+        batch_size: int, 
+        n_process: int, 
+        columnar: bool, 
+        session_ids: Optional[Sequence[Optional[str]]], 
+        degrade: Optional[List[bool]] = None
+    ) -> Union[List[EmotionResult], EmotionResultBatch]:
+        """Normalize per-text arguments and pick the batch path (see calculate_emotions)."""
+        texts = list(texts)
+        if relationships is None or isinstance(relationships, str):
+            relationships = [relationships] * len(texts)
+        else:
+            relationships = list(relationships)
+            if len(relationships) != len(texts):
+                raise ValueError("relationships must have one entry per text")
+        if additional_context is None or isinstance(additional_context, dict):
+            additional_contexts = [additional_context] * len(texts)
+        else:
+            additional_contexts = list(additional_context)
+            if len(additional_contexts) != len(texts):
+                raise ValueError("additional_context must have one entry per text")
+        
+        if session_ids is not None and self.sessions is not None:
+            session_ids = list(session_ids)
+            if len(session_ids) != len(texts):
+                raise ValueError("session_ids must have one entry per text")
+            # Semantic analysis is batched; context and mapping run in order per session
+            semantic_results, full = self._analyze_texts(texts, batch_size, n_process, degrade)
+            # Scored against copies of the session states, so a failure part way
+            # through the batch leaves every session as it was
+            staged: Dict[str, ConversationState] = {}
+            results = []
+            for text, semantic, is_full, relationship, context, session_id in zip(
+                texts, semantic_results, full, relationships, additional_contexts, session_ids
+            ):
+                state = None
+                if session_id is not None:
+                    state = staged.get(session_id)
+                    if state is None:
+                        state = staged[session_id] = self.sessions.get(session_id).copy()
+                result = self._score(text, semantic, relationship, context, history=state)
+                result.degraded = self._is_degraded(text, is_full)
+                if state is not None:
+                    state.update(result)
+                results.append(result)
+            for session_id, result in zip(session_ids, results):
+                if session_id is not None:
+                    self.sessions.update(session_id, result)
+            if columnar:
+                # Contexts are settled; remap them in one vectorized pass for exact scores
+                contexts = [result.context for result in results]
+                batch_mapper = self._get_batch_mapper()
+                return EmotionResultBatch(
+                    texts=texts, 
+                    contexts=contexts, 
+                    scores=batch_mapper.map_batch(semantic_results, contexts), 
+                    emotions=batch_mapper.emotions, 
+                    sentiments=[semantic.sentiment for semantic in semantic_results]
+                )
+            return results
+        
+        if columnar:
+            # Step 1: Semantic analysis for the whole batch
+            semantic_results = self._analyze_texts(texts, batch_size, n_process)[0]
+            batch_mapper = self._get_batch_mapper()
+            contexts, matrix = self._map_batch(batch_mapper, semantic_results, relationships, additional_contexts)
+            return EmotionResultBatch(
+                texts=texts, 
+                contexts=contexts, 
+                scores=matrix, 
+                emotions=batch_mapper.emotions, 
+                sentiments=[semantic.sentiment for semantic in semantic_results]
+            )
+        
+        if self.cache is None:
+            # Step 1: Semantic analysis for the whole batch
+            semantic_results, full = self._analyze_texts(texts, batch_size, n_process, degrade)
+            return self._score_batch(texts, semantic_results, relationships, additional_contexts, full)
+        
+        return self._calculate_emotions_cached(
+            texts, relationships, additional_contexts, batch_size, n_process, degrade
+        )
+    
+    def calculate_incremental(
+        self, 
+        session_id: str, 
+        text: Optional[str] = None, 
+        edits: Optional[Sequence[Edit]] = None, 
+        version: Optional[int] = None, 
+        relationship: Optional[str] = None, 
+        additional_context: Optional[Dict] = None, 
+        deadline: Optional[float] = None, 
+        degrade: bool = False
+    ) -> IncrementalResult:
+        """
+        Re-analyze a session's edited text, sending only new or changed sentences through NLP.
+        
+        The text is split into sentences, whose analyses are cached per session
+        by the hash of their text. The analysis of the whole text is recombined
+        from the sentence analyses, so its sentiment is the length-weighted mean
+        of the sentences' rather than that of one pass over the whole text.
+        With a session store, the session's history shapes the context but is
+        not updated, since a draft is not a sent message.
+        
+        Args:
+            session_id: The session editing the text
+            text: The complete new text
+            edits: (start, end, replacement) edits to the session's current text,
+                used when text is None
+            version: Version of the text the edits are based on
+            relationship: Relationship to the speaker
+            additional_context: Additional context information
+            deadline: time.monotonic() value the result is due by. When the
+                sentences not analyzed before are not expected to finish the
+                full pipeline in time, they are only tokenized for sentiment, the
+                result is flagged as degraded and they are not cached, so the
+                next edit analyzes them in full.
+            degrade: Skip the full pipeline for new sentences regardless of the deadline
+        
+        Returns:
+            An IncrementalResult with the EmotionResult, the text's new version
+            and the number of sentences analyzed and reused
+        
+        Raises:
+            DeltaConflict: If the edits do not apply to the current version
+            InputTooLarge: If the edited text is longer than max_text_length; the
+                session's text is left unchanged
+        """
+        if self.sentence_cache is None:
+            raise ValueError("calculate_incremental needs an EmotionCalculator with a sentence_cache")
+        text, version = self.sentence_cache.edit(
+            session_id, 
+            text=text, 
+            edits=edits, 
+            version=version, 
+            check=self._check_length
+        )
+        
+        # Step 1: Semantic analysis of the sentences not analyzed before
+        sentences = [chunk.text for chunk in iter_chunks(text)]
+        keys = [sentence_key(sentence) for sentence in sentences]
+        analyses = self.sentence_cache.lookup(session_id, keys)
+        pending = {key: sentence for key, sentence in zip(keys, sentences) if key not in analyses}
+        degrade = degrade or self._over_budget(deadline, sum(len(sentence) for sentence in pending.values()))
+        analyzed = self._analyze_texts(list(pending.values()), 256, 1, [degrade] * len(pending))[0]
+        if not degrade:
+            self.sentence_cache.store(session_id, zip(pending, analyzed))
+        analyses.update(zip(pending, analyzed))
+        
+        semantic_results = combine_analyses(
+            [(analyses[key], len(sentence)) for key, sentence in zip(keys, sentences)], 
+            text
+        )
+        history = None
+        if self.sessions is not None and session_id in self.sessions:
+            history = self.sessions.get(session_id)
+        result = self._score(text, semantic_results, relationship, additional_context, history=history)
+        result.degraded = self._is_degraded(text, not (degrade and pending))
+        if result.degraded and self.metrics is not None:
+            self.metrics.inc("degraded_results")
+        return IncrementalResult(
+            result=result, 
+            version=version, 
+            analyzed=len(pending), 
+            reused=len(sentences) - sum(1 for key in keys if key in pending)
+        )
+    
+    def stream_document(
+        self, 
+        document: Union[str, Iterable[str]], 
+        relationship: Optional[str] = None, 
+        additional_context: Optional[Dict] = None, 
+        split: str = "sentence", 
+        max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS, 
+        batch_size: int = 64, 
+        n_process: int = 1
+    ) -> Iterator[Tuple[DocumentChunk, EmotionResult]]:
+        """
+        Score a long document chunk by chunk, yielding results as each batch finishes.
+        
+        The document is split into sentences or turns, which go through the
+        batched pipeline batch_size at a time. Only one batch is held in memory,
+        so memory use is bounded by the chunk and batch size, not the document.
+        
+        Args:
+            document: The text, or pieces of it such as the lines of an open file
+            relationship: Relationship to the speaker, applied to every chunk
+            additional_context: Additional context applied to every chunk
+            split: "sentence", or "turn" for "Speaker: ..." transcripts and paragraphs
+            max_chunk_chars: Longest chunk; longer sentences are cut at whitespace
+            batch_size: Number of chunks scored per pipeline call
+            n_process: Number of worker processes used by spaCy per batch
+        
+        Returns:
+            An iterator of (DocumentChunk, EmotionResult) pairs in document order
+        """
+        chunks = iter_chunks(document, split=split, max_chars=max_chunk_chars)
+        for batch in chunked(chunks, batch_size):
+            results = self.calculate_emotions(
+                [chunk.text for chunk in batch], 
+                relationships=relationship, 
+                additional_context=additional_context, 
+                batch_size=batch_size, 
+                n_process=n_process
+            )
+            yield from zip(batch, results)
+    
+    def calculate_document(
+        self, 
+        document: Union[str, Iterable[str]], 
+        relationship: Optional[str] = None, 
+        additional_context: Optional[Dict] = None, 
+        split: str = "sentence", 
+        max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS, 
+        batch_size: int = 64, 
+        n_process: int = 1
+    ) -> DocumentResult:
+        """
+        Score a long document as a timeline of chunks plus an aggregate distribution.
+        
+        Takes the same arguments as stream_document. The document-level emotions
+        and sentiment are the chunk values weighted by chunk length.
+        
+        Returns:
+            A DocumentResult with per-chunk results and the aggregate
+        """
+        aggregate = DocumentAggregate()
+        chunks: List[DocumentChunk] = []
+        results: List[EmotionResult] = []
+        for chunk, result in self.stream_document(
+            document, relationship, additional_context, split, max_chunk_chars, batch_size, n_process
+        ):
+            aggregate.add(chunk, result)
+            chunks.append(chunk)
+            results.append(result)
+        context = self.context_judge.determine_context(
+            relationship=relationship,
+            additional_context=additional_context
+        )
+        return aggregate.to_result(chunks, results, context)
+    
+    def _analyze_texts(
+        self, 
+        texts: List[str], 
+        batch_size: int, 
+        n_process: int, 
+        degrade: Optional[List[bool]] = None
+    ) -> Tuple[List[SemanticAnalysisResult], List[bool]]:
+        """Analyze a batch of texts, sending only cache misses through spaCy; also return which results are full."""
+        if self.cache is None:
+            return self._analyze_uncached(texts, batch_size, n_process, degrade)
+        
+        semantics: Dict[str, SemanticAnalysisResult] = {}
+        partial = set()  # semantic keys of analyses that are not full
+        pending: Dict[str, str] = {}  # semantic key -> first text needing analysis
+        pending_degrade: Dict[str, bool] = {}  # semantic key -> whether every text with it may degrade
+        scope = self.semantic_analyzer.cache_scope
+        semantic_keys = [self.cache.semantic_key(text, scope) for text in texts]
+        for index, (semantic_key, text) in enumerate(zip(semantic_keys, texts)):
+            skip = degrade is not None and degrade[index]
+            if semantic_key in pending:
+                pending_degrade[semantic_key] = pending_degrade[semantic_key] and skip
+                continue
+            if semantic_key in semantics:
+                continue
+            semantic_results = self.cache.get("semantic", semantic_key)
+            if semantic_results is None:
+                pending[semantic_key] = text
+                pending_degrade[semantic_key] = skip
+            else:
+                semantics[semantic_key] = semantic_results
+        
+        analyzed, full = self._analyze_uncached(
+            list(pending.values()), batch_size, n_process, list(pending_degrade.values())
+        )
+        for semantic_key, semantic_results, is_full in zip(pending, analyzed, full):
+            if is_full:
+                self.cache.set(semantic_key, semantic_results)
+            else:
+                partial.add(semantic_key)
+            semantics[semantic_key] = semantic_results
+        
+        results = []
+        for semantic_key, text in zip(semantic_keys, texts):
+            semantic_results = semantics[semantic_key]
+            if semantic_results.full_text != text:
+                semantic_results = dataclasses.replace(semantic_results, full_text=text)
+            results.append(semantic_results)
+        return results, [semantic_key not in partial for semantic_key in semantic_keys]
+    
+    def _calculate_emotions_cached(
+        self, 
+        texts: List[str], 
+        relationships: List[Optional[str]], 
+        additional_contexts: List[Optional[Dict]], 
+        batch_size: int, 
+        n_process: int, 
+        degrade: Optional[List[bool]] = None
+    ) -> List[EmotionResult]:
+        """Batch path that only sends cache misses through the NLP pipeline."""
+        results: List[Optional[EmotionResult]] = [None] * len(texts)
+        result_keys: List[str] = []
+        config = self._scoring_config()
+        
+        for index, (text, relationship, additional_context) in enumerate(
+            zip(texts, relationships, additional_contexts)
+        ):
+            result_key = self.cache.result_key(text, relationship, additional_context, config)
+            result_keys.append(result_key)
+            cached = self.cache.get("result", result_key)
+            if cached is not None:
+                results[index] = dataclasses.replace(cached, emotions=dict(cached.emotions))
+        
+        # Step 1: Semantic analysis for the texts not found in the cache
+        missing = [index for index, result in enumerate(results) if result is None]
+        missing_texts = [texts[index] for index in missing]
+        missing_degrade = None if degrade is None else [degrade[index] for index in missing]
+        semantic_results, full = self._analyze_texts(missing_texts, batch_size, n_process, missing_degrade)
+        scored = self._score_batch(
+            missing_texts, 
+            semantic_results, 
+            [relationships[index] for index in missing], 
+            [additional_contexts[index] for index in missing], 
+            full
+        )
+        for index, result in zip(missing, scored):
+            if not result.degraded:
+                self.cache.set(result_keys[index], result)
+            results[index] = result
+        
+        return results
+    
+    def _map_batch(
+        self, 
+        batch_mapper: Any, 
+        semantic_results: List[SemanticAnalysisResult], 
+        relationships: List[Optional[str]], 
+        additional_contexts: List[Optional[Dict]]
+    ) -> Tuple[List[ContextResult], Any]:
+        """Run context judgment and vectorized emotion mapping on analyzed texts."""
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        
+        # Step 2: Context judgment
+        contexts = [
+            self.context_judge.determine_context(
+                relationship=relationship,
+                additional_context=additional_context
+            )
+            for relationship, additional_context in zip(relationships, additional_contexts)
+        ]
+        
+        # Step 3: Emotion mapping for the whole batch
+        if metrics is None:
+            return contexts, batch_mapper.map_batch(semantic_results, contexts)
+        mapping_start = perf_counter()
+        metrics.observe_stage("context", mapping_start - start, mode="batch")
+        matrix = batch_mapper.map_batch(semantic_results, contexts)
+        metrics.observe_stage("mapping", perf_counter() - mapping_start, mode="batch")
+        return contexts, matrix
+    
+    def _get_batch_mapper(self) -> Any:
+        """Return a VectorizedEmotionMapper for the emotion mapper's current lexicon."""
+        from emotion_calculator.core.vectorized import VectorizedEmotionMapper  # Needs NumPy
+        
+        batch_mapper = self._batch_mapper
+        if batch_mapper is None or batch_mapper.lexicon is not self.emotion_mapper.lexicon:
+            batch_mapper = self._batch_mapper = VectorizedEmotionMapper(self.emotion_mapper)
+        return batch_mapper
+    
+    def _score_batch(
+        self, 
+        texts: List[str], 
+        semantic_results: List[SemanticAnalysisResult], 
+        relationships: List[Optional[str]], 
+        additional_contexts: List[Optional[Dict]], 
+        full: Optional[List[bool]] = None
+    ) -> List[EmotionResult]:
+        """Score analyzed texts in one vectorized pass and build their results."""
+        batch_mapper = self._get_batch_mapper()
+        contexts, matrix = self._map_batch(batch_mapper, semantic_results, relationships, additional_contexts)
+        
+        # Step 4: Format results
+        results = []
+        for row, (text, context, semantic) in enumerate(zip(texts, contexts, semantic_results)):
+            emotion_distribution = batch_mapper.distribution(matrix, row)
+            results.append(EmotionResult(
+                input_text=text,
+                context=context,
+                emotions=emotion_distribution.as_percentages(),
+                dominant_emotion=emotion_distribution.get_dominant_emotion(),
+                sentiment=semantic.sentiment, 
+                degraded=full is not None and self._is_degraded(text, full[row])
+            ))
+        return results
+    
+    def _score(
+        self, 
+        text: str, 
+        semantic_results: SemanticAnalysisResult, 
+        relationship: Optional[str], 
+        additional_context: Optional[Dict], 
+        history: Optional[ConversationState] = None
+    ) -> EmotionResult:
+        """Run context judgment and emotion mapping on analyzed text."""
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
         
         # Step 2: Context judgment
         context_results = self.context_judge.determine_context(
             relationship=relationship,
+            history=history,
             additional_context=additional_context
         )
         
+        if metrics is not None:
+            mapping_start = perf_counter()
+            metrics.observe_stage("context", mapping_start - start)
+        
         # Step 3: Emotion mapping
         emotion_distribution = self.emotion_mapper.map_emotions(
             semantic_results, 
             context_results
         )
+        if metrics is not None:
+            metrics.observe_stage("mapping", perf_counter() - mapping_start)
         
         # Step 4: Format results
         dominant_emotion = emotion_distribution.get_dominant_emotion()
@@ -57,5 +818,6 @@ class EmotionCalculator:
             input_text=text,
             context=context_results,
             emotions=emotions_as_percentages,
-            dominant_emotion=dominant_emotion
-        ) 
\ No newline at end of file
+            dominant_emotion=dominant_emotion,
+            sentiment=semantic_results.sentiment
+        )
\ No newline at end of file
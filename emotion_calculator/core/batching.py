@@ -0,0 +1,141 @@
+"""Request coalescing for serving many concurrent single-message calls."""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_STOP = object()
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Coalesces concurrent submissions into batched calls.
+    
+    Items submitted from any thread (or asyncio task) are collected by a
+    background thread for at most max_wait seconds or until max_batch_size
+    items are waiting, then processed with one call to process_batch. Each
+    caller gets a future resolved with its own result.
+    """
+    
+    def __init__(
+        self, 
+        process_batch: Callable[[List[T]], Sequence[R]], 
+        max_batch_size: int = 32, 
+        max_wait: float = 0.005, 
+        name: str = "micro-batcher"
+    ):
+        """
+        Initialize the batcher and start its worker thread.
+        
+        Args:
+            process_batch: Function scoring a list of items, returning results in the same
+                order; an Exception in place of a result fails only that item's future
+            max_batch_size: Maximum number of items per batch
+            max_wait: Maximum seconds the first item of a batch waits for more items
+            name: Name of the background thread
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of items waiting to be batched."""
+        return self._queue.qsize()
+    
+    def submit(self, item: T) -> "Future[R]":
+        """
+        Queue an item for the next batch.
+        
+        Args:
+            item: The item to process
+        
+        Returns:
+            A future resolved with the item's result
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future: "Future[R]" = Future()
+        self._queue.put((item, future))
+        return future
+    
+    def process(self, item: T, timeout: Optional[float] = None) -> R:
+        """Submit an item and block until its result is ready."""
+        return self.submit(item).result(timeout=timeout)
+    
+    async def process_async(self, item: T) -> R:
+        """Submit an item and await its result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(item))
+    
+    def stats(self) -> Dict[str, float]:
+        """Return batch counters and the current queue depth."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queue_depth": self.queue_depth,
+        }
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Process the items already queued, then stop the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+    
+    def _collect(self) -> Tuple[List[Tuple[T, "Future[R]"]], bool]:
+        """Wait for the next batch; also report whether the batcher was stopped."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+    
+    def _run(self) -> None:
+        """Worker loop: collect batches and resolve their futures."""
+        stopped = False
+        while not stopped:
+            batch, stopped = self._collect()
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            
+            self.batches += 1
+            self.items += len(batch)
+            try:
+                results = self.process_batch([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"process_batch returned {len(results)} results for {len(batch)} items"
+                    )
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
\ No newline at end of file
@@ -1,22 +1,173 @@
 """Context judgment module for determining relationship context."""
 
-from typing import Dict, List, Optional, Any
+import dataclasses
+import hashlib
+import json
+import threading
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Union
 
 from emotion_calculator.config.emotion_config import RELATIONSHIP_VALUES
+from emotion_calculator.core.session import ConversationState
 from emotion_calculator.data.models import ContextResult
 
+# How strongly the conversation history shifts the relationship-based context
+HISTORY_WEIGHT = 0.3
+
+# (relationship or None for unknown, formal_setting, previous_trust_breach)
+ContextKey = Tuple[Optional[str], bool, bool]
+
+
+def build_context(
+    relationship: Optional[str], 
+    relationship_value: float = 0.0, 
+    formal_setting: bool = False, 
+    previous_trust_breach: bool = False
+) -> ContextResult:
+    """
+    Compute the context for a relationship and context flags.
+    
+    Args:
+        relationship: Normalized relationship name, or None for an unknown relationship
+        relationship_value: The relationship's value (-1.0 to 1.0)
+        formal_setting: Whether the conversation takes place in a formal setting
+        previous_trust_breach: Whether trust has been breached before
+    
+    Returns:
+        A ContextResult for the combination
+    """
+    relationship_type = "neutral"
+    trust_level = 0.5
+    formality_level = 0.5
+    if relationship is None:
+        relationship_value = 0.0
+    else:
+        relationship_type = relationship
+        # Adjust trust based on relationship
+        trust_level = 0.5 + (relationship_value * 0.5)
+    
+    if formal_setting:
+        formality_level = 0.8  # High formality
+    if previous_trust_breach:
+        trust_level *= 0.5  # Reduce trust
+    
+    return ContextResult(
+        relationship_type=relationship_type,
+        relationship_value=relationship_value,
+        trust_level=trust_level,
+        formality_level=formality_level
+    )
+
+
+def build_context_table(relationships: Mapping[str, float]) -> Dict[ContextKey, ContextResult]:
+    """
+    Precompute the context of every relationship and flag combination.
+    
+    Args:
+        relationships: Mapping of normalized relationship names to values
+    
+    Returns:
+        A dict from (relationship, formal_setting, previous_trust_breach) to ContextResult;
+        the None relationship holds the neutral context for unknown relationships
+    """
+    table = {}
+    for relationship in (None, *relationships):
+        value = relationships.get(relationship, 0.0) if relationship is not None else 0.0
+        for formal_setting in (False, True):
+            for previous_trust_breach in (False, True):
+                table[(relationship, formal_setting, previous_trust_breach)] = build_context(
+                    relationship, value, formal_setting, previous_trust_breach
+                )
+    return table
+
 
 class ContextJudge:
     """Determines the context of a conversation based on relationships and history."""
     
-    def __init__(self):
-        """Initialize the context judge with known relationships."""
-        self.known_relationships = RELATIONSHIP_VALUES
+    def __init__(self, relationships: Optional[Mapping[str, float]] = None):
+        """
+        Initialize the context judge with known relationships.
+        
+        Args:
+            relationships: Relationship values to use instead of RELATIONSHIP_VALUES
+        """
+        self._lock = threading.Lock()
+        self._base_relationships = dict(RELATIONSHIP_VALUES if relationships is None else relationships)
+        self._registered: Dict[str, float] = {}
+        self._rebuild()
+    
+    @property
+    def known_relationships(self) -> Dict[str, float]:
+        """Relationship values currently in the context table."""
+        return self._state[0]
+    
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the current relationship values, changing whenever they do."""
+        return self._state[3]
+    
+    def set_lexicon(self, lexicon: Any) -> None:
+        """
+        Switch to the relationships of a Lexicon, keeping registered ones.
+        
+        Args:
+            lexicon: A Lexicon whose relationship values replace the current base values
+        """
+        with self._lock:
+            self._base_relationships = dict(lexicon.relationships)
+            self._rebuild()
+    
+    def register_relationship(self, relationship: str, value: float) -> None:
+        """
+        Add or update a relationship type.
+        
+        Args:
+            relationship: Name of the relationship (case-insensitive)
+            value: Relationship value (-1.0 to 1.0)
+        """
+        if not -1.0 <= value <= 1.0:
+            raise ValueError("Relationship value must be between -1.0 and 1.0")
+        with self._lock:
+            self._registered[relationship.lower()] = value
+            self._rebuild()
+    
+    def _rebuild(self) -> None:
+        """Build the context table for the current relationships; caller holds the lock."""
+        known_relationships = {**self._base_relationships, **self._registered}
+        # Swap in one complete state so concurrent lookups never see a partial update
+        self._state = (
+            known_relationships, 
+            build_context_table(known_relationships), 
+            self._build_names(known_relationships), 
+            hashlib.sha256(json.dumps(known_relationships, sort_keys=True).encode("utf-8")).hexdigest()
+        )
+    
+    def lookup(
+        self, 
+        relationship: Optional[str] = None, 
+        formal_setting: bool = False, 
+        previous_trust_breach: bool = False
+    ) -> ContextResult:
+        """
+        Return the shared, immutable context for a relationship and context flags.
+        
+        Args:
+            relationship: The known relationship between user and machine
+            formal_setting: Whether the conversation takes place in a formal setting
+            previous_trust_breach: Whether trust has been breached before
+        
+        Returns:
+            A precomputed ContextResult
+        """
+        _, table, names, _ = self._state
+        name = names.get(relationship)
+        if name is None and relationship:
+            name = names.get(relationship.lower())
+        return table[(name, formal_setting, previous_trust_breach)]
     
     def determine_context(
         self, 
         relationship: Optional[str] = None, 
-        history: Optional[List] = None, 
+        history: Union[None, ConversationState, List] = None, 
         additional_context: Optional[Dict] = None
     ) -> ContextResult:
         """
@@ -24,31 +175,56 @@ class ContextJudge:
         
         Args:
             relationship: The known relationship between user and machine
-            history: Previous interactions
+            history: Previous interactions, as a ConversationState or a list of EmotionResults
             additional_context: Any additional context information
-            
+        
         Returns:
             A ContextResult containing context information
         """
-        context_result = ContextResult()
-        
-        # Determine relationship context
-        if relationship and relationship.lower() in self.known_relationships:
-            context_result.relationship_type = relationship.lower()
-            context_result.relationship_value = self.known_relationships[relationship.lower()]
-            
-            # Adjust trust based on relationship
-            if context_result.relationship_value > 0:
-                context_result.trust_level = 0.5 + (context_result.relationship_value * 0.5)
-            else:
-                context_result.trust_level = 0.5 + (context_result.relationship_value * 0.5)
-        
-        # Process additional context if provided
         if additional_context:
-            if "formal_setting" in additional_context:
-                context_result.formality_level = 0.8  # High formality
-                
-            if "previous_trust_breach" in additional_context:
-                context_result.trust_level *= 0.5  # Reduce trust
+            context_result = self.lookup(
+                relationship,
+                "formal_setting" in additional_context,
+                "previous_trust_breach" in additional_context
+            )
+        else:
+            context_result = self.lookup(relationship)
+        
+        # Shift the context towards how the conversation has gone so far
+        if history:
+            if not isinstance(history, ConversationState):
+                state = ConversationState()
+                for past_result in history:
+                    state.update(past_result)
+                history = state
+            context_result = self._apply_history(context_result, history)
         
-        return context_result 
\ No newline at end of file
+        return context_result
+    
+    @staticmethod
+    def _build_names(relationships: Mapping[str, float]) -> Dict[Any, Optional[str]]:
+        """Map accepted spellings of each relationship to its normalized name."""
+        names: Dict[Any, Optional[str]] = {None: None, "": None}
+        for relationship in relationships:
+            names[relationship] = relationship
+            names[relationship.capitalize()] = relationship
+            names[relationship.upper()] = relationship
+        return names
+    
+    @staticmethod
+    def _apply_history(context_result: ContextResult, state: ConversationState) -> ContextResult:
+        """Blend decayed conversation aggregates into a new context result."""
+        if state.messages == 0:
+            return context_result
+        return dataclasses.replace(
+            context_result,
+            relationship_value=min(1.0, max(-1.0,
+                context_result.relationship_value + HISTORY_WEIGHT * state.valence
+            )),
+            trust_level=min(1.0, max(0.0,
+                context_result.trust_level + HISTORY_WEIGHT * (state.valence + state.trust) / 2
+            )),
+            formality_level=(
+                (1 - HISTORY_WEIGHT) * context_result.formality_level + HISTORY_WEIGHT * state.formality
+            )
+        )
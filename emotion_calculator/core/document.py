@@ -0,0 +1,167 @@
+"""Document mode: split long texts into sentences or turns and aggregate their emotions."""
+
+import itertools
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from emotion_calculator.data.models import ContextResult, DocumentChunk, DocumentResult, EmotionResult
+
+# Boundaries ending a chunk, matched against the document text
+SPLIT_PATTERNS = {
+    # Sentence-final punctuation (with closing quotes or brackets) followed by
+    # whitespace, or a line break
+    "sentence": re.compile(r"[.!?]+[\"'”’)\]]*(?=\s)|\n"),
+    # A blank line, or a line break before a "Speaker:" label
+    "turn": re.compile(r"\n[^\S\n]*\n|\n(?=[^\S\n]*[^\s:][^:\n]{0,39}:\s)"),
+}
+
+# Longest chunk in characters; longer sentences or turns are cut at whitespace
+DEFAULT_MAX_CHUNK_CHARS = 1000
+
+_LAST_SPACE = re.compile(r"\s\S*$")
+
+
+def iter_chunks(
+    document: Union[str, Iterable[str]], 
+    split: str = "sentence", 
+    max_chars: int = DEFAULT_MAX_CHUNK_CHARS
+) -> Iterator[DocumentChunk]:
+    """
+    Lazily split a document into sentence or turn chunks.
+    
+    The document may be a string or an iterable of string pieces, such as the
+    lines of an open file. Pieces are buffered only until their chunk is
+    complete, so memory stays bounded by max_chars rather than the document.
+    
+    Args:
+        document: Text, or pieces of text to concatenate
+        split: "sentence" or "turn" ("Speaker: ..." lines and blank-line separated paragraphs)
+        max_chars: Longest chunk in characters
+    
+    Returns:
+        An iterator of DocumentChunk objects with offsets into the concatenated text
+    """
+    if split not in SPLIT_PATTERNS:
+        raise ValueError(f"Unknown split mode '{split}', expected one of: {', '.join(SPLIT_PATTERNS)}")
+    if max_chars < 1:
+        raise ValueError("max_chars must be positive")
+    pattern = SPLIT_PATTERNS[split]
+    pieces: Iterable[str] = (document,) if isinstance(document, str) else document
+    
+    index = 0
+    offset = 0  # Document offset of buffer[0]
+    buffer = ""
+    for piece in itertools.chain(pieces, (None,)):
+        final = piece is None
+        if not final:
+            buffer += piece
+        
+        spans: List[Tuple[int, int]] = []
+        position = 0
+        for match in pattern.finditer(buffer):
+            if not final and match.end() == len(buffer):
+                break  # The boundary may continue in the next piece
+            spans.append((position, match.end()))
+            position = match.end()
+        if final:
+            spans.append((position, len(buffer)))
+            position = len(buffer)
+        else:
+            # No boundary in sight: cut anyway so the buffer stays bounded
+            while len(buffer) - position > max_chars:
+                end = _cut(buffer, position, max_chars)
+                spans.append((position, end))
+                position = end
+        
+        for span_start, span_end in spans:
+            for start, end in _limit(buffer, span_start, span_end, max_chars):
+                yield DocumentChunk(index=index, start=offset + start, end=offset + end, text=buffer[start:end])
+                index += 1
+        buffer = buffer[position:]
+        offset += position
+
+
+def _cut(text: str, start: int, max_chars: int) -> int:
+    """Return where to cut text so that text[start:cut], stripped, fits max_chars, preferring whitespace."""
+    while start < len(text) and text[start].isspace():
+        start += 1
+    match = _LAST_SPACE.search(text, start + 1, start + max_chars + 1)
+    return match.start() if match else min(start + max_chars, len(text))
+
+
+def _limit(text: str, start: int, end: int, max_chars: int) -> Iterator[Tuple[int, int]]:
+    """Yield whitespace-trimmed spans of text[start:end], none longer than max_chars."""
+    while start < end:
+        while start < end and text[start].isspace():
+            start += 1
+        stop = end
+        while stop > start and text[stop - 1].isspace():
+            stop -= 1
+        if start == stop:
+            return
+        if stop - start <= max_chars:
+            yield start, stop
+            return
+        cut = _cut(text, start, max_chars)
+        yield from _limit(text, start, cut, max_chars)
+        start = cut
+
+
+class DocumentAggregate:
+    """
+    Running, length-weighted aggregate of chunk results.
+    
+    Keeps one sum per emotion rather than the chunks, so a streamed document
+    can be summarized in constant memory.
+    """
+    
+    def __init__(self):
+        """Initialize an empty aggregate."""
+        self.chunks = 0
+        self.weight = 0
+        self._emotion_sums: Dict[str, float] = {}
+        self._sentiment_sum = 0.0
+    
+    def add(self, chunk: DocumentChunk, result: EmotionResult) -> None:
+        """Add one chunk's result, weighted by the chunk's length."""
+        weight = len(chunk.text)
+        self.chunks += 1
+        self.weight += weight
+        for emotion, value in result.emotions.items():
+            self._emotion_sums[emotion] = self._emotion_sums.get(emotion, 0.0) + value * weight
+        self._sentiment_sum += result.sentiment * weight
+    
+    @property
+    def emotions(self) -> Dict[str, int]:
+        """Length-weighted mean percentage per emotion."""
+        if not self.weight:
+            return {}
+        return {emotion: round(total / self.weight) for emotion, total in self._emotion_sums.items()}
+    
+    @property
+    def dominant_emotion(self) -> str:
+        """The emotion with the highest weighted mean, or "" for an empty document."""
+        if not self._emotion_sums:
+            return ""
+        return max(self._emotion_sums, key=self._emotion_sums.get)
+    
+    @property
+    def sentiment(self) -> float:
+        """Length-weighted mean sentiment polarity."""
+        return self._sentiment_sum / self.weight if self.weight else 0.0
+    
+    def to_result(
+        self, 
+        chunks: List[DocumentChunk], 
+        results: List[EmotionResult], 
+        context: ContextResult
+    ) -> DocumentResult:
+        """Build a DocumentResult holding the timeline and this aggregate."""
+        return DocumentResult(
+            chunks=chunks,
+            results=results,
+            context=context,
+            emotions=self.emotions,
+            dominant_emotion=self.dominant_emotion,
+            sentiment=self.sentiment
+        )
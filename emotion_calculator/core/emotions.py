@@ -1,19 +1,63 @@
 """Emotion mapping module for determining emotional responses."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Mapping, Optional, Sequence
 
-from emotion_calculator.config.emotion_config import EMOTIONS, EMOTION_TRIGGERS
+from emotion_calculator.core.keywords import KeywordMatcher
+from emotion_calculator.core.lexicon import Lexicon
 from emotion_calculator.data.models import SemanticAnalysisResult, ContextResult, EmotionDistribution
 
+# Action lemmas that make the relationship raise Fear (enemies) or Joy (friends)
+THREAT_ACTIONS = ("kill", "hurt")
+
 
 class EmotionMapper:
     """Maps semantic analysis and context to a distribution of emotions."""
     
-    def __init__(self):
-        """Initialize the emotion mapper with emotions and triggers."""
-        self.emotions = EMOTIONS
-        self.emotion_triggers = EMOTION_TRIGGERS
+    def __init__(self, lexicon: Optional[Lexicon] = None):
+        """
+        Initialize the emotion mapper with emotions and triggers.
         
+        Args:
+            lexicon: Emotions and triggers to use instead of the built-in configuration
+        """
+        self.lexicon = lexicon or Lexicon.default()
+    
+    def set_lexicon(self, lexicon: Lexicon) -> None:
+        """Switch to a new lexicon; calls already running finish with the old one."""
+        self.lexicon = lexicon
+    
+    @property
+    def emotions(self) -> List[str]:
+        """Names of the emotions in output order."""
+        return self.lexicon.emotions
+    
+    @property
+    def emotion_triggers(self) -> Dict[str, Dict[str, Any]]:
+        """Sentiment target and keywords per emotion."""
+        return self.lexicon.triggers
+    
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """Compiled index of the trigger keywords."""
+        return self.lexicon.matcher
+    
+    def could_use_actions(self, text: str) -> bool:
+        """
+        Cheaply check whether the action rules could apply to a text.
+        
+        Every inflection of a threat action contains its lemma ("killed",
+        "hurting"), so texts without one are scored the same whatever the
+        parser finds and can skip the full NLP pipeline.
+        
+        Args:
+            text: The raw input text
+            
+        Returns:
+            False if no threat action can be among the text's actions
+        """
+        lowered = text.lower()
+        return any(action in lowered for action in THREAT_ACTIONS)
+    
     def map_emotions(
         self, 
         semantic_analysis: SemanticAnalysisResult, 
@@ -29,24 +73,58 @@ class EmotionMapper:
         Returns:
             An EmotionDistribution mapping emotions to intensity values (0.0 to 1.0)
         """
-        # Initialize emotions with base values
-        emotion_values = {emotion: 0.1 for emotion in self.emotions}
+        lexicon = self.lexicon  # One lexicon for the whole call, even if swapped meanwhile
+        keyword_hits = lexicon.matcher.count_hits(semantic_analysis.full_text)
+        return self._map(
+            lexicon, 
+            semantic_analysis.sentiment, 
+            keyword_hits, 
+            semantic_analysis.actions, 
+            context
+        )
+    
+    def map_features(
+        self, 
+        sentiment: float, 
+        keyword_hits: Mapping[str, int], 
+        actions: Sequence[str], 
+        context: ContextResult
+    ) -> EmotionDistribution:
+        """
+        Map precomputed text features and context to a distribution of emotions.
         
-        # Adjust based on sentiment
-        sentiment = semantic_analysis.sentiment
+        Args:
+            sentiment: Sentiment polarity of the text (-1.0 to 1.0)
+            keyword_hits: Number of distinct trigger keywords found per emotion
+            actions: Lemmatized verbs found in the text
+            context: Context information
+            
+        Returns:
+            An EmotionDistribution mapping emotions to intensity values (0.0 to 1.0)
+        """
+        return self._map(self.lexicon, sentiment, keyword_hits, actions, context)
+    
+    def _map(
+        self, 
+        lexicon: Lexicon, 
+        sentiment: float, 
+        keyword_hits: Mapping[str, int], 
+        actions: Sequence[str], 
+        context: ContextResult
+    ) -> EmotionDistribution:
+        """Map text features and context to emotions with the given lexicon."""
+        # Initialize emotions with base values
+        emotion_values = {emotion: 0.1 for emotion in lexicon.emotions}
         
         # Adjust emotions based on sentiment
-        for emotion, triggers in self.emotion_triggers.items():
+        for emotion, triggers in lexicon.triggers.items():
             # Sentiment influence
             sentiment_target = triggers["sentiment"]
             sentiment_distance = abs(sentiment - sentiment_target)
             sentiment_factor = max(0, 1 - sentiment_distance)
             
             # Keyword influence
-            keyword_factor = 0
-            for keyword in triggers["keywords"]:
-                if keyword in semantic_analysis.full_text.lower():
-                    keyword_factor += 0.2
+            keyword_factor = 0.2 * keyword_hits.get(emotion, 0)
                     
             # Add to emotion score (with scaling)
             emotion_values[emotion] += (sentiment_factor * 0.6) + (keyword_factor * 0.4)
@@ -55,7 +133,7 @@ class EmotionMapper:
         relationship_value = context.relationship_value
         
         # Threatening actions with negative relationship increases fear
-        if "kill" in semantic_analysis.actions or "hurt" in semantic_analysis.actions:
+        if any(action in actions for action in THREAT_ACTIONS):
             if relationship_value < 0:
                 emotion_values["Fear"] += 0.5
             elif relationship_value > 0.5:
@@ -67,4 +145,4 @@ class EmotionMapper:
         for emotion in emotion_values:
             emotion_values[emotion] /= total
             
-        return EmotionDistribution(values=emotion_values) 
\ No newline at end of file
+        return EmotionDistribution(values=emotion_values)
\ No newline at end of file
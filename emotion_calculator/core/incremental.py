@@ -0,0 +1,209 @@
+"""Incremental re-analysis of edited text with a per-session sentence cache."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from emotion_calculator.data.models import SemanticAnalysisResult
+
+# An edit replacing text[start:end] with new text
+Edit = Tuple[int, int, str]
+
+
+class DeltaConflict(ValueError):
+    """Raised when an edit is based on a different version of the text than the server holds."""
+    
+    def __init__(self, message: str, version: int):
+        super().__init__(message)
+        self.version = version
+
+
+def sentence_key(sentence: str) -> str:
+    """Return the cache key of a sentence's text."""
+    return hashlib.blake2b(sentence.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def combine_analyses(
+    parts: Sequence[Tuple[SemanticAnalysisResult, int]], 
+    full_text: str
+) -> SemanticAnalysisResult:
+    """
+    Combine per-sentence analyses into one analysis of the whole text.
+    
+    Entities, actions and keywords are concatenated in sentence order; sentiment
+    and subjectivity are the means weighted by sentence length.
+    
+    Args:
+        parts: (analysis, sentence length) pairs in text order
+        full_text: The whole text
+    
+    Returns:
+        A SemanticAnalysisResult for full_text
+    """
+    total = sum(weight for _, weight in parts)
+    entities: List[Dict[str, str]] = []
+    actions: List[str] = []
+    keywords: List[str] = []
+    sentiment = subjectivity = 0.0
+    for analysis, weight in parts:
+        entities.extend(analysis.entities)
+        actions.extend(analysis.actions)
+        keywords.extend(analysis.keywords)
+        sentiment += analysis.sentiment * weight
+        subjectivity += analysis.subjectivity * weight
+    return SemanticAnalysisResult(
+        sentiment=sentiment / total if total else 0.0,
+        subjectivity=subjectivity / total if total else 0.0,
+        entities=entities,
+        actions=actions,
+        keywords=keywords,
+        full_text=full_text
+    )
+
+
+class _Draft:
+    """The text a session is editing and the analyses of its sentences."""
+    
+    __slots__ = ("text", "version", "sentences", "last_seen")
+    
+    def __init__(self):
+        self.text = ""
+        self.version = 0
+        self.sentences: "OrderedDict[str, SemanticAnalysisResult]" = OrderedDict()
+        self.last_seen = time.monotonic()
+
+
+class SentenceCache:
+    """
+    Keeps each session's draft text and the analyses of its sentences.
+    
+    Clients send edits against a version of the text; only sentences whose
+    text is not cached need to go through the NLP pipeline again. Sessions are
+    evicted least recently used first, as in SessionContextStore.
+    """
+    
+    def __init__(
+        self, 
+        max_sessions: int = 10000, 
+        max_sentences: int = 512, 
+        idle_timeout: Optional[float] = None
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_sessions: Maximum number of sessions kept in memory
+            max_sentences: Maximum number of sentence analyses kept per session,
+                including recently removed sentences so undoing an edit is free
+            idle_timeout: Seconds of inactivity after which a session is dropped, or None
+        """
+        self.max_sessions = max_sessions
+        self.max_sentences = max_sentences
+        self.idle_timeout = idle_timeout
+        self._drafts: "OrderedDict[str, _Draft]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def edit(
+        self, 
+        session_id: str, 
+        text: Optional[str] = None, 
+        edits: Optional[Iterable[Edit]] = None, 
+        version: Optional[int] = None, 
+        check: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, int]:
+        """
+        Replace a session's text, or apply edits to it.
+        
+        Args:
+            session_id: The session editing the text
+            text: The complete new text
+            edits: (start, end, replacement) edits applied in order, used when text is None
+            version: Version the edits are based on; required with edits
+            check: Called with the new text before it replaces the current one;
+                an exception it raises leaves the session's text unchanged
+        
+        Returns:
+            The session's new text and its version
+        
+        Raises:
+            DeltaConflict: If the edits are based on another version or out of range
+        """
+        with self._lock:
+            draft = self._get(session_id)
+            if text is not None:
+                new_text = text
+            else:
+                if version != draft.version:
+                    raise DeltaConflict(
+                        f"Edits are based on version {version}, current version is {draft.version}",
+                        draft.version
+                    )
+                new_text = draft.text
+                for start, end, replacement in edits or ():
+                    if not 0 <= start <= end <= len(new_text):
+                        raise DeltaConflict(f"Edit {start}:{end} is outside the text", draft.version)
+                    new_text = new_text[:start] + replacement + new_text[end:]
+            if check is not None:
+                check(new_text)
+            if new_text != draft.text:
+                draft.text = new_text
+                draft.version += 1
+            return draft.text, draft.version
+    
+    def lookup(self, session_id: str, keys: Iterable[str]) -> Dict[str, SemanticAnalysisResult]:
+        """Return the cached analyses of a session's sentences among the given keys."""
+        with self._lock:
+            sentences = self._get(session_id).sentences
+            found = {}
+            for key in keys:
+                analysis = sentences.get(key)
+                if analysis is not None:
+                    sentences.move_to_end(key)
+                    found[key] = analysis
+            return found
+    
+    def store(self, session_id: str, analyses: Iterable[Tuple[str, SemanticAnalysisResult]]) -> None:
+        """Cache analyses of a session's sentences, dropping the least recently used beyond the limit."""
+        with self._lock:
+            sentences = self._get(session_id).sentences
+            for key, analysis in analyses:
+                sentences[key] = analysis
+                sentences.move_to_end(key)
+            while len(sentences) > self.max_sentences:
+                sentences.popitem(last=False)
+    
+    def discard(self, session_id: str) -> None:
+        """Forget a session."""
+        with self._lock:
+            self._drafts.pop(session_id, None)
+    
+    def __len__(self) -> int:
+        return len(self._drafts)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._drafts
+    
+    def _get(self, session_id: str) -> _Draft:
+        """Return a session's draft, creating it if needed; caller holds the lock."""
+        draft = self._drafts.get(session_id)
+        if draft is None or self._is_idle(draft):
+            draft = self._drafts[session_id] = _Draft()
+        draft.last_seen = time.monotonic()
+        self._drafts.move_to_end(session_id)
+        self._evict()
+        return draft
+    
+    def _is_idle(self, draft: _Draft) -> bool:
+        """Return whether a draft has been inactive longer than the idle timeout."""
+        return self.idle_timeout is not None and time.monotonic() - draft.last_seen > self.idle_timeout
+    
+    def _evict(self) -> None:
+        """Drop idle sessions from the LRU end and enforce the size limit; caller holds the lock."""
+        while self._drafts:
+            oldest_id, oldest = next(iter(self._drafts.items()))
+            if len(self._drafts) > self.max_sessions or self._is_idle(oldest):
+                del self._drafts[oldest_id]
+            else:
+                break
@@ -0,0 +1,94 @@
+"""Compiled keyword matching for emotion triggers."""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_phrase(phrase: str) -> str:
+    """Normalize a keyword or phrase to lowercase words joined by single spaces."""
+    return " ".join(_WORD_RE.findall(phrase.lower()))
+
+
+class KeywordMatcher:
+    """
+    Finds trigger keywords for every label in a single pass over the text.
+    
+    Keywords are matched on whole words, so "mad" does not match inside "made".
+    Multi-word phrases such as "looking forward" are matched as word sequences.
+    """
+    
+    def __init__(self, keywords: Mapping[str, Iterable[str]]):
+        """
+        Compile the keyword table into a phrase index.
+        
+        Args:
+            keywords: Mapping from label (e.g. an emotion) to its trigger keywords
+        """
+        self.labels: List[str] = list(keywords)
+        index: Dict[str, List[int]] = {}
+        for label_index, label in enumerate(self.labels):
+            for keyword in keywords[label]:
+                phrase = normalize_phrase(keyword)
+                if phrase and label_index not in index.setdefault(phrase, []):
+                    index[phrase].append(label_index)
+        
+        self.index: Dict[str, Tuple[int, ...]] = {
+            phrase: tuple(label_indices) for phrase, label_indices in index.items()
+        }
+        self.max_words = max((phrase.count(" ") + 1 for phrase in self.index), default=1)
+        # First words of multi-word phrases, used to skip most n-gram lookups
+        self._phrase_starts: Set[str] = {
+            phrase.split(" ", 1)[0] for phrase in self.index if " " in phrase
+        }
+    
+    def find(self, text: str) -> Set[str]:
+        """
+        Find the distinct keywords occurring in text.
+        
+        Args:
+            text: The text to search
+            
+        Returns:
+            The set of normalized keywords found
+        """
+        words = _WORD_RE.findall(text.lower())
+        found = self.index.keys() & set(words)
+        if self._phrase_starts:
+            for position, word in enumerate(words):
+                if word not in self._phrase_starts:
+                    continue
+                for length in range(2, min(self.max_words, len(words) - position) + 1):
+                    phrase = " ".join(words[position:position + length])
+                    if phrase in self.index:
+                        found.add(phrase)
+        return found
+    
+    def hit_vector(self, text: str) -> List[int]:
+        """
+        Count the distinct keywords found for each label.
+        
+        Args:
+            text: The text to search
+            
+        Returns:
+            Keyword hit counts ordered like self.labels
+        """
+        counts = [0] * len(self.labels)
+        for phrase in self.find(text):
+            for label_index in self.index[phrase]:
+                counts[label_index] += 1
+        return counts
+    
+    def count_hits(self, text: str) -> Dict[str, int]:
+        """
+        Count the distinct keywords found for each label.
+        
+        Args:
+            text: The text to search
+            
+        Returns:
+            A mapping from label to its keyword hit count
+        """
+        return dict(zip(self.labels, self.hit_vector(text)))
\ No newline at end of file
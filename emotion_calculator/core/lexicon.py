@@ -0,0 +1,372 @@
+"""Emotion lexicons loaded from external files and reloaded while running."""
+
+import csv
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from emotion_calculator.config.emotion_config import EMOTIONS, EMOTION_TRIGGERS, RELATIONSHIP_VALUES
+from emotion_calculator.core.keywords import KeywordMatcher
+
+# Bumped whenever the pickled form of a Lexicon changes
+CACHE_VERSION = 2
+
+LEXICON_FORMATS = ("json", "yaml", "tsv")
+
+# Emotions the action rules in EmotionMapper adjust
+_REQUIRED_EMOTIONS = ("Fear", "Joy")
+
+
+class Lexicon:
+    """
+    Emotions, emotion triggers and relationship values, with a compiled keyword index.
+    
+    A Lexicon is never modified after construction, so a mapper or judge can
+    switch to a new one with a single reference assignment.
+    """
+    
+    def __init__(
+        self, 
+        emotions: Sequence[str], 
+        triggers: Mapping[str, Mapping[str, Any]], 
+        relationships: Mapping[str, float], 
+        source_hash: Optional[str] = None
+    ):
+        """
+        Validate the tables and compile the keyword index.
+        
+        Args:
+            emotions: Names of the emotions in output order
+            triggers: Mapping from emotion to {"sentiment": float, "keywords": [str, ...]}
+            relationships: Mapping from relationship name to value (-1.0 to 1.0)
+            source_hash: Hash of the files the lexicon was loaded from, if any
+        """
+        self.emotions: List[str] = list(emotions)
+        missing = [emotion for emotion in _REQUIRED_EMOTIONS if emotion not in self.emotions]
+        if missing:
+            raise ValueError(f"Lexicon is missing required emotions: {', '.join(missing)}")
+        
+        self.triggers: Dict[str, Dict[str, Any]] = {}
+        for emotion, trigger in triggers.items():
+            if emotion not in self.emotions:
+                raise ValueError(f"Trigger for unknown emotion '{emotion}'")
+            self.triggers[emotion] = {
+                "sentiment": float(trigger.get("sentiment", 0.0)),
+                "keywords": [str(keyword) for keyword in trigger.get("keywords", [])],
+            }
+        
+        self.relationships: Dict[str, float] = {}
+        for relationship, value in relationships.items():
+            value = float(value)
+            if not -1.0 <= value <= 1.0:
+                raise ValueError(f"Relationship value for '{relationship}' must be between -1.0 and 1.0")
+            self.relationships[relationship.lower()] = value
+        
+        self.source_hash = source_hash
+        # Identifies the tables' contents, e.g. in result cache keys
+        self.fingerprint = source_hash or hashlib.sha256(json.dumps(
+            [self.emotions, self.triggers, self.relationships], sort_keys=True
+        ).encode("utf-8")).hexdigest()
+        self.matcher = KeywordMatcher(
+            {emotion: trigger["keywords"] for emotion, trigger in self.triggers.items()}
+        )
+    
+    @classmethod
+    def default(cls) -> "Lexicon":
+        """Build the lexicon from the built-in configuration."""
+        return cls(EMOTIONS, EMOTION_TRIGGERS, RELATIONSHIP_VALUES)
+    
+    def __repr__(self) -> str:
+        return (
+            f"Lexicon(emotions={len(self.emotions)}, keywords={len(self.matcher.index)}, "
+            f"relationships={len(self.relationships)}, source_hash={self.source_hash!r})"
+        )
+
+
+def detect_lexicon_format(path: str) -> str:
+    """Guess a lexicon file's format from its extension."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension == "yml":
+        extension = "yaml"
+    if extension not in LEXICON_FORMATS:
+        raise ValueError(
+            f"Cannot tell the lexicon format of '{path}', "
+            f"expected one of: {', '.join('.' + fmt for fmt in LEXICON_FORMATS)}"
+        )
+    return extension
+
+
+def parse_lexicon(data: bytes, fmt: str) -> Dict[str, Any]:
+    """
+    Parse the contents of a lexicon file into its sections.
+    
+    JSON and YAML files hold a mapping with optional "emotions" (a list),
+    "triggers" (emotion -> {"sentiment", "keywords"}) and "relationships"
+    (name -> value) sections. TSV files hold one entry per row: "emotion",
+    "sentiment", "keyword" or "relationship", then a name and a value.
+    
+    Args:
+        data: Raw file contents
+        fmt: One of LEXICON_FORMATS
+    
+    Returns:
+        A dict with the sections found in the file
+    """
+    text = data.decode("utf-8")
+    if fmt == "json":
+        sections = json.loads(text)
+    elif fmt == "yaml":
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("Loading YAML lexicons requires PyYAML (pip install pyyaml)") from e
+        sections = yaml.safe_load(text) or {}
+    elif fmt == "tsv":
+        sections = _parse_tsv(text)
+    else:
+        raise ValueError(f"Unknown lexicon format '{fmt}'")
+    
+    if not isinstance(sections, dict):
+        raise ValueError("A lexicon file must contain a mapping of sections")
+    unknown = set(sections) - {"emotions", "triggers", "relationships"}
+    if unknown:
+        raise ValueError(f"Unknown lexicon sections: {', '.join(sorted(unknown))}")
+    return sections
+
+
+def _parse_tsv(text: str) -> Dict[str, Any]:
+    """Parse tab-separated lexicon rows into sections."""
+    emotions: List[str] = []
+    triggers: Dict[str, Dict[str, Any]] = {}
+    relationships: Dict[str, float] = {}
+    rows = csv.reader(
+        (line for line in text.splitlines() if line.strip() and not line.startswith("#")),
+        delimiter="\t"
+    )
+    for line_number, row in enumerate(rows, start=1):
+        kind, name, value = (row + ["", "", ""])[:3]
+        kind, name, value = kind.strip().lower(), name.strip(), value.strip()
+        if kind == "emotion":
+            emotions.append(name)
+        elif kind == "sentiment":
+            triggers.setdefault(name, {})["sentiment"] = float(value)
+        elif kind == "keyword":
+            triggers.setdefault(name, {}).setdefault("keywords", []).append(value)
+        elif kind == "relationship":
+            relationships[name] = float(value)
+        else:
+            raise ValueError(f"Unknown lexicon row type '{kind}' in row {line_number}")
+    
+    sections: Dict[str, Any] = {}
+    if emotions:
+        sections["emotions"] = emotions
+    if triggers:
+        sections["triggers"] = triggers
+    if relationships:
+        sections["relationships"] = relationships
+    return sections
+
+
+def merge_sections(layers: Iterable[Mapping[str, Any]]) -> Tuple[List[str], Dict[str, Dict[str, Any]], Dict[str, float]]:
+    """
+    Layer lexicon file sections over the built-in configuration.
+    
+    A later "emotions" list replaces the earlier one, trigger fields
+    ("sentiment", "keywords") replace those of the same emotion and
+    relationships are added or overridden one by one.
+    
+    Args:
+        layers: Parsed sections, lowest priority first
+    
+    Returns:
+        A tuple of (emotions, triggers, relationships)
+    """
+    emotions = list(EMOTIONS)
+    triggers = {emotion: dict(trigger) for emotion, trigger in EMOTION_TRIGGERS.items()}
+    relationships = dict(RELATIONSHIP_VALUES)
+    configured = set()
+    for sections in layers:
+        if "emotions" in sections:
+            emotions = list(sections["emotions"])
+        for emotion, trigger in (sections.get("triggers") or {}).items():
+            triggers.setdefault(emotion, {"sentiment": 0.0, "keywords": []}).update(trigger)
+            configured.add(emotion)
+        relationships.update(sections.get("relationships") or {})
+    # Built-in triggers of emotions dropped from the list no longer apply
+    triggers = {
+        emotion: trigger for emotion, trigger in triggers.items() 
+        if emotion in emotions or emotion in configured
+    }
+    return emotions, triggers, relationships
+
+
+def load_lexicon(paths: Sequence[str], cache_dir: Optional[str] = None) -> Lexicon:
+    """
+    Load and compile a lexicon from files layered over the built-in configuration.
+    
+    With a cache directory, the compiled lexicon is pickled under the hash of
+    the files' contents, so later loads of unchanged files skip parsing and
+    index compilation.
+    
+    Args:
+        paths: Lexicon files (.json, .yaml/.yml or .tsv), lowest priority first
+        cache_dir: Optional directory for compiled lexicons
+    
+    Returns:
+        The compiled Lexicon
+    """
+    contents = []
+    digest = hashlib.sha256(f"lexicon-v{CACHE_VERSION}".encode("utf-8"))
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        fmt = detect_lexicon_format(path)
+        contents.append((data, fmt))
+        digest.update(f"\0{fmt}\0{len(data)}\0".encode("utf-8"))
+        digest.update(data)
+    source_hash = digest.hexdigest()
+    
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f"lexicon-{source_hash}.pickle")
+        try:
+            with open(cache_path, "rb") as f:
+                lexicon = pickle.load(f)
+            if isinstance(lexicon, Lexicon) and lexicon.source_hash == source_hash:
+                return lexicon
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass  # Missing or stale cache entry; compile below
+    
+    emotions, triggers, relationships = merge_sections(parse_lexicon(data, fmt) for data, fmt in contents)
+    lexicon = Lexicon(emotions, triggers, relationships, source_hash=source_hash)
+    
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial pickle
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(lexicon, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    return lexicon
+
+
+class LexiconReloader:
+    """
+    Watches lexicon files and swaps new versions into running mappers and judges.
+    
+    Targets are objects with a set_lexicon method, such as EmotionMapper and
+    ContextJudge. A file that fails to load leaves the current lexicon in place.
+    """
+    
+    def __init__(
+        self, 
+        paths: Sequence[str], 
+        targets: Iterable[Any] = (), 
+        cache_dir: Optional[str] = None, 
+        interval: float = 2.0, 
+        on_error: Optional[Callable[[Exception], None]] = None
+    ):
+        """
+        Load the lexicon and apply it to the targets.
+        
+        Args:
+            paths: Lexicon files, lowest priority first
+            targets: Objects with a set_lexicon method to keep up to date
+            cache_dir: Optional directory for compiled lexicons
+            interval: Seconds between checks for changed files in the background thread
+            on_error: Optional callback for reload failures
+        """
+        self.paths = list(paths)
+        self.targets = list(targets)
+        self.cache_dir = cache_dir
+        self.interval = interval
+        self.on_error = on_error
+        self.reloads = 0
+        self.last_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = self._file_signature()
+        self.lexicon = load_lexicon(self.paths, cache_dir)
+        for target in self.targets:
+            target.set_lexicon(self.lexicon)
+    
+    def add_target(self, target: Any) -> None:
+        """Apply the current lexicon to a target and keep it updated."""
+        with self._lock:
+            target.set_lexicon(self.lexicon)
+            self.targets.append(target)
+    
+    def check(self) -> bool:
+        """
+        Reload the lexicon if any file's size or modification time changed.
+        
+        Returns:
+            True if a new lexicon was applied
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return False
+        return self.reload(signature)
+    
+    def reload(self, signature: Optional[Tuple] = None) -> bool:
+        """
+        Load the files again and apply the result if their contents changed.
+        
+        Returns:
+            True if a new lexicon was applied
+        """
+        with self._lock:
+            self._signature = signature if signature is not None else self._file_signature()
+            try:
+                lexicon = load_lexicon(self.paths, self.cache_dir)
+            except Exception as e:
+                self.last_error = e
+                if self.on_error is not None:
+                    self.on_error(e)
+                return False
+            self.last_error = None
+            if lexicon.source_hash == self.lexicon.source_hash:
+                return False
+            self.lexicon = lexicon
+            for target in self.targets:
+                target.set_lexicon(lexicon)
+            self.reloads += 1
+            return True
+    
+    def start(self) -> None:
+        """Check for changed files every interval seconds in a background thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="lexicon-reloader", daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the background thread."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+    
+    def _file_signature(self) -> Tuple:
+        """Size and modification time of every file (None for missing files)."""
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
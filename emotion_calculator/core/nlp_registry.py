@@ -0,0 +1,102 @@
+"""Process-wide registry of loaded spaCy pipelines."""
+
+import gc
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Pipeline components excluded for each analyzer profile. The analyzer only
+# reads token.pos_, token.lemma_ and doc.ents, so the dependency parser (and
+# the sentence recognizer) never contribute to the result.
+ANALYZER_PROFILES = {
+    "full": [],
+    "fast": ["parser", "senter"],
+    "no_entities": ["parser", "senter", "ner"],
+}
+
+_models: Dict[Tuple[str, str], Any] = {}
+_lock = threading.Lock()
+
+
+def _check_profile(profile: str) -> None:
+    """Raise a ValueError for unknown analyzer profiles."""
+    if profile not in ANALYZER_PROFILES:
+        raise ValueError(
+            f"Unknown analyzer profile '{profile}', "
+            f"expected one of: {', '.join(ANALYZER_PROFILES)}"
+        )
+
+
+def get_nlp(model: str = DEFAULT_MODEL, profile: str = "full") -> Any:
+    """
+    Get the shared spaCy pipeline for a model and profile, loading it on first use.
+    
+    Args:
+        model: Name of the spaCy model
+        profile: Analyzer profile deciding which components are loaded
+        
+    Returns:
+        The loaded spaCy Language object, shared by every caller in the process
+    """
+    _check_profile(profile)
+    key = (model, profile)
+    nlp = _models.get(key)
+    if nlp is None:
+        with _lock:
+            nlp = _models.get(key)
+            if nlp is None:
+                import spacy  # Imported lazily to keep package import fast
+                
+                nlp = spacy.load(model, exclude=ANALYZER_PROFILES[profile])
+                _models[key] = nlp
+    return nlp
+
+
+def register(nlp: Any, model: str = DEFAULT_MODEL, profile: str = "full") -> None:
+    """
+    Register an already built pipeline so analyzers share it instead of loading one.
+    
+    Args:
+        nlp: The spaCy Language object to share
+        model: Name the pipeline is registered under
+        profile: Analyzer profile the pipeline is registered under
+    """
+    _check_profile(profile)
+    with _lock:
+        _models[(model, profile)] = nlp
+
+
+def preload(
+    model: str = DEFAULT_MODEL, 
+    profiles: Iterable[str] = ("full",), 
+    freeze: bool = True
+) -> None:
+    """
+    Load pipelines eagerly, typically in a parent process before forking workers.
+    
+    With freeze enabled the loaded objects are moved into the garbage collector's
+    permanent generation, so collections in forked children do not touch (and
+    copy) the pages the model lives on.
+    
+    Args:
+        model: Name of the spaCy model
+        profiles: Analyzer profiles to load
+        freeze: Whether to freeze the garbage collector after loading
+    """
+    for profile in profiles:
+        get_nlp(model, profile)
+    if freeze and hasattr(gc, "freeze"):
+        gc.collect()
+        gc.freeze()
+
+
+def loaded_models() -> List[Tuple[str, str]]:
+    """Return the (model, profile) pairs currently loaded in this process."""
+    return list(_models)
+
+
+def clear() -> None:
+    """Drop every shared pipeline, forcing the next request to reload."""
+    with _lock:
+        _models.clear()
\ No newline at end of file
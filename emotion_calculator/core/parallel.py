@@ -0,0 +1,232 @@
+"""Multi-process sharded scoring with worker-local NLP models."""
+
+import itertools
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from emotion_calculator.core import nlp_registry
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.lexicon import Lexicon
+from emotion_calculator.core.nlp_registry import DEFAULT_MODEL
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.data.models import EmotionResult
+
+# Calculator owned by each worker process, built once by _init_worker
+_worker_calculator: Optional[EmotionCalculator] = None
+
+_Chunk = Tuple[int, List[str], List[Optional[str]], List[Optional[Dict]]]
+
+# Marks an exhausted input in _aligned_rows
+_END = object()
+
+
+def _init_worker(
+    model: str, 
+    profile: str, 
+    nlp_factory: Optional[Callable[[], Any]], 
+    sentiment: str, 
+    lexicon: Optional[Lexicon]
+) -> None:
+    """Load the NLP model once per worker process."""
+    global _worker_calculator
+    if nlp_factory is not None:
+        nlp_registry.register(nlp_factory(), model=model, profile=profile)
+    analyzer = SemanticAnalyzer(profile=profile, model=model, sentiment=sentiment)
+    analyzer.nlp  # Load now rather than on the first chunk
+    _worker_calculator = EmotionCalculator(semantic_analyzer=analyzer, lexicon=lexicon)
+
+
+def _check_lengths(texts: Iterable[str], **per_text: Any) -> None:
+    """Raise ValueError if a per-text input of known length does not have one entry per text."""
+    if not hasattr(texts, "__len__"):
+        return
+    for name, values in per_text.items():
+        if hasattr(values, "__len__") and len(values) != len(texts):
+            raise ValueError(f"{name} must have one entry per text")
+
+
+def _aligned_rows(
+    texts: Iterable[str], 
+    relationships: Iterable[Optional[str]], 
+    additional_contexts: Iterable[Optional[Dict]]
+) -> Iterator[Tuple[str, Optional[str], Optional[Dict]]]:
+    """Zip the inputs, raising ValueError instead of dropping rows when their lengths differ."""
+    columns = (iter(relationships), iter(additional_contexts))
+    names = ("relationships", "additional_context")
+    for text in texts:
+        row = [next(column, _END) for column in columns]
+        for name, value in zip(names, row):
+            if value is _END:
+                raise ValueError(f"{name} must have one entry per text")
+        yield (text, *row)
+    for name, column in zip(names, columns):
+        if not isinstance(column, itertools.repeat) and next(column, _END) is not _END:
+            raise ValueError(f"{name} must have one entry per text")
+
+
+def _score_chunk(chunk: _Chunk) -> Tuple[int, List[EmotionResult]]:
+    """Score one chunk inside a worker process."""
+    start, texts, relationships, additional_contexts = chunk
+    results = _worker_calculator.calculate_emotions(
+        texts, 
+        relationships=relationships, 
+        additional_context=additional_contexts, 
+        batch_size=len(texts) or 1
+    )
+    return start, results
+
+
+class ParallelEmotionCalculator:
+    """
+    Scores messages across a pool of worker processes.
+    
+    Each worker loads the spaCy model once in its initializer. Input is sent in
+    chunks to amortize inter-process communication, and only a bounded number of
+    chunks is in flight at a time, so arbitrarily long iterables can be streamed.
+    """
+    
+    def __init__(
+        self, 
+        workers: Optional[int] = None, 
+        chunk_size: int = 256, 
+        profile: str = "full", 
+        model: str = DEFAULT_MODEL, 
+        nlp_factory: Optional[Callable[[], Any]] = None, 
+        max_pending: Optional[int] = None, 
+        mp_context: Optional[Any] = None, 
+        sentiment: str = "textblob", 
+        lexicon: Optional[Lexicon] = None
+    ):
+        """
+        Initialize the worker pool.
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            chunk_size: Messages sent to a worker per task
+            profile: Analyzer profile loaded by each worker
+            model: Name of the spaCy model loaded by each worker
+            nlp_factory: Optional picklable callable building the pipeline in each worker
+            max_pending: Maximum chunks in flight (defaults to twice the worker count)
+            mp_context: Optional multiprocessing context (e.g. from get_context("spawn"))
+            sentiment: Name of the sentiment backend used by each worker
+            lexicon: Optional lexicon sent to each worker instead of the built-in one
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(model, profile, nlp_factory, sentiment, lexicon)
+        )
+    
+    def _chunks(
+        self, 
+        texts: Iterable[str], 
+        relationships: Union[None, str, Iterable[Optional[str]]], 
+        additional_context: Union[None, Dict, Iterable[Optional[Dict]]]
+    ) -> Iterator[_Chunk]:
+        """Split aligned inputs into chunks tagged with their start index."""
+        if relationships is None or isinstance(relationships, str):
+            relationships = itertools.repeat(relationships)
+        if additional_context is None or isinstance(additional_context, dict):
+            additional_context = itertools.repeat(additional_context)
+        rows = _aligned_rows(texts, relationships, additional_context)
+        start = 0
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            texts_chunk, relationships_chunk, contexts_chunk = (list(column) for column in zip(*chunk))
+            yield start, texts_chunk, relationships_chunk, contexts_chunk
+            start += len(chunk)
+    
+    def imap(
+        self, 
+        texts: Iterable[str], 
+        relationships: Union[None, str, Iterable[Optional[str]]] = None, 
+        additional_context: Union[None, Dict, Iterable[Optional[Dict]]] = None, 
+        ordered: bool = True
+    ) -> Iterator[Tuple[int, EmotionResult]]:
+        """
+        Score messages in parallel, yielding results as they become available.
+        
+        Args:
+            texts: The input texts to respond to
+            relationships: A single relationship for every text, or one per text
+            additional_context: Additional context for every text, or one per text
+            ordered: Yield results in input order; otherwise in completion order
+        
+        Returns:
+            An iterator of (input index, EmotionResult) pairs
+        
+        Raises:
+            ValueError: If relationships or additional_context does not have one
+                entry per text; raised here for sized inputs, otherwise once
+                the shorter input runs out
+        """
+        if not (relationships is None or isinstance(relationships, str)):
+            _check_lengths(texts, relationships=relationships)
+        if not (additional_context is None or isinstance(additional_context, dict)):
+            _check_lengths(texts, additional_context=additional_context)
+        return self._imap(self._chunks(texts, relationships, additional_context), ordered)
+    
+    def _imap(self, chunks: Iterator[_Chunk], ordered: bool) -> Iterator[Tuple[int, EmotionResult]]:
+        """Submit chunks to the pool, keeping at most max_pending in flight, and yield their results."""
+        pending: Dict[Future, int] = {}
+        completed: Dict[int, List[EmotionResult]] = {}
+        next_start = 0
+        
+        for chunk in itertools.chain(chunks, [None]):
+            if chunk is not None:
+                pending[self._executor.submit(_score_chunk, chunk)] = chunk[0]
+                if len(pending) < self.max_pending:
+                    continue
+            
+            # Drain until there is room for the next chunk (or everything at the end)
+            while pending and (chunk is None or len(pending) >= self.max_pending):
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    start, results = future.result()
+                    if not ordered:
+                        for offset, result in enumerate(results):
+                            yield start + offset, result
+                        continue
+                    completed[start] = results
+                    while next_start in completed:
+                        results = completed.pop(next_start)
+                        for offset, result in enumerate(results):
+                            yield next_start + offset, result
+                        next_start += len(results)
+    
+    def calculate_emotions(
+        self, 
+        texts: Sequence[str], 
+        relationships: Union[None, str, Sequence[Optional[str]]] = None, 
+        additional_context: Union[None, Dict, Sequence[Optional[Dict]]] = None
+    ) -> List[EmotionResult]:
+        """
+        Score messages in parallel and return every result in input order.
+        
+        Args:
+            texts: The input texts to respond to
+            relationships: A single relationship for every text, or one per text
+            additional_context: Additional context for every text, or one per text
+        
+        Returns:
+            A list of EmotionResult objects in input order
+        """
+        return [result for _, result in self.imap(texts, relationships, additional_context)]
+    
+    def close(self) -> None:
+        """Shut the worker pool down."""
+        self._executor.shutdown(wait=True)
+    
+    def __enter__(self) -> "ParallelEmotionCalculator":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
\ No newline at end of file
@@ -1,18 +1,68 @@
 """Semantic analysis module for text processing."""
 
-import spacy
-from textblob import TextBlob
-from typing import Dict, List, Any
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
+from emotion_calculator.core import nlp_registry
+from emotion_calculator.core.nlp_registry import ANALYZER_PROFILES, DEFAULT_MODEL
+from emotion_calculator.core.sentiment import SentimentBackend, get_backend
 from emotion_calculator.data.models import SemanticAnalysisResult
+from emotion_calculator.utils.metrics import MetricsRegistry
 
 
 class SemanticAnalyzer:
     """Analyzes text to extract semantic features and sentiment."""
     
-    def __init__(self):
-        """Initialize the semantic analyzer with NLP models."""
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(
+        self, 
+        nlp: Optional[Any] = None, 
+        profile: str = "full", 
+        model: str = DEFAULT_MODEL, 
+        sentiment: Union[str, SentimentBackend] = "textblob", 
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        Initialize the semantic analyzer with NLP models.
+        
+        The spaCy model is not loaded here. Unless a pipeline is passed in, it is
+        fetched from the process-wide registry on first use and shared with every
+        other analyzer using the same model and profile.
+        
+        Args:
+            nlp: Optional preloaded spaCy pipeline to use instead of the shared one
+            profile: Analyzer profile ("full", "fast" or "no_entities")
+            model: Name of the spaCy model to load
+            sentiment: Sentiment backend or its name ("textblob" or "lexicon")
+            metrics: Optional registry receiving the time spent in spaCy,
+                sentiment scoring and feature extraction
+        """
+        if profile not in ANALYZER_PROFILES:
+            raise ValueError(
+                f"Unknown analyzer profile '{profile}', "
+                f"expected one of: {', '.join(ANALYZER_PROFILES)}"
+            )
+        self.profile = profile
+        self.model = model
+        self.extract_entities = "ner" not in ANALYZER_PROFILES[profile]
+        self._nlp = nlp
+        self.sentiment_backend = get_backend(sentiment)
+        self.metrics = metrics
+    
+    @property
+    def nlp(self) -> Any:
+        """The spaCy pipeline, loaded from the shared registry on first access."""
+        if self._nlp is None:
+            self._nlp = nlp_registry.get_nlp(self.model, self.profile)
+        return self._nlp
+    
+    @nlp.setter
+    def nlp(self, nlp: Any) -> None:
+        self._nlp = nlp
+    
+    @property
+    def cache_scope(self) -> str:
+        """Identify what this analyzer's results depend on, for semantic cache keys."""
+        return f"{self.model}:{self.profile}:{self.sentiment_backend.name}"
     
     def analyze(self, text: str) -> SemanticAnalysisResult:
         """
@@ -20,25 +70,154 @@ class SemanticAnalyzer:
         
         Args:
             text: Input text to analyze
-            
+        
         Returns:
             A SemanticAnalysisResult containing analysis results
         """
+        metrics = self.metrics
+        if metrics is None:
+            return self._build_result(self.nlp(text), text)
+        start = perf_counter()
         doc = self.nlp(text)
-        blob = TextBlob(text)
+        metrics.observe_stage("nlp", perf_counter() - start)
+        return self._build_result(doc, text)
+    
+    def analyze_batch(
+        self, 
+        texts: Iterable[str], 
+        batch_size: int = 256, 
+        n_process: int = 1
+    ) -> List[SemanticAnalysisResult]:
+        """
+        Analyze many texts at once using spaCy's batched pipeline.
+        
+        Args:
+            texts: Input texts to analyze
+            batch_size: Number of texts spaCy processes per batch
+            n_process: Number of worker processes used by spaCy
+        
+        Returns:
+            A list of SemanticAnalysisResult objects in input order
+        """
+        texts = list(texts)
+        if self.metrics is not None:
+            return self._build_timed(
+                lambda: self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process), 
+                texts, 
+                self._build_result, 
+                "nlp"
+            )
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        return [self._build_result(doc, text) for doc, text in zip(docs, texts)]
+    
+    def analyze_lexical(self, text: str) -> SemanticAnalysisResult:
+        """
+        Analyze text with the tokenizer only, skipping tagging, parsing and NER.
+        
+        Sentiment is the same as from analyze, but entities, actions and
+        keywords are left empty.
         
-        # Extract sentiment using TextBlob
-        sentiment = blob.sentiment.polarity  # Range: -1 (negative) to 1 (positive)
-        subjectivity = blob.sentiment.subjectivity  # Range: 0 (objective) to 1 (subjective)
+        Args:
+            text: Input text to analyze
+        
+        Returns:
+            A SemanticAnalysisResult with sentiment and subjectivity only
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return self._build_lexical_result(self.nlp.make_doc(text), text)
+        start = perf_counter()
+        doc = self.nlp.make_doc(text)
+        metrics.observe_stage("tokenize", perf_counter() - start)
+        return self._build_lexical_result(doc, text)
+    
+    def analyze_lexical_batch(
+        self, 
+        texts: Iterable[str], 
+        batch_size: int = 256
+    ) -> List[SemanticAnalysisResult]:
+        """
+        Analyze many texts with the tokenizer only (see analyze_lexical).
+        
+        Args:
+            texts: Input texts to analyze
+            batch_size: Number of texts tokenized per batch
+        
+        Returns:
+            A list of SemanticAnalysisResult objects in input order
+        """
+        texts = list(texts)
+        if self.metrics is not None:
+            return self._build_timed(
+                lambda: self.nlp.tokenizer.pipe(texts, batch_size=batch_size), 
+                texts, 
+                self._build_lexical_result, 
+                "tokenize"
+            )
+        docs = self.nlp.tokenizer.pipe(texts, batch_size=batch_size)
+        return [self._build_lexical_result(doc, text) for doc, text in zip(docs, texts)]
+    
+    def _build_timed(
+        self, 
+        make_docs: Callable[[], Iterable[Any]], 
+        texts: List[str], 
+        build: Callable[[Any, str], SemanticAnalysisResult], 
+        stage: str
+    ) -> List[SemanticAnalysisResult]:
+        """Build results from lazily produced Docs, recording the spaCy time of the whole batch."""
+        results = []
+        build_seconds = 0.0
+        start = perf_counter()
+        for doc, text in zip(make_docs(), texts):
+            build_start = perf_counter()
+            results.append(build(doc, text))
+            build_seconds += perf_counter() - build_start
+        if texts:
+            # Docs are produced while results are built, so building time is subtracted
+            self.metrics.observe_stage(stage, perf_counter() - start - build_seconds, mode="batch")
+        return results
+    
+    def _build_lexical_result(self, doc: Any, text: str) -> SemanticAnalysisResult:
+        """Build a SemanticAnalysisResult holding only the sentiment of a tokenized Doc."""
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        sentiment, subjectivity = self.sentiment_backend.score(doc, text)
+        if metrics is not None:
+            metrics.observe_stage("sentiment", perf_counter() - start)
+        return SemanticAnalysisResult(
+            sentiment=sentiment,
+            subjectivity=subjectivity,
+            entities=[],
+            actions=[],
+            keywords=[],
+            full_text=text
+        )
+    
+    def _build_result(self, doc: Any, text: str) -> SemanticAnalysisResult:
+        """Build a SemanticAnalysisResult from a processed spaCy Doc."""
+        # Extract sentiment, polarity from -1 (negative) to 1 (positive) and
+        # subjectivity from 0 (objective) to 1 (subjective)
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        sentiment, subjectivity = self.sentiment_backend.score(doc, text)
+        if metrics is not None:
+            features_start = perf_counter()
+            metrics.observe_stage("sentiment", features_start - start)
         
-        # Extract key entities
-        entities = [{"text": ent.text, "label": ent.label_} for ent in doc.ents]
+        # Extract key entities (skipped by the "no_entities" profile)
+        entities = []
+        if self.extract_entities:
+            entities = [{"text": ent.text, "label": ent.label_} for ent in doc.ents]
         
         # Extract key verbs (actions)
         actions = [token.lemma_ for token in doc if token.pos_ == "VERB"]
         
         # Extract keywords (nouns and proper nouns)
         keywords = [token.lemma_ for token in doc if token.pos_ in ["NOUN", "PROPN"]]
+        if metrics is not None:
+            metrics.observe_stage("features", perf_counter() - features_start)
         
         return SemanticAnalysisResult(
             sentiment=sentiment,
@@ -47,4 +226,4 @@ class SemanticAnalyzer:
             actions=actions,
             keywords=keywords,
             full_text=text
-        ) 
\ No newline at end of file
+        )
\ No newline at end of file
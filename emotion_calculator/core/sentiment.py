@@ -0,0 +1,223 @@
+"""Sentiment backends scoring polarity and subjectivity of analyzed text."""
+
+import os
+import threading
+import xml.etree.ElementTree as ElementTree
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+# Words that flip the polarity of the next sentiment word ("not good")
+NEGATIONS = frozenset(["no", "not", "n't", "never"])
+
+# Lexicon entry: (polarity, subjectivity, intensity, is_modifier)
+LexiconEntry = Tuple[float, float, float, bool]
+
+_default_lexicon: Optional[Dict[str, LexiconEntry]] = None
+_lexicon_lock = threading.Lock()
+
+
+class SentimentBackend(ABC):
+    """Interface for scoring sentiment of a processed text."""
+    
+    name = "base"
+    
+    @abstractmethod
+    def score(self, doc: Any, text: str) -> Tuple[float, float]:
+        """
+        Score the sentiment of a text.
+        
+        Args:
+            doc: The spaCy Doc of the text
+            text: The raw text
+        
+        Returns:
+            A (polarity, subjectivity) tuple, polarity in -1.0 to 1.0 and
+            subjectivity in 0.0 to 1.0
+        """
+
+
+class TextBlobSentiment(SentimentBackend):
+    """Scores sentiment with TextBlob's pattern analyzer, re-tokenizing the raw text."""
+    
+    name = "textblob"
+    
+    def score(self, doc: Any, text: str) -> Tuple[float, float]:
+        from textblob import TextBlob  # Imported lazily to keep package import fast
+        
+        sentiment = TextBlob(text).sentiment
+        return sentiment.polarity, sentiment.subjectivity
+
+
+class LexiconSentiment(SentimentBackend):
+    """
+    Scores sentiment from the spaCy Doc's tokens with a preloaded word lexicon.
+    
+    Follows the pattern analyzer TextBlob uses: an intensifier ("very")
+    multiplies the next sentiment word, a negation ("not") turns it into half
+    its opposite, and the text's score is the mean over its sentiment words.
+    Skips TextBlob's second tokenization of the text.
+    """
+    
+    name = "lexicon"
+    
+    def __init__(
+        self, 
+        lexicon: Optional[Mapping[str, Sequence[Any]]] = None, 
+        negations: Optional[Sequence[str]] = None
+    ):
+        """
+        Initialize the lexicon backend.
+        
+        Args:
+            lexicon: Mapping of lowercase words to (polarity, subjectivity[, intensity[, is_modifier]]);
+                defaults to TextBlob's English sentiment lexicon
+            negations: Words that negate the next sentiment word
+        """
+        if lexicon is None:
+            self.lexicon = load_default_lexicon()
+        else:
+            self.lexicon = {word.lower(): _lexicon_entry(values) for word, values in lexicon.items()}
+        self.negations = NEGATIONS if negations is None else frozenset(negations)
+    
+    def score(self, doc: Any, text: str) -> Tuple[float, float]:
+        lexicon = self.lexicon
+        negations = self.negations
+        scored = []  # [polarity, subjectivity, intensity, negated] per sentiment word
+        modifier = None  # Preceding intensifier, e.g. "very"
+        negated = False
+        for token in doc:
+            word = token.lower_
+            entry = lexicon.get(word)
+            if entry is not None:
+                polarity, subjectivity, intensity, is_modifier = entry
+                if modifier is None:
+                    scored.append([polarity, subjectivity, intensity, False])
+                else:
+                    # Intensified word ("really good"): scale by the modifier's intensity
+                    previous = scored[-1]
+                    previous[0] = max(-1.0, min(polarity * previous[2], 1.0))
+                    previous[1] = max(-1.0, min(subjectivity * previous[2], 1.0))
+                    previous[2] = intensity
+                if negated:
+                    scored[-1][2] = 1.0 / scored[-1][2] if scored[-1][2] else 1.0
+                    scored[-1][3] = True
+                modifier = word if is_modifier else None
+                negated = word in negations
+                continue
+            
+            if word in negations:
+                negated = True
+            elif negated and len(word.strip("'")) > 1:
+                # Negations carry across small words only ("not a good")
+                negated = False
+            if negated and modifier is not None and modifier.endswith("ly"):
+                # "really not good"
+                scored[-1][3] = True
+                negated = False
+            elif modifier is not None and len(word) > 2:
+                modifier = None
+            if word == "!" and scored:
+                # Exclamation marks boost the previous sentiment word
+                scored[-1][0] = max(-1.0, min(scored[-1][0] * 1.25, 1.0))
+        
+        if not scored:
+            return 0.0, 0.0
+        polarity = sum(-0.5 * p if n else p for p, _, _, n in scored) / len(scored)
+        subjectivity = sum(s for _, s, _, _ in scored) / len(scored)
+        return max(-1.0, min(polarity, 1.0)), max(0.0, min(subjectivity, 1.0))
+
+
+# Sentiment backends selectable by name
+SENTIMENT_BACKENDS = {
+    TextBlobSentiment.name: TextBlobSentiment,
+    LexiconSentiment.name: LexiconSentiment,
+}
+
+
+def get_backend(backend: Any = "textblob") -> SentimentBackend:
+    """
+    Resolve a sentiment backend given by name or instance.
+    
+    Args:
+        backend: A SentimentBackend, or the name of one in SENTIMENT_BACKENDS
+    
+    Returns:
+        A SentimentBackend instance
+    """
+    if isinstance(backend, SentimentBackend):
+        return backend
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(
+            f"Unknown sentiment backend '{backend}', "
+            f"expected one of: {', '.join(SENTIMENT_BACKENDS)}"
+        )
+    return SENTIMENT_BACKENDS[backend]()
+
+
+def load_default_lexicon() -> Dict[str, LexiconEntry]:
+    """Load TextBlob's English sentiment lexicon once per process."""
+    global _default_lexicon
+    if _default_lexicon is None:
+        with _lexicon_lock:
+            if _default_lexicon is None:
+                import importlib.util
+                
+                spec = importlib.util.find_spec("textblob")
+                if spec is None or spec.origin is None:
+                    raise ImportError("The default sentiment lexicon ships with textblob; install it or pass a lexicon")
+                path = os.path.join(os.path.dirname(spec.origin), "en", "en-sentiment.xml")
+                _default_lexicon = load_pattern_lexicon(path)
+    return _default_lexicon
+
+
+def load_pattern_lexicon(path: str) -> Dict[str, LexiconEntry]:
+    """
+    Read a pattern-style sentiment XML lexicon the way TextBlob does.
+    
+    Senses are averaged per part-of-speech tag and then across tags, and
+    adverbs are derived from adjectives ("terrible" gives "terribly").
+    
+    Args:
+        path: Path to the XML file
+    
+    Returns:
+        A dict of lowercase words to lexicon entries
+    """
+    senses: Dict[str, Dict[Optional[str], list]] = {}
+    for element in ElementTree.parse(path).getroot().iter("word"):
+        scores = (
+            float(element.get("polarity", 0.0)), 
+            float(element.get("subjectivity", 0.0)), 
+            float(element.get("intensity", 1.0))
+        )
+        senses.setdefault(element.get("form"), {}).setdefault(element.get("pos"), []).append(scores)
+    
+    by_pos = {
+        word: {pos: _mean(scores) for pos, scores in tags.items()} 
+        for word, tags in senses.items()
+    }
+    lexicon = {}
+    for word, tags in by_pos.items():
+        lexicon[word] = (*_mean(list(tags.values())), "RB" in tags)
+    for word, tags in by_pos.items():
+        if "JJ" in tags:
+            if word.endswith("y"):
+                word = word[:-1] + "i"
+            if word.endswith("le"):
+                word = word[:-2]
+            lexicon[word + "ly"] = (*tags["JJ"], True)
+    return lexicon
+
+
+def _mean(scores: Sequence[Sequence[float]]) -> Tuple[float, ...]:
+    """Average a list of equally long score tuples column by column."""
+    return tuple(sum(column) / len(column) for column in zip(*scores))
+
+
+def _lexicon_entry(values: Sequence[Any]) -> LexiconEntry:
+    """Normalize a user-supplied lexicon value to a full entry."""
+    values = tuple(values)
+    polarity, subjectivity = float(values[0]), float(values[1])
+    intensity = float(values[2]) if len(values) > 2 else 1.0
+    is_modifier = bool(values[3]) if len(values) > 3 else False
+    return polarity, subjectivity, intensity, is_modifier
@@ -0,0 +1,183 @@
+"""Incremental per-session conversation context."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from emotion_calculator.data.models import EmotionResult
+
+# Emotions counted as positive or negative when computing a message's valence
+POSITIVE_EMOTIONS = ("Joy", "Trust", "Anticipation")
+NEGATIVE_EMOTIONS = ("Sadness", "Anger", "Fear", "Disgust")
+
+
+class ConversationState:
+    """
+    Exponentially decayed running aggregates of a conversation's past results.
+    
+    Each update is O(1) and the state has a fixed size, however long the
+    conversation gets. Older messages count for less: after every message the
+    existing aggregates are multiplied by the decay factor.
+    """
+    
+    __slots__ = ("decay", "messages", "weight", "valence_sum", "trust_sum", "formality_sum", "last_seen")
+    
+    def __init__(self, decay: float = 0.8):
+        """
+        Initialize an empty conversation state.
+        
+        Args:
+            decay: Weight kept by the existing aggregates on each new message (0.0 to 1.0)
+        """
+        self.decay = decay
+        self.messages = 0
+        self.weight = 0.0
+        self.valence_sum = 0.0
+        self.trust_sum = 0.0
+        self.formality_sum = 0.0
+        self.last_seen = time.monotonic()
+    
+    def update(self, result: EmotionResult) -> None:
+        """
+        Fold one new result into the running aggregates.
+        
+        Args:
+            result: The EmotionResult of the latest message
+        """
+        emotions = result.emotions
+        positive = sum(emotions.get(emotion, 0) for emotion in POSITIVE_EMOTIONS)
+        negative = sum(emotions.get(emotion, 0) for emotion in NEGATIVE_EMOTIONS)
+        
+        self.messages += 1
+        self.weight = self.weight * self.decay + 1.0
+        self.valence_sum = self.valence_sum * self.decay + (positive - negative) / 100.0
+        self.trust_sum = self.trust_sum * self.decay + emotions.get("Trust", 0) / 100.0
+        self.formality_sum = self.formality_sum * self.decay + result.context.formality_level
+        self.last_seen = time.monotonic()
+    
+    @property
+    def valence(self) -> float:
+        """Decayed mean valence of past messages (-1.0 to 1.0)."""
+        return self.valence_sum / self.weight if self.weight else 0.0
+    
+    @property
+    def trust(self) -> float:
+        """Decayed mean share of Trust in past messages (0.0 to 1.0)."""
+        return self.trust_sum / self.weight if self.weight else 0.0
+    
+    @property
+    def formality(self) -> float:
+        """Decayed mean formality level of past messages (0.0 to 1.0)."""
+        return self.formality_sum / self.weight if self.weight else 0.5
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the state to a JSON-compatible dict."""
+        return {
+            "decay": self.decay,
+            "messages": self.messages,
+            "weight": self.weight,
+            "valence_sum": self.valence_sum,
+            "trust_sum": self.trust_sum,
+            "formality_sum": self.formality_sum,
+        }
+    
+    def copy(self) -> "ConversationState":
+        """Return an independent copy of the state."""
+        return ConversationState.from_dict(self.to_dict())
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationState":
+        """Rebuild a state serialized with to_dict."""
+        state = cls(decay=data["decay"])
+        state.messages = data["messages"]
+        state.weight = data["weight"]
+        state.valence_sum = data["valence_sum"]
+        state.trust_sum = data["trust_sum"]
+        state.formality_sum = data["formality_sum"]
+        return state
+
+
+class SessionContextStore:
+    """Keeps a ConversationState per session, evicting the least recently active ones."""
+    
+    def __init__(self, max_sessions: int = 10000, idle_timeout: Optional[float] = None, decay: float = 0.8):
+        """
+        Initialize the session store.
+        
+        Args:
+            max_sessions: Maximum number of sessions kept in memory
+            idle_timeout: Seconds of inactivity after which a session is dropped, or None
+            decay: Decay factor for new conversation states
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.decay = decay
+        self._sessions: "OrderedDict[str, ConversationState]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, session_id: str) -> ConversationState:
+        """
+        Return the state for a session, creating it if needed.
+        
+        Args:
+            session_id: The conversation's session identifier
+        
+        Returns:
+            The session's ConversationState
+        """
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is not None and self._is_idle(state):
+                del self._sessions[session_id]
+                state = None
+            if state is None:
+                state = ConversationState(decay=self.decay)
+                self._sessions[session_id] = state
+            self._sessions.move_to_end(session_id)
+            self._evict()
+            return state
+    
+    def update(self, session_id: str, result: EmotionResult) -> ConversationState:
+        """Fold a new result into a session's state and return the state."""
+        state = self.get(session_id)
+        with self._lock:
+            state.update(result)
+        return state
+    
+    def discard(self, session_id: str) -> None:
+        """Forget a session."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialize every session's state to a JSON-compatible dict."""
+        with self._lock:
+            return {session_id: state.to_dict() for session_id, state in self._sessions.items()}
+    
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """Load session states from a dict produced by snapshot."""
+        with self._lock:
+            for session_id, data in snapshot.items():
+                self._sessions[session_id] = ConversationState.from_dict(data)
+                self._sessions.move_to_end(session_id)
+            self._evict()
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+    
+    def _is_idle(self, state: ConversationState) -> bool:
+        """Return whether a state has been inactive longer than the idle timeout."""
+        return self.idle_timeout is not None and time.monotonic() - state.last_seen > self.idle_timeout
+    
+    def _evict(self) -> None:
+        """Drop idle sessions from the LRU end and enforce the size limit; caller holds the lock."""
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if len(self._sessions) > self.max_sessions or self._is_idle(oldest):
+                del self._sessions[oldest_id]
+            else:
+                break
\ No newline at end of file
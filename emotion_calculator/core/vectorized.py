@@ -0,0 +1,133 @@
+"""Vectorized emotion mapping for large batches of messages."""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from emotion_calculator.core.emotions import THREAT_ACTIONS, EmotionMapper
+from emotion_calculator.data.models import ContextResult, EmotionDistribution, SemanticAnalysisResult
+
+
+class VectorizedEmotionMapper:
+    """
+    Computes the N x len(EMOTIONS) emotion matrix for a batch with NumPy.
+    
+    Mirrors EmotionMapper.map_features operation for operation, so every row
+    is bit-for-bit identical to the scalar result for the same message.
+    """
+    
+    def __init__(self, emotion_mapper: Optional[EmotionMapper] = None):
+        """
+        Initialize the vectorized mapper from a scalar mapper's configuration.
+        
+        Args:
+            emotion_mapper: The scalar mapper whose emotions and triggers are used
+        """
+        self.emotion_mapper = emotion_mapper or EmotionMapper()
+        # Arrays below are built for this lexicon; a mapper with a newer one needs a new instance
+        self.lexicon = self.emotion_mapper.lexicon
+        self.emotions: List[str] = list(self.lexicon.emotions)
+        triggers = self.lexicon.triggers
+        
+        # Emotions without triggers keep their base value
+        self.triggered = np.array([emotion in triggers for emotion in self.emotions])
+        self.sentiment_targets = np.array(
+            [triggers[emotion]["sentiment"] if emotion in triggers else 0.0 for emotion in self.emotions]
+        )
+        self.fear_index = self.emotions.index("Fear")
+        self.joy_index = self.emotions.index("Joy")
+        
+        # Column of each keyword matcher label in the emotion matrix
+        self._hit_columns = [
+            self.emotions.index(label) for label in self.lexicon.matcher.labels
+        ]
+    
+    def featurize(
+        self, 
+        semantic_results: Sequence[SemanticAnalysisResult]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract the arrays used by score from semantic analysis results.
+        
+        Args:
+            semantic_results: Results from semantic analysis, one per message
+            
+        Returns:
+            A tuple of (sentiments, keyword hit matrix, threat mask)
+        """
+        count = len(semantic_results)
+        sentiments = np.fromiter((r.sentiment for r in semantic_results), dtype=np.float64, count=count)
+        keyword_hits = np.zeros((count, len(self.emotions)), dtype=np.int64)
+        threats = np.zeros(count, dtype=bool)
+        matcher = self.lexicon.matcher
+        for row, result in enumerate(semantic_results):
+            keyword_hits[row, self._hit_columns] = matcher.hit_vector(result.full_text)
+            threats[row] = any(action in result.actions for action in THREAT_ACTIONS)
+        return sentiments, keyword_hits, threats
+    
+    def score(
+        self, 
+        sentiments: np.ndarray, 
+        keyword_hits: np.ndarray, 
+        relationship_values: np.ndarray, 
+        threats: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute normalized emotion values for a batch of messages.
+        
+        Args:
+            sentiments: Sentiment polarity per message, shape (N,)
+            keyword_hits: Distinct keyword hits per message and emotion, shape (N, E)
+            relationship_values: Relationship value per message, shape (N,)
+            threats: Whether each message contains a threatening action, shape (N,)
+            
+        Returns:
+            A float64 array of shape (N, E) with columns ordered like self.emotions
+        """
+        sentiments = np.asarray(sentiments, dtype=np.float64)
+        relationship_values = np.asarray(relationship_values, dtype=np.float64)
+        threats = np.asarray(threats, dtype=bool)
+        
+        # Sentiment and keyword influence
+        sentiment_factor = np.maximum(0.0, 1 - np.abs(sentiments[:, None] - self.sentiment_targets))
+        keyword_factor = 0.2 * np.asarray(keyword_hits)
+        influence = (sentiment_factor * 0.6) + (keyword_factor * 0.4)
+        values = np.where(self.triggered, 0.1 + influence, 0.1)
+        
+        # Context adjustments for threatening actions
+        values[:, self.fear_index] += np.where(threats & (relationship_values < 0), 0.5, 0.0)
+        values[:, self.joy_index] += np.where(threats & (relationship_values > 0.5), 0.3, 0.0)
+        
+        # Normalize, summing columns left to right like the scalar path
+        total = values[:, 0].copy()
+        for column in range(1, values.shape[1]):
+            total += values[:, column]
+        values /= total[:, None]
+        return values
+    
+    def map_batch(
+        self, 
+        semantic_results: Sequence[SemanticAnalysisResult], 
+        contexts: Sequence[ContextResult]
+    ) -> np.ndarray:
+        """
+        Map a batch of semantic results and contexts to an emotion matrix.
+        
+        Args:
+            semantic_results: Results from semantic analysis, one per message
+            contexts: Context information, one per message
+            
+        Returns:
+            A float64 array of shape (N, E) with columns ordered like self.emotions
+        """
+        sentiments, keyword_hits, threats = self.featurize(semantic_results)
+        relationship_values = np.fromiter(
+            (context.relationship_value for context in contexts), 
+            dtype=np.float64, 
+            count=len(contexts)
+        )
+        return self.score(sentiments, keyword_hits, relationship_values, threats)
+    
+    def distribution(self, matrix: np.ndarray, row: int) -> EmotionDistribution:
+        """Build the EmotionDistribution for one row of an emotion matrix."""
+        return EmotionDistribution(values=dict(zip(self.emotions, matrix[row].tolist())))
\ No newline at end of file
@@ -0,0 +1,410 @@
+"""Memory-mapped columnar store of semantic features for offline re-scoring."""
+
+import array
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from emotion_calculator.core.emotions import THREAT_ACTIONS
+from emotion_calculator.core.keywords import KeywordMatcher
+from emotion_calculator.data.models import ContextResult, EmotionResultBatch, SemanticAnalysisResult
+
+FORMAT_VERSION = 1
+
+T = TypeVar("T")
+
+# Context flags read by ContextJudge.determine_context, stored as boolean columns
+CONTEXT_FLAGS = ("formal_setting", "previous_trust_breach")
+
+
+def keyword_fingerprint(matcher: KeywordMatcher) -> str:
+    """Return a hash identifying a matcher's labels and keywords."""
+    payload = json.dumps([matcher.labels, sorted(matcher.index.items())], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _RaggedColumn:
+    """Builds a list-of-strings column as vocabulary ids plus row offsets."""
+    
+    def __init__(self, vocabulary: Dict[str, int]):
+        self.vocabulary = vocabulary
+        self.ids = array.array("i")
+        self.offsets = array.array("q", [0])
+    
+    def append(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.ids.append(self.vocabulary.setdefault(value, len(self.vocabulary)))
+        self.offsets.append(len(self.ids))
+
+
+class _RowSequence(Sequence[T]):
+    """Read-only sequence computing each row on access, so a whole column is never materialized."""
+    
+    def __init__(self, length: int, get_row: Callable[[int], T]):
+        self._length = length
+        self._get_row = get_row
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, row: Any) -> Any:
+        if isinstance(row, slice):
+            return [self._get_row(index) for index in range(*row.indices(self._length))]
+        if row < 0:
+            row += self._length
+        if not 0 <= row < self._length:
+            raise IndexError("row index out of range")
+        return self._get_row(row)
+
+
+class FeatureStoreWriter:
+    """
+    Writes semantic analyses to a feature store directory, one row per message.
+    
+    Numeric columns are kept in compact arrays while rows are added and the
+    texts are streamed to disk, so memory grows by a few bytes per row rather
+    than by the analyses themselves. Use as a context manager or call close;
+    the metadata that makes the store openable is written last, and not at
+    all if the context manager exits with an exception.
+    """
+    
+    def __init__(self, path: str, matcher: KeywordMatcher, store_text: bool = True):
+        """
+        Create the store directory.
+        
+        Args:
+            path: Directory to write; created if missing
+            matcher: Keyword matcher whose hit counts are stored
+            store_text: Also store the texts, so keyword hits can be recomputed
+                after trigger keywords change
+        """
+        self._created = not os.path.isdir(path)
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.matcher = matcher
+        self.store_text = store_text
+        self._sentiments = array.array("d")
+        self._subjectivities = array.array("d")
+        self._keyword_hits = array.array("i")
+        self._vocabulary: Dict[str, int] = {}
+        self._actions = _RaggedColumn(self._vocabulary)
+        self._keywords = _RaggedColumn(self._vocabulary)
+        self._relationships: Dict[Optional[str], int] = {}
+        self._relationship_ids = array.array("i")
+        self._flags = {flag: array.array("b") for flag in CONTEXT_FLAGS}
+        self._text_offsets = array.array("q", [0])
+        self._text_file = open(os.path.join(path, "text.bin"), "wb") if store_text else None
+        self._text_size = 0
+    
+    def add(
+        self, 
+        semantic: SemanticAnalysisResult, 
+        relationship: Optional[str] = None, 
+        additional_context: Optional[Dict] = None
+    ) -> None:
+        """
+        Add one analyzed message.
+        
+        Args:
+            semantic: The message's semantic analysis
+            relationship: Relationship to the speaker
+            additional_context: Additional context; only the flags ContextJudge reads are kept
+        """
+        self._sentiments.append(semantic.sentiment)
+        self._subjectivities.append(semantic.subjectivity)
+        self._keyword_hits.extend(self.matcher.hit_vector(semantic.full_text))
+        self._actions.append(semantic.actions)
+        self._keywords.append(semantic.keywords)
+        self._relationship_ids.append(self._relationships.setdefault(relationship, len(self._relationships)))
+        for flag, column in self._flags.items():
+            column.append(bool(additional_context) and flag in additional_context)
+        if self._text_file is not None:
+            encoded = semantic.full_text.encode("utf-8")
+            self._text_file.write(encoded)
+            self._text_size += len(encoded)
+            self._text_offsets.append(self._text_size)
+    
+    def close(self) -> None:
+        """Write the columns and metadata."""
+        if self._text_file is not None:
+            self._text_file.close()
+        count = len(self._sentiments)
+        columns = {
+            "sentiment": np.frombuffer(self._sentiments, dtype=np.float64),
+            "subjectivity": np.frombuffer(self._subjectivities, dtype=np.float64),
+            "keyword_hits": np.frombuffer(self._keyword_hits, dtype=np.int32).reshape(count, len(self.matcher.labels)),
+            "action_ids": np.frombuffer(self._actions.ids, dtype=np.int32),
+            "action_offsets": np.frombuffer(self._actions.offsets, dtype=np.int64),
+            "keyword_ids": np.frombuffer(self._keywords.ids, dtype=np.int32),
+            "keyword_offsets": np.frombuffer(self._keywords.offsets, dtype=np.int64),
+            "relationship_ids": np.frombuffer(self._relationship_ids, dtype=np.int32),
+        }
+        for flag, column in self._flags.items():
+            columns[flag] = np.frombuffer(column, dtype=np.int8).astype(bool)
+        if self.store_text:
+            columns["text_offsets"] = np.frombuffer(self._text_offsets, dtype=np.int64)
+        for name, column in columns.items():
+            np.save(os.path.join(self.path, f"{name}.npy"), column)
+        
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "count": count,
+            "hit_labels": self.matcher.labels,
+            "keyword_fingerprint": keyword_fingerprint(self.matcher),
+            "vocabulary": sorted(self._vocabulary, key=self._vocabulary.get),
+            "relationships": sorted(self._relationships, key=self._relationships.get),
+            "has_text": self.store_text,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    
+    def abort(self) -> None:
+        """Stop writing without the metadata and remove the partial store."""
+        if self._text_file is not None:
+            self._text_file.close()
+        # meta.json of an earlier store in the same directory goes too, as its text.bin was overwritten
+        for name in ("meta.json", "text.bin"):
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+        if self._created:
+            try:
+                os.rmdir(self.path)
+            except OSError:
+                pass
+    
+    def __enter__(self) -> "FeatureStoreWriter":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class FeatureStore:
+    """
+    Read-only view of a feature store directory.
+    
+    Columns are memory-mapped, so opening a store is instant and only the
+    pages a re-score touches are read.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a feature store.
+        
+        Args:
+            path: Directory written by FeatureStoreWriter
+        """
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported feature store version {meta.get('format_version')!r} in {path}")
+        self.path = path
+        self.meta = meta
+        self.hit_labels: List[str] = meta["hit_labels"]
+        self.vocabulary: List[str] = meta["vocabulary"]
+        self.relationships: List[Optional[str]] = meta["relationships"]
+        self.sentiments = self._load("sentiment")
+        self.subjectivities = self._load("subjectivity")
+        self.keyword_hits = self._load("keyword_hits")
+        self.relationship_ids = self._load("relationship_ids")
+        self.flags = {flag: self._load(flag) for flag in CONTEXT_FLAGS}
+        self._action_ids = self._load("action_ids")
+        self._action_offsets = self._load("action_offsets")
+        self._keyword_ids = self._load("keyword_ids")
+        self._keyword_offsets = self._load("keyword_offsets")
+        self._text = None
+        if meta["has_text"]:
+            self._text_offsets = self._load("text_offsets")
+            text_path = os.path.join(path, "text.bin")
+            # np.memmap cannot map an empty file
+            self._text = np.memmap(text_path, dtype=np.uint8, mode="r") if os.path.getsize(text_path) else b""
+    
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+    
+    def __len__(self) -> int:
+        return self.meta["count"]
+    
+    @property
+    def has_text(self) -> bool:
+        """Whether the texts are stored."""
+        return self._text is not None
+    
+    def text(self, row: int) -> str:
+        """Return a row's text, or "" if texts are not stored."""
+        if self._text is None:
+            return ""
+        start, end = int(self._text_offsets[row]), int(self._text_offsets[row + 1])
+        return bytes(self._text[start:end]).decode("utf-8")
+    
+    def actions(self, row: int) -> List[str]:
+        """Return a row's lemmatized actions."""
+        return self._strings(self._action_ids, self._action_offsets, row)
+    
+    def keywords(self, row: int) -> List[str]:
+        """Return a row's lemmatized keywords."""
+        return self._strings(self._keyword_ids, self._keyword_offsets, row)
+    
+    def _strings(self, ids: np.ndarray, offsets: np.ndarray, row: int) -> List[str]:
+        return [self.vocabulary[i] for i in ids[offsets[row]:offsets[row + 1]].tolist()]
+    
+    def relationship(self, row: int) -> Optional[str]:
+        """Return a row's relationship."""
+        return self.relationships[int(self.relationship_ids[row])]
+    
+    def additional_context(self, row: int) -> Optional[Dict[str, bool]]:
+        """Return a row's stored context flags as an additional_context dict."""
+        context = {flag: True for flag, column in self.flags.items() if column[row]}
+        return context or None
+    
+    def threat_mask(self) -> np.ndarray:
+        """Return whether each row's actions include a threat action."""
+        threat_ids = [index for index, word in enumerate(self.vocabulary) if word in THREAT_ACTIONS]
+        hits = np.isin(self._action_ids, threat_ids).astype(np.int64)
+        # Count threat actions per row from the cumulative sum at the row offsets
+        cumulative = np.concatenate(([0], np.cumsum(hits)))
+        return cumulative[self._action_offsets[1:]] > cumulative[self._action_offsets[:-1]]
+    
+    def hits_for(self, matcher: KeywordMatcher) -> Tuple[List[str], np.ndarray]:
+        """
+        Return keyword hit counts for a matcher, recomputing them only if its keywords changed.
+        
+        Args:
+            matcher: The matcher of the lexicon used for re-scoring
+        
+        Returns:
+            The hit labels and an (N, len(labels)) hit count array
+        
+        Raises:
+            ValueError: If the keywords changed and the texts were not stored
+        """
+        if keyword_fingerprint(matcher) == self.meta["keyword_fingerprint"]:
+            return self.hit_labels, self.keyword_hits
+        if not self.has_text:
+            raise ValueError("Trigger keywords changed and the feature store has no texts to rematch")
+        hits = np.empty((len(self), len(matcher.labels)), dtype=np.int32)
+        for row in range(len(self)):
+            hits[row] = matcher.hit_vector(self.text(row))
+        return list(matcher.labels), hits
+    
+    def context_ids(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Group rows by relationship and context flags, the only inputs of their context.
+        
+        Returns:
+            The first row of each group and each row's group index
+        """
+        keys = self.relationship_ids.astype(np.int64)
+        for column in self.flags.values():
+            keys = keys * 2 + column
+        _, first_rows, group_ids = np.unique(keys, return_index=True, return_inverse=True)
+        return first_rows, group_ids.reshape(-1)
+
+
+def build_feature_store(
+    calculator: Any, 
+    records: Iterable[Dict[str, Any]], 
+    path: str, 
+    chunk_size: int = 256, 
+    store_text: bool = True
+) -> int:
+    """
+    Run semantic analysis over records once and save the features.
+    
+    Args:
+        calculator: EmotionCalculator whose semantic analyzer and keyword matcher are used
+        records: Records with "text", "relationship" and "context" keys, as from read_records
+        path: Feature store directory to write
+        chunk_size: Number of texts analyzed per batch
+        store_text: Also store the texts (see FeatureStoreWriter)
+    
+    Returns:
+        The number of rows written
+    """
+    from emotion_calculator.utils.streaming import chunked
+    
+    count = 0
+    with FeatureStoreWriter(path, calculator.emotion_mapper.keyword_matcher, store_text=store_text) as writer:
+        for chunk in chunked(records, chunk_size):
+            analyses = calculator.semantic_analyzer.analyze_batch(
+                [record["text"] for record in chunk],
+                batch_size=chunk_size
+            )
+            for record, semantic in zip(chunk, analyses):
+                writer.add(semantic, record.get("relationship"), record.get("context"))
+            count += len(chunk)
+    return count
+
+
+def rescore(calculator: Any, store: FeatureStore, vectorized: bool = False) -> EmotionResultBatch:
+    """
+    Map stored features to emotions with a calculator's current configuration.
+    
+    No NLP runs: contexts come from the calculator's ContextJudge and emotions
+    from its EmotionMapper, so changed triggers, relationship values and
+    mapping rules are all picked up. Keyword hits are only recomputed (from the
+    stored texts) when the trigger keywords changed.
+    
+    Args:
+        calculator: EmotionCalculator holding the configuration to evaluate
+        store: Features saved by build_feature_store
+        vectorized: Use the NumPy batch mapper instead of map_features per row;
+            identical results, much faster on large stores
+    
+    Returns:
+        An EmotionResultBatch with one row per stored message. Its texts and
+        contexts are read from the store as rows are accessed.
+    """
+    mapper = calculator.emotion_mapper
+    labels, hits = store.hits_for(mapper.keyword_matcher)
+    # A context is judged once per distinct relationship and flags, not once per row
+    first_rows, group_ids = store.context_ids()
+    group_contexts: List[ContextResult] = [
+        calculator.context_judge.determine_context(
+            relationship=store.relationship(row),
+            additional_context=store.additional_context(row)
+        )
+        for row in first_rows.tolist()
+    ]
+    contexts = _RowSequence(len(store), lambda row: group_contexts[group_ids[row]])
+    texts = _RowSequence(len(store), store.text)
+    
+    if vectorized:
+        from emotion_calculator.core.vectorized import VectorizedEmotionMapper
+        
+        batch_mapper = VectorizedEmotionMapper(mapper)
+        emotions = batch_mapper.emotions
+        keyword_hits = np.zeros((len(store), len(emotions)), dtype=np.int64)
+        keyword_hits[:, [emotions.index(label) for label in labels]] = hits
+        relationship_values = np.array(
+            [context.relationship_value for context in group_contexts], 
+            dtype=np.float64
+        )[group_ids]
+        scores = batch_mapper.score(store.sentiments, keyword_hits, relationship_values, store.threat_mask())
+    else:
+        emotions = list(mapper.emotions)
+        scores = np.empty((len(store), len(emotions)), dtype=np.float64)
+        for row, group in enumerate(group_ids.tolist()):
+            distribution = mapper.map_features(
+                float(store.sentiments[row]),
+                dict(zip(labels, hits[row].tolist())),
+                store.actions(row),
+                group_contexts[group]
+            )
+            scores[row] = [distribution.values[emotion] for emotion in emotions]
+    
+    return EmotionResultBatch(
+        texts=texts,
+        contexts=contexts,
+        scores=scores,
+        emotions=emotions,
+        sentiments=store.sentiments
+    )
@@ -0,0 +1,217 @@
+"""Append-only SQLite storage for user feedback."""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+RATINGS = (1, 2, 3, 4, 5)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    rating INTEGER,
+    has_comment INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS feedback_session_time ON feedback (session_id, created_at);
+CREATE INDEX IF NOT EXISTS feedback_time ON feedback (created_at);
+CREATE TABLE IF NOT EXISTS feedback_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    rating_sum INTEGER NOT NULL,
+    comments INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO feedback_totals (id, entries, rating_sum, comments) VALUES (1, 0, 0, 0);
+CREATE TABLE IF NOT EXISTS feedback_ratings (
+    rating INTEGER PRIMARY KEY,
+    entries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    applied_at TEXT NOT NULL
+);
+"""
+
+
+def _parse_rating(value: Any) -> Optional[int]:
+    """Return the rating as an int, or None if it is missing or not a number."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class FeedbackStore:
+    """
+    Append-only feedback log with incrementally maintained aggregates.
+    
+    Every submission becomes its own row, indexed by session and time, so
+    concurrent submissions never overwrite each other. Entry count, rating sum,
+    comment count and the rating histogram are updated in the same transaction
+    as each insert, so building a report never scans the whole log.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) the feedback database.
+        
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+    
+    def add(self, entry: Dict[str, Any]) -> int:
+        """
+        Append a feedback entry.
+        
+        Args:
+            entry: The feedback as submitted (sessionId, rating, feedback, timestamp, ...)
+            
+        Returns:
+            The id of the stored entry
+        """
+        with self._lock, self._conn:
+            return self._insert(entry)
+    
+    def _insert(self, entry: Dict[str, Any]) -> int:
+        """Insert an entry and update the aggregates; the caller holds the lock and transaction."""
+        session_id = str(entry.get("sessionId") or "unknown")
+        created_at = str(entry.get("timestamp") or datetime.now().isoformat())
+        rating = _parse_rating(entry.get("rating"))
+        has_comment = 1 if entry.get("feedback") else 0
+        
+        cursor = self._conn.execute(
+            "INSERT INTO feedback (session_id, created_at, rating, has_comment, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (session_id, created_at, rating, has_comment, json.dumps(entry))
+        )
+        self._conn.execute(
+            "UPDATE feedback_totals SET entries = entries + 1, "
+            "rating_sum = rating_sum + ?, comments = comments + ? WHERE id = 1",
+            (rating or 0, has_comment)
+        )
+        if rating is not None:
+            self._conn.execute(
+                "INSERT INTO feedback_ratings (rating, entries) VALUES (?, 1) "
+                "ON CONFLICT (rating) DO UPDATE SET entries = entries + 1",
+                (rating,)
+            )
+        return cursor.lastrowid
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the report aggregates without scanning the feedback log.
+        
+        Returns:
+            A dict with total_entries, avg_rating, rating_sum, comment_count and
+            rating_histogram (rating -> number of entries)
+        """
+        with self._lock:
+            totals = self._conn.execute(
+                "SELECT entries, rating_sum, comments FROM feedback_totals WHERE id = 1"
+            ).fetchone()
+            ratings = self._conn.execute("SELECT rating, entries FROM feedback_ratings").fetchall()
+        
+        histogram = {rating: 0 for rating in RATINGS}
+        histogram.update({row["rating"]: row["entries"] for row in ratings})
+        entries = totals["entries"]
+        return {
+            "total_entries": entries,
+            "rating_sum": totals["rating_sum"],
+            "avg_rating": totals["rating_sum"] / entries if entries > 0 else 0,
+            "comment_count": totals["comments"],
+            "rating_histogram": histogram,
+        }
+    
+    def count(self, session_id: Optional[str] = None) -> int:
+        """Return the number of entries, optionally for one session."""
+        with self._lock:
+            if session_id is None:
+                row = self._conn.execute("SELECT entries FROM feedback_totals WHERE id = 1").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM feedback WHERE session_id = ?", (session_id,)
+                ).fetchone()
+        return row[0]
+    
+    def page(
+        self, 
+        page: int = 1, 
+        per_page: int = 50, 
+        session_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return one page of entries, newest first.
+        
+        Args:
+            page: 1-based page number
+            per_page: Entries per page
+            session_id: Only return entries from this session
+            
+        Returns:
+            The stored feedback entries for the page
+        """
+        offset = (max(page, 1) - 1) * per_page
+        query = "SELECT payload FROM feedback"
+        params: List[Any] = []
+        if session_id is not None:
+            query += " WHERE session_id = ?"
+            params.append(session_id)
+        query += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+        params.extend([per_page, offset])
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+    
+    def migrate_json_dir(self, directory: str) -> int:
+        """
+        Import legacy feedback_<session>_<timestamp>.json files, once per directory.
+        
+        Args:
+            directory: Directory holding the legacy JSON files
+            
+        Returns:
+            The number of entries imported (0 if the directory was already migrated)
+        """
+        name = f"json_dir:{os.path.abspath(directory)}"
+        with self._lock, self._conn:
+            if self._conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone():
+                return 0
+            
+            imported = 0
+            if os.path.isdir(directory):
+                for filename in sorted(os.listdir(directory)):
+                    if not (filename.startswith("feedback_") and filename.endswith(".json")):
+                        continue
+                    try:
+                        with open(os.path.join(directory, filename), "r") as f:
+                            entry = json.load(f)
+                    except (OSError, ValueError):
+                        continue
+                    if isinstance(entry, dict):
+                        self._insert(entry)
+                        imported += 1
+            
+            self._conn.execute(
+                "INSERT INTO migrations (name, applied_at) VALUES (?, ?)",
+                (name, datetime.now().isoformat())
+            )
+        return imported
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
\ No newline at end of file
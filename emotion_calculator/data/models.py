@@ -1,7 +1,7 @@
 """Data models for the emotion calculator."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Sequence, Tuple
 
 
 @dataclass
@@ -15,9 +15,9 @@ class SemanticAnalysisResult:
     full_text: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class ContextResult:
-    """Results from context judgment."""
+    """Results from context judgment; immutable so instances can be shared."""
     relationship_type: str = "neutral"
     relationship_value: float = 0.0
     trust_level: float = 0.5
@@ -28,11 +28,11 @@ class ContextResult:
 class EmotionDistribution:
     """Distribution of emotions with intensity values."""
     values: Dict[str, float]
-
+    
     def get_dominant_emotion(self) -> str:
         """Get the emotion with the highest intensity."""
         return max(self.values, key=self.values.get)
-
+    
     def as_percentages(self) -> Dict[str, int]:
         """Convert emotion values to percentages."""
         return {emotion: round(score * 100) for emotion, score in self.values.items()}
@@ -44,4 +44,181 @@ class EmotionResult:
     input_text: str
     context: ContextResult
     emotions: Dict[str, int] = field(default_factory=dict)
-    dominant_emotion: str = "" 
\ No newline at end of file
+    dominant_emotion: str = ""
+    sentiment: float = 0.0 
+    # True when the action rules were skipped for a text they could apply to
+    degraded: bool = False
+
+
+@dataclass
+class IncrementalResult:
+    """Result of re-analyzing edited text, with the work the sentence cache saved."""
+    result: EmotionResult
+    version: int
+    analyzed: int = 0
+    reused: int = 0
+
+
+@dataclass(frozen=True)
+class DocumentChunk:
+    """A sentence or turn of a document, analyzed on its own."""
+    index: int
+    start: int
+    end: int
+    text: str
+
+
+@dataclass
+class DocumentResult:
+    """Emotion timeline of a document and its length-weighted aggregate distribution."""
+    chunks: List[DocumentChunk]
+    results: List[EmotionResult]
+    context: ContextResult
+    emotions: Dict[str, int] = field(default_factory=dict)
+    dominant_emotion: str = ""
+    sentiment: float = 0.0
+    
+    def timeline(self, emotion: Optional[str] = None) -> List[Tuple[int, Any]]:
+        """
+        Return (start offset, value) per chunk, in document order.
+        
+        Args:
+            emotion: Emotion whose percentage is returned; the dominant emotion
+                of each chunk when None
+        """
+        if emotion is None:
+            return [(chunk.start, result.dominant_emotion) for chunk, result in zip(self.chunks, self.results)]
+        return [(chunk.start, result.emotions.get(emotion, 0)) for chunk, result in zip(self.chunks, self.results)]
+
+
+class EmotionResultView:
+    """Zero-copy, slotted view of one row of an EmotionResultBatch."""
+    
+    __slots__ = ("_batch", "_index")
+    
+    def __init__(self, batch: "EmotionResultBatch", index: int):
+        self._batch = batch
+        self._index = index
+    
+    @property
+    def input_text(self) -> str:
+        """The input text for this row."""
+        return self._batch.texts[self._index]
+    
+    @property
+    def context(self) -> ContextResult:
+        """The context used for this row."""
+        return self._batch.contexts[self._index]
+    
+    @property
+    def sentiment(self) -> float:
+        """The sentiment polarity of the input text."""
+        return float(self._batch.sentiments[self._index])
+    
+    @property
+    def scores(self) -> Any:
+        """The row's emotion values as a NumPy view into the batch (no copy)."""
+        return self._batch.scores[self._index]
+    
+    @property
+    def emotions(self) -> Dict[str, int]:
+        """Emotion values as percentages, as in EmotionResult.emotions."""
+        return self.distribution().as_percentages()
+    
+    @property
+    def dominant_emotion(self) -> str:
+        """The emotion with the highest intensity."""
+        return self._batch.emotion_names[int(self.scores.argmax())]
+    
+    def distribution(self) -> EmotionDistribution:
+        """Build an EmotionDistribution for this row."""
+        return EmotionDistribution(values=dict(zip(self._batch.emotion_names, self.scores.tolist())))
+    
+    def to_result(self) -> EmotionResult:
+        """Materialize this row as a regular EmotionResult."""
+        distribution = self.distribution()
+        return EmotionResult(
+            input_text=self.input_text,
+            context=self.context,
+            emotions=distribution.as_percentages(),
+            dominant_emotion=distribution.get_dominant_emotion(),
+            sentiment=self.sentiment
+        )
+    
+    def __repr__(self) -> str:
+        return f"EmotionResultView(index={self._index}, dominant_emotion={self.dominant_emotion!r})"
+
+
+class EmotionResultBatch:
+    """
+    Columnar store for many emotion results.
+    
+    Emotion values live in a single (N, len(emotions)) float64 array whose columns
+    follow a fixed emotion order, instead of one dict of string-keyed floats per
+    result. Rows are exposed as EmotionResultView objects and the whole block as
+    a NumPy array, both without copying.
+    """
+    
+    __slots__ = ("texts", "contexts", "scores", "sentiments", "emotion_names")
+    
+    def __init__(
+        self, 
+        texts: Sequence[str], 
+        contexts: Sequence[ContextResult], 
+        scores: Any, 
+        emotions: Optional[Sequence[str]] = None, 
+        sentiments: Optional[Sequence[float]] = None
+    ):
+        """
+        Initialize the batch.
+        
+        Args:
+            texts: Input text per row; sequences are kept as given rather than
+                copied, so rows can be read lazily
+            contexts: Context per row, kept as given like texts
+            scores: Array-like of shape (N, len(emotions)) with emotion values per row
+            emotions: Column order of scores; defaults to EMOTIONS
+            sentiments: Sentiment polarity per row; defaults to 0.0
+        """
+        import numpy as np  # Imported lazily to keep package import fast
+        from emotion_calculator.config.emotion_config import EMOTIONS
+        
+        self.emotion_names: Tuple[str, ...] = tuple(emotions if emotions is not None else EMOTIONS)
+        self.scores = np.asarray(scores, dtype=np.float64).reshape(-1, len(self.emotion_names))
+        self.texts = texts if isinstance(texts, Sequence) else list(texts)
+        self.contexts = contexts if isinstance(contexts, Sequence) else list(contexts)
+        if sentiments is None:
+            self.sentiments = np.zeros(len(self.texts), dtype=np.float64)
+        else:
+            self.sentiments = np.asarray(sentiments, dtype=np.float64)
+        if not len(self.texts) == len(self.contexts) == len(self.scores) == len(self.sentiments):
+            raise ValueError("texts, contexts, scores and sentiments must have the same number of rows")
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __getitem__(self, index: int) -> EmotionResultView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EmotionResultBatch index out of range")
+        return EmotionResultView(self, index)
+    
+    def __iter__(self) -> Iterator[EmotionResultView]:
+        return (EmotionResultView(self, index) for index in range(len(self)))
+    
+    def to_numpy(self) -> Any:
+        """Return the (N, len(emotions)) emotion value array (a view, not a copy)."""
+        return self.scores
+    
+    def column(self, emotion: str) -> Any:
+        """Return one emotion's values for every row as a NumPy view."""
+        return self.scores[:, self.emotion_names.index(emotion)]
+    
+    def dominant_emotions(self) -> List[str]:
+        """Return the dominant emotion of every row."""
+        return [self.emotion_names[index] for index in self.scores.argmax(axis=1).tolist()]
+    
+    def to_results(self) -> List[EmotionResult]:
+        """Materialize every row as a regular EmotionResult."""
+        return [view.to_result() for view in self]
\ No newline at end of file
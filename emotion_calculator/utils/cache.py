@@ -0,0 +1,241 @@
+"""Result caching for the emotion calculator."""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """Interface for key-value stores used by ResultCache."""
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under key, or None if missing or expired."""
+    
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting old entries if needed."""
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of entries."""
+
+
+class MemoryCache(CacheBackend):
+    """In-memory LRU cache with optional time-to-live."""
+    
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        """
+        Initialize the in-memory cache.
+        
+        Args:
+            max_size: Maximum number of entries kept before evicting the least recently used
+            ttl: Seconds an entry stays valid, or None to keep entries until evicted
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCache(CacheBackend):
+    """On-disk LRU cache backed by SQLite, so warm entries survive restarts."""
+    
+    def __init__(self, path: str, max_size: int = 100000, ttl: Optional[float] = None):
+        """
+        Initialize the SQLite cache.
+        
+        Args:
+            path: Path of the SQLite database file
+            max_size: Maximum number of entries kept before evicting the least recently used
+            ttl: Seconds an entry stays valid, or None to keep entries until evicted
+        """
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if self.ttl is not None and now - stored_at > self.ttl:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return pickle.loads(value)
+    
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, blob, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,)
+            )
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class ResultCache:
+    """
+    Content-addressed cache for semantic analysis and final emotion results.
+    
+    Semantic results are keyed on the text with runs of whitespace collapsed, so
+    texts differing only in spacing share one analysis, and on the analyzer's
+    model, profile and sentiment backend, so analyzers sharing a backend never
+    get each other's analyses. Case is kept, since spaCy's tagger and entity
+    recognizer are case-sensitive. Final results are
+    keyed on the exact text, relationship and additional context, and on the
+    scoring configuration, so results scored with an older lexicon are not
+    returned after it changes.
+    """
+    
+    def __init__(
+        self, 
+        backend: Optional[CacheBackend] = None, 
+        max_size: int = 10000, 
+        ttl: Optional[float] = None
+    ):
+        """
+        Initialize the result cache.
+        
+        Args:
+            backend: Storage backend; an in-memory LRU cache is used if omitted
+            max_size: Maximum entries for the default in-memory backend
+            ttl: Time-to-live in seconds for the default in-memory backend
+        """
+        self.backend = backend if backend is not None else MemoryCache(max_size=max_size, ttl=ttl)
+        self.hits = {"semantic": 0, "result": 0}
+        self.misses = {"semantic": 0, "result": 0}
+    
+    @staticmethod
+    def semantic_key(text: str, scope: str = "") -> str:
+        """Build the cache key for the semantic analysis of text by the analyzer identified by scope."""
+        payload = json.dumps([scope, " ".join(text.split())])
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"semantic:{digest}"
+    
+    @staticmethod
+    def result_key(
+        text: str, 
+        relationship: Optional[str] = None, 
+        additional_context: Optional[Dict] = None, 
+        config: Optional[str] = None
+    ) -> str:
+        """Build the cache key for a final emotion result; config identifies the scoring configuration."""
+        payload = json.dumps(
+            [text, relationship, additional_context, config], 
+            sort_keys=True, 
+            default=str
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"result:{digest}"
+    
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """
+        Look up a cached value and record the hit or miss.
+        
+        Args:
+            kind: Cache namespace ("semantic" or "result")
+            key: Key built by semantic_key or result_key
+        
+        Returns:
+            The cached value, or None on a miss
+        """
+        value = self.backend.get(key)
+        if value is None:
+            self.misses[kind] += 1
+        else:
+            self.hits[kind] += 1
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value under a key built by semantic_key or result_key."""
+        self.backend.set(key, value)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters for both namespaces."""
+        return {
+            "semantic_hits": self.hits["semantic"],
+            "semantic_misses": self.misses["semantic"],
+            "result_hits": self.hits["result"],
+            "result_misses": self.misses["result"],
+            "size": len(self.backend),
+        }
+    
+    def clear(self) -> None:
+        """Remove every cached entry and reset the counters."""
+        self.backend.clear()
+        self.hits = {"semantic": 0, "result": 0}
+        self.misses = {"semantic": 0, "result": 0}
\ No newline at end of file
@@ -0,0 +1,278 @@
+"""In-process metrics with Prometheus text exposition."""
+
+import bisect
+import math
+import threading
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from 50 microseconds to 10 seconds
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Buckets for counts such as batch sizes
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """Cumulative bucket counts, sum and count of observed values."""
+    
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters, histograms and gauges rendered in Prometheus text format.
+    
+    Components take an optional registry and skip all timing when it is None,
+    so instrumentation costs nothing unless metrics are enabled.
+    """
+    
+    def __init__(self, namespace: str = "emotion"):
+        """
+        Initialize an empty registry.
+        
+        Args:
+            namespace: Prefix of every metric name
+        """
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}  # name -> (type, help)
+        self._counters: Dict[str, Dict[_Labels, float]] = {}
+        self._histograms: Dict[str, Dict[_Labels, _Histogram]] = {}
+        self._histogram_buckets: Dict[str, Sequence[float]] = {}
+        self._callbacks: Dict[str, List[Tuple[_Labels, Callable[[], float]]]] = {}
+        
+        self.describe_histogram("stage_seconds", "Time spent per pipeline stage call")
+    
+    def describe_counter(self, name: str, help_text: str) -> None:
+        """Register a counter's help text."""
+        self._help[name] = ("counter", help_text)
+    
+    def describe_histogram(
+        self, 
+        name: str, 
+        help_text: str, 
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        """Register a histogram's help text and buckets."""
+        self._help[name] = ("histogram", help_text)
+        self._histogram_buckets[name] = tuple(sorted(buckets))
+    
+    def gauge(
+        self, 
+        name: str, 
+        callback: Callable[[], float], 
+        help_text: str = "", 
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Register a gauge whose value is read from callback when metrics are rendered.
+        
+        Args:
+            name: Metric name without the namespace
+            callback: Function returning the current value
+            help_text: Description of the metric
+            labels: Optional constant labels
+        """
+        self._register_callback(name, callback, "gauge", help_text, labels)
+    
+    def counter_func(
+        self, 
+        name: str, 
+        callback: Callable[[], float], 
+        help_text: str = "", 
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Register a counter whose value is read from callback when metrics are rendered.
+        
+        Used for counts a component already keeps, such as cache hits.
+        
+        Args:
+            name: Metric name without the namespace or "_total" suffix
+            callback: Function returning the current, never decreasing, value
+            help_text: Description of the metric
+            labels: Optional constant labels
+        """
+        self._register_callback(name, callback, "counter", help_text, labels)
+    
+    def _register_callback(
+        self, 
+        name: str, 
+        callback: Callable[[], float], 
+        kind: str, 
+        help_text: str, 
+        labels: Optional[Dict[str, str]]
+    ) -> None:
+        """Store a callback metric, keeping the help text of the first registration."""
+        with self._lock:
+            self._help.setdefault(name, (kind, help_text))
+            self._callbacks.setdefault(name, []).append((_label_key(labels), callback))
+    
+    def inc(self, name: str, amount: float = 1.0, labels: Optional[Dict[str, str]] = None) -> None:
+        """Add to a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+    
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Record one value in a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                buckets = self._histogram_buckets.get(name, LATENCY_BUCKETS)
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+    
+    def observe_stage(self, stage: str, seconds: float, mode: str = "single") -> None:
+        """
+        Record the duration of one pipeline stage call.
+        
+        Args:
+            stage: Stage name, e.g. "nlp", "sentiment", "mapping"
+            seconds: Duration of the call
+            mode: "single" for one message, "batch" for a whole batch
+        """
+        self.observe("stage_seconds", seconds, {"stage": stage, "mode": mode})
+    
+    def histogram_count(self, name: str, labels: Optional[Dict[str, str]] = None) -> int:
+        """Return the number of observations of a histogram series."""
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(_label_key(labels))
+            return histogram.count if histogram is not None else 0
+    
+    def counter_value(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """Return the current value of a counter series."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: (list(h.counts), h.sum, h.count, h.buckets) for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+            callbacks = {name: list(series) for name, series in self._callbacks.items()}
+        
+        for name, series in sorted(counters.items()):
+            full_name = self._header(lines, name, "counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{full_name}_total{_format_labels(key)} {_format_value(value)}")
+        
+        for name, series in sorted(histograms.items()):
+            full_name = self._header(lines, name, "histogram")
+            for key, (counts, total, count, buckets) in sorted(series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(key + (("le", _format_value(bound)),))
+                    lines.append(f"{full_name}_bucket{labels} {cumulative}")
+                lines.append(f"{full_name}_bucket{_format_labels(key + (('le', '+Inf'),))} {count}")
+                lines.append(f"{full_name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{full_name}_count{_format_labels(key)} {count}")
+        
+        for name, series in sorted(callbacks.items()):
+            kind = self._help[name][0]
+            full_name = self._header(lines, name, kind)
+            suffix = "_total" if kind == "counter" else ""
+            for key, callback in series:
+                try:
+                    value = float(callback())
+                except Exception:
+                    continue  # A failing callback must not break the whole scrape
+                lines.append(f"{full_name}{suffix}{_format_labels(key)} {_format_value(value)}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def _header(self, lines: List[str], name: str, kind: str) -> str:
+        """Append the HELP and TYPE lines of a metric and return its full name."""
+        full_name = f"{self.namespace}_{name}"
+        help_text = self._help.get(name, (kind, ""))[1]
+        if help_text:
+            lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        return full_name
+
+
+class StageTimer:
+    """
+    Time consecutive stages of one unit of work, such as a web request.
+    
+    Each mark records the time since the previous mark in a histogram labelled
+    with the stage name. With no registry every call is a no-op.
+    """
+    
+    __slots__ = ("metrics", "name", "labels", "_last")
+    
+    def __init__(self, metrics: Optional[MetricsRegistry], name: str, labels: Optional[Dict[str, str]] = None):
+        """
+        Start timing.
+        
+        Args:
+            metrics: Registry to record into, or None to disable timing
+            name: Histogram receiving the stage durations
+            labels: Labels added to every stage, e.g. the endpoint
+        """
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels or {}
+        self._last = perf_counter() if metrics is not None else 0.0
+    
+    def mark(self, stage: str) -> None:
+        """Record the time since the previous mark (or the start) as the given stage."""
+        if self.metrics is None:
+            return
+        now = perf_counter()
+        self.metrics.observe(self.name, now - self._last, dict(self.labels, stage=stage))
+        self._last = now
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> _Labels:
+    """Turn a label dict into a hashable, ordered key."""
+    if not labels:
+        return ()
+    return tuple((name, str(value)) for name, value in labels.items())
+
+
+def _format_labels(key: _Labels) -> str:
+    """Format labels as {name="value",...}, escaping quotes and backslashes."""
+    if not key:
+        return ""
+    escaped = (
+        f'{name}="' + value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for name, value in key
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
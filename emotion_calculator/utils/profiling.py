@@ -0,0 +1,299 @@
+"""Profiling of emotion calculator calls: cProfile stats, flame-graph stacks and per-stage allocations."""
+
+import cProfile
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Allocations made by the profiler itself are left out of the statistics
+_IGNORED_FILES = frozenset((tracemalloc.__file__, __file__))
+
+
+def frame_name(code: Any) -> str:
+    """Return the flame-graph label of a code object."""
+    return f"{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def short_path(filename: str) -> str:
+    """Strip the longest sys.path prefix from a file name."""
+    best = ""
+    for entry in sys.path:
+        if entry and filename.startswith(entry) and len(entry) > len(best):
+            best = entry
+    return filename[len(best):].lstrip(os.sep) if best else filename
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval and counts the collapsed stacks."""
+    
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        """
+        Initialize the sampler.
+        
+        Args:
+            thread_id: Thread to sample (default: the calling thread)
+            interval: Seconds between samples
+        """
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()  # code objects, outermost first -> samples
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Start sampling on a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def write(self, path: str) -> None:
+        """Write the counted stacks as collapsed "a;b;c count" lines, for flamegraph.pl or speedscope."""
+        names: Dict[Any, str] = {}
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                labels = []
+                for code in stack:
+                    label = names.get(code)
+                    if label is None:
+                        label = names[code] = frame_name(code)
+                    labels.append(label)
+                f.write(f"{';'.join(labels)} {count}\n")
+    
+    def _run(self) -> None:
+        # Only code objects are collected while sampling; labels are built once when writing
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.stacks[tuple(stack)] += 1
+
+
+class StageAllocations:
+    """Allocations attributed to one pipeline stage."""
+    
+    __slots__ = ("calls", "retained", "peak", "sizes", "blocks")
+    
+    def __init__(self):
+        self.calls = 0
+        self.retained = 0
+        self.peak = 0
+        self.sizes: Counter = Counter()  # "file:line" -> bytes retained
+        self.blocks: Counter = Counter()  # "file:line" -> blocks retained
+
+
+class _StageRecorder:
+    """
+    Stands in for a MetricsRegistry while profiling, forwarding calls to it.
+    
+    At each stage boundary reported by observe_stage, the memory allocated
+    since the previous boundary and still held is attributed to the stage that
+    just ended, then tracemalloc's traces are cleared, so each snapshot only
+    holds one stage's blocks. Only the profiled thread's boundaries are
+    recorded, but tracemalloc sees every thread, so concurrent work shows up in
+    the figures. Snapshots inflate the profiled thread's stage timings, so
+    those are not forwarded.
+    """
+    
+    def __init__(self, inner: Any, profile: cProfile.Profile):
+        self.stages: Dict[str, StageAllocations] = {}
+        self._inner = inner
+        self._profile = profile
+        self._thread_id = threading.get_ident()
+        tracemalloc.clear_traces()
+    
+    def observe_stage(self, stage: str, seconds: float, mode: str = "single") -> None:
+        if threading.get_ident() != self._thread_id:
+            if self._inner is not None:
+                self._inner.observe_stage(stage, seconds, mode)
+            return
+        # Keep the snapshot work out of the cProfile stats
+        self._profile.disable()
+        try:
+            retained, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageAllocations()
+            stats.calls += 1
+            stats.retained += retained
+            stats.peak = max(stats.peak, peak)
+            for statistic in snapshot.statistics("lineno"):
+                frame = statistic.traceback[0]
+                if frame.filename not in _IGNORED_FILES:
+                    location = f"{short_path(frame.filename)}:{frame.lineno}"
+                    stats.sizes[location] += statistic.size
+                    stats.blocks[location] += statistic.count
+            # Also resets the traced and peak memory counters
+            tracemalloc.clear_traces()
+        finally:
+            self._profile.enable()
+    
+    def __getattr__(self, name: str) -> Any:
+        if self._inner is None:
+            return _ignore
+        return getattr(self._inner, name)
+
+
+def _ignore(*args: Any, **kwargs: Any) -> None:
+    """Stand-in for registry methods when the calculator has no registry."""
+
+
+def _format_size(size: float) -> str:
+    """Format a byte count with a binary unit."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class ProfileRun:
+    """Results of one profiled block; paths are filled in when the block ends."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.paths: List[str] = []
+        self.stages: Dict[str, StageAllocations] = {}
+
+
+class PipelineProfiler:
+    """
+    Profiles blocks of emotion calculator calls and writes the results to files.
+    
+    Each run writes <name>.prof (cProfile stats, for pstats or snakeviz),
+    <name>.folded (sampled collapsed stacks, for flamegraph.pl or speedscope)
+    and <name>.alloc.txt (tracemalloc top allocators per pipeline stage).
+    Allocation snapshots are taken at every stage boundary, which slows the
+    profiled block down; their cost is kept out of the cProfile stats.
+    """
+    
+    def __init__(
+        self, 
+        output_dir: str, 
+        interval: float = 0.005, 
+        top: int = 10, 
+        allocations: bool = True
+    ):
+        """
+        Initialize the profiler.
+        
+        Args:
+            output_dir: Directory the profile files are written to
+            interval: Seconds between stack samples for the flame graph
+            top: Number of allocation sites listed per stage
+            allocations: Trace allocations per pipeline stage; if tracemalloc is
+                already tracing, its traces are cleared
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top = top
+        self.allocations = allocations
+        self.runs = 0
+        self._calls = 0
+        self._lock = threading.Lock()
+        self._running = threading.Lock()
+    
+    def sample(self, every: int) -> bool:
+        """Return True for one call in every `every`, unless a run is in progress."""
+        with self._lock:
+            self._calls += 1
+            due = every > 0 and self._calls % every == 0
+        return due and not self._running.locked()
+    
+    @contextmanager
+    def profile(self, calculator: Any, label: str = "profile") -> Iterator[Optional[ProfileRun]]:
+        """
+        Profile the calls made to a calculator on this thread inside the block.
+        
+        Only one run happens at a time; if another is in progress, the block
+        runs unprofiled and None is yielded.
+        
+        Args:
+            calculator: The EmotionCalculator whose pipeline stages are recorded
+            label: Prefix of the file names, followed by the run number
+        
+        Returns:
+            A context manager yielding the ProfileRun, or None
+        """
+        if not self._running.acquire(blocking=False):
+            yield None
+            return
+        try:
+            with self._lock:
+                self.runs += 1
+                run = ProfileRun(f"{label}-{self.runs:04d}")
+            yield from self._profile(calculator, run)
+        finally:
+            self._running.release()
+    
+    def _profile(self, calculator: Any, run: ProfileRun) -> Iterator[ProfileRun]:
+        """Run the block under cProfile, the stack sampler and the stage recorder, then write the files."""
+        profile = cProfile.Profile()
+        sampler = StackSampler(interval=self.interval)
+        recorder = None
+        started_tracing = False
+        analyzer = calculator.semantic_analyzer
+        previous = (calculator.metrics, getattr(analyzer, "metrics", None))
+        if self.allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            recorder = _StageRecorder(calculator.metrics, profile)
+            calculator.metrics = recorder
+            if hasattr(analyzer, "metrics"):
+                analyzer.metrics = recorder
+        sampler.start()
+        profile.enable()
+        try:
+            yield run
+        finally:
+            profile.disable()
+            sampler.stop()
+            if recorder is not None:
+                calculator.metrics = previous[0]
+                if hasattr(analyzer, "metrics"):
+                    analyzer.metrics = previous[1]
+                run.stages = recorder.stages
+            if started_tracing:
+                tracemalloc.stop()
+            self._write(run, profile, sampler)
+    
+    def _write(self, run: ProfileRun, profile: cProfile.Profile, sampler: StackSampler) -> None:
+        """Write a run's profile files and record their paths."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, run.name)
+        profile.dump_stats(base + ".prof")
+        sampler.write(base + ".folded")
+        run.paths = [base + ".prof", base + ".folded"]
+        if self.allocations:
+            with open(base + ".alloc.txt", "w", encoding="utf-8") as f:
+                f.write(self.format_allocations(run.stages))
+            run.paths.append(base + ".alloc.txt")
+    
+    def format_allocations(self, stages: Dict[str, StageAllocations]) -> str:
+        """Return the per-stage allocation summary as text."""
+        lines = ["Memory allocated in each pipeline stage and still held when the stage ended", ""]
+        for stage, stats in stages.items():
+            lines.append(
+                f"{stage}: {stats.calls} calls, {_format_size(stats.retained)} retained, "
+                f"peak {_format_size(stats.peak)} in one call"
+            )
+            for location, size in stats.sizes.most_common(self.top):
+                lines.append(f"  {_format_size(size):>12} {stats.blocks[location]:>8} blocks  {location}")
+            lines.append("")
+        return "\n".join(lines)
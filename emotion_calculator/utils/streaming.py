@@ -0,0 +1,212 @@
+"""Streaming batch scoring of JSONL and CSV message files."""
+
+import csv
+import itertools
+import json
+import sys
+import time
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+FORMATS = ("jsonl", "csv")
+
+# What read_records does with a malformed row
+ON_ERROR = ("fail", "skip")
+
+
+def detect_format(path: Optional[str], default: str = "jsonl") -> str:
+    """
+    Guess the record format from a file name.
+    
+    Args:
+        path: File path, or None / "-" for a standard stream
+        default: Format used when the extension is not recognized
+    
+    Returns:
+        "jsonl" or "csv"
+    """
+    if path and path != "-":
+        lowered = path.lower()
+        if lowered.endswith(".csv"):
+            return "csv"
+        if lowered.endswith((".jsonl", ".ndjson", ".json")):
+            return "jsonl"
+    return default
+
+
+def _parse_context(value: Any) -> Optional[Dict]:
+    """Parse the context column: a dict, a JSON object, or comma-separated flags."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, dict):
+        return value
+    value = str(value).strip()
+    if value.startswith("{"):
+        return json.loads(value)
+    return {flag.strip(): True for flag in value.split(",") if flag.strip()}
+
+
+def _parse_record(row: Any) -> Dict[str, Any]:
+    """Normalize one parsed row into a record, raising ValueError if it is unusable."""
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object, got {type(row).__name__}")
+    record = dict(row)
+    if record.get("text") is None:
+        raise ValueError("missing text")
+    if not isinstance(record["text"], str):
+        raise ValueError("text must be a string")
+    if not isinstance(record.get("relationship"), (str, type(None))):
+        raise ValueError("relationship must be a string")
+    record["relationship"] = record.get("relationship") or None
+    record["context"] = _parse_context(record.get("context"))
+    return record
+
+
+def read_records(
+    stream: TextIO, 
+    fmt: str, 
+    on_error: str = "fail", 
+    error_stream: Optional[IO[str]] = sys.stderr
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read message records from a JSONL or CSV stream.
+    
+    Each record has "text", "relationship" and "context" keys; any other input
+    fields are kept so they can be echoed to the output.
+    
+    Args:
+        stream: Text stream to read
+        fmt: Record format ("jsonl" or "csv")
+        on_error: "fail" to raise on a malformed row, or "skip" to drop it and
+            report it on error_stream
+        error_stream: Where skipped rows are reported, or None
+    
+    Returns:
+        An iterator of record dicts
+    
+    Raises:
+        ValueError: With the line number of a malformed row, when on_error is "fail"
+    """
+    if on_error not in ON_ERROR:
+        raise ValueError(f"Unknown on_error '{on_error}', expected one of: {', '.join(ON_ERROR)}")
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        rows: Iterable[Tuple[int, Any]] = ((reader.line_num, row) for row in reader)
+    elif fmt == "jsonl":
+        rows = ((number, line) for number, line in enumerate(stream, 1) if line.strip())
+    else:
+        raise ValueError(f"Unknown format '{fmt}', expected one of: {', '.join(FORMATS)}")
+    
+    for line_number, row in rows:
+        try:
+            record = _parse_record(json.loads(row) if fmt == "jsonl" else row)
+        except ValueError as error:
+            if on_error == "fail":
+                raise ValueError(f"Line {line_number}: {error}") from error
+            if error_stream is not None:
+                print(f"Skipping line {line_number}: {error}", file=error_stream)
+            continue
+        yield record
+
+
+class RecordWriter:
+    """Writes scored records incrementally as JSONL or CSV."""
+    
+    def __init__(self, stream: TextIO, fmt: str):
+        """
+        Initialize the writer.
+        
+        Args:
+            stream: Text stream to write to
+            fmt: Record format ("jsonl" or "csv")
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}', expected one of: {', '.join(FORMATS)}")
+        self.stream = stream
+        self.fmt = fmt
+        self._csv_writer = None
+    
+    def write(self, record: Dict[str, Any], emotions: Dict[str, int], dominant_emotion: str) -> None:
+        """Write one scored record."""
+        if self.fmt == "jsonl":
+            output = dict(record)
+            output["emotions"] = emotions
+            output["dominant_emotion"] = dominant_emotion
+            self.stream.write(json.dumps(output) + "\n")
+            return
+        
+        if self._csv_writer is None:
+            fieldnames = ["text", "relationship", "dominant_emotion"] + list(emotions)
+            self._csv_writer = csv.DictWriter(self.stream, fieldnames=fieldnames)
+            self._csv_writer.writeheader()
+        row = {"text": record["text"], "relationship": record["relationship"] or ""}
+        row["dominant_emotion"] = dominant_emotion
+        row.update(emotions)
+        self._csv_writer.writerow(row)
+    
+    def flush(self) -> None:
+        """Flush the underlying stream."""
+        self.stream.flush()
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most size items without reading ahead."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_stream(
+    calculator: Any, 
+    records: Iterable[Dict[str, Any]], 
+    writer: RecordWriter, 
+    chunk_size: int = 256, 
+    progress: Optional[IO[str]] = sys.stderr, 
+    progress_interval: float = 5.0
+) -> int:
+    """
+    Score records chunk by chunk and write each chunk as soon as it is done.
+    
+    Only one chunk is held in memory at a time, so memory use does not depend
+    on the size of the input.
+    
+    Args:
+        calculator: The EmotionCalculator used for scoring
+        records: Records as produced by read_records
+        writer: Writer receiving scored records
+        chunk_size: Number of records scored per batch
+        progress: Stream for progress reports, or None to stay quiet
+        progress_interval: Minimum seconds between progress reports
+    
+    Returns:
+        The number of records scored
+    """
+    start = last_report = time.monotonic()
+    total = 0
+    
+    for chunk in chunked(records, chunk_size):
+        batch = calculator.calculate_emotions(
+            [record["text"] for record in chunk],
+            relationships=[record["relationship"] for record in chunk],
+            additional_context=[record["context"] for record in chunk],
+            batch_size=chunk_size,
+            columnar=True
+        )
+        for record, row in zip(chunk, batch):
+            writer.write(record, row.emotions, row.dominant_emotion)
+        writer.flush()
+        total += len(chunk)
+        
+        now = time.monotonic()
+        if progress is not None and now - last_report >= progress_interval:
+            last_report = now
+            rate = total / (now - start) if now > start else 0.0
+            progress.write(f"Scored {total} messages ({rate:.1f} messages/sec)\n")
+    
+    if progress is not None:
+        elapsed = time.monotonic() - start
+        rate = total / elapsed if elapsed > 0 else 0.0
+        progress.write(f"Done: scored {total} messages in {elapsed:.1f}s ({rate:.1f} messages/sec)\n")
+    return total
\ No newline at end of file
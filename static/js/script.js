@@ -13,6 +13,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const feedbackSubmit = document.getElementById('feedback-submit');
     const feedbackSkip = document.getElementById('feedback-skip');
     const ratingStars = document.querySelectorAll('.rating-star');
+    const draftEmotion = document.getElementById('draft-emotion');
     
     // Variables
     let messageCount = 0;
@@ -20,6 +21,10 @@ document.addEventListener('DOMContentLoaded', function() {
     let selectedRating = 0;
     const sessionStartTime = new Date();
     let emotionsChart = null;
+    // Draft as last acknowledged by /analyze/delta; version is null until the server has it
+    let draft = { sessionId: null, text: '', version: null };
+    let draftTimer = null;
+    let draftQueue = Promise.resolve();
     
     console.log('YouthMind app initialized with session ID:', sessionId);
     
@@ -33,6 +38,10 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // Enable/disable analyze button based on input
         analyzeBtn.disabled = this.value.trim().length === 0;
+        
+        // Re-analyze the draft once typing pauses
+        clearTimeout(draftTimer);
+        draftTimer = setTimeout(queueDraftAnalysis, 400);
     });
     
     // Set initial state of analyze button
@@ -690,6 +699,74 @@ document.addEventListener('DOMContentLoaded', function() {
         saveChatHistory();
     }
     
+    // Describe an edit turning one text into another as a single replaced range
+    function diffDraft(previous, current) {
+        let start = 0;
+        while (start < previous.length && start < current.length && previous[start] === current[start]) {
+            start++;
+        }
+        let end = previous.length;
+        let newEnd = current.length;
+        while (end > start && newEnd > start && previous[end - 1] === current[newEnd - 1]) {
+            end--;
+            newEnd--;
+        }
+        return { start: start, end: end, text: current.slice(start, newEnd) };
+    }
+    
+    function postDraft(body) {
+        return fetch('/analyze/delta', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(body),
+        });
+    }
+    
+    // Draft analyses run one at a time so each edit is based on the version before it
+    function queueDraftAnalysis() {
+        draftQueue = draftQueue.then(analyzeDraft).catch(error => {
+            console.error('Draft analysis failed:', error);
+            draft = { sessionId: null, text: '', version: null };
+        });
+    }
+    
+    // Send the draft's changes since the last analysis to /analyze/delta, so the
+    // server only re-analyzes the sentences that changed
+    async function analyzeDraft() {
+        const text = textInput.value;
+        if (draft.sessionId === sessionId && text === draft.text) return;
+        
+        const relationship = relationshipSelect.value;
+        const fullText = { sessionId: sessionId, text: text, relationship: relationship };
+        let response;
+        if (draft.sessionId === sessionId && draft.version !== null) {
+            response = await postDraft({
+                sessionId: sessionId,
+                version: draft.version,
+                edits: [diffDraft(draft.text, text)],
+                relationship: relationship
+            });
+            if (response.status === 409) {
+                // The server's draft is on another version (or was dropped): resend it whole
+                response = await postDraft(fullText);
+            }
+        } else {
+            response = await postDraft(fullText);
+        }
+        
+        if (!response.ok) {
+            throw new Error(`Draft analysis returned ${response.status}`);
+        }
+        const data = await response.json();
+        draft = { sessionId: sessionId, text: text, version: data.version };
+        // The message may have been sent while the request was in flight
+        if (textInput.value === text) {
+            draftEmotion.textContent = text.trim() ? `Your draft reads as ${data.dominant_emotion}` : '';
+        }
+    }
+    
     // Analyze emotions
     async function analyzeEmotions() {
         const text = textInput.value.trim();
@@ -702,6 +779,8 @@ document.addEventListener('DOMContentLoaded', function() {
         textInput.value = '';
         textInput.style.height = 'auto';
         analyzeBtn.disabled = true;
+        clearTimeout(draftTimer);
+        draftEmotion.textContent = '';
         
         // Add thinking message
         const thinkingTemplate = document.getElementById('ai-response-template');
@@ -0,0 +1,121 @@
+"""Tests for input limits, deadlines and admission control."""
+
+import time
+import unittest
+
+from emotion_calculator.core.admission import AdmissionController, InputTooLarge, Overloaded
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.utils.cache import ResultCache
+from tests.test_analyzer import make_test_nlp
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Test cases for the in-flight request limits."""
+    
+    def test_global_limit(self):
+        """Test that requests beyond the overall limit are rejected until a slot frees up."""
+        controller = AdmissionController(max_in_flight=1, retry_after=2.0)
+        with controller.admit():
+            self.assertEqual(controller.in_flight, 1)
+            with self.assertRaises(Overloaded) as raised:
+                with controller.admit():
+                    pass
+            self.assertFalse(raised.exception.per_key)
+            self.assertEqual(raised.exception.retry_after, 2.0)
+        self.assertEqual(controller.in_flight, 0)
+        with controller.admit():
+            pass
+        self.assertEqual(controller.rejected, 1)
+    
+    def test_per_key_limit(self):
+        """Test that one key cannot take every slot."""
+        controller = AdmissionController(max_in_flight=10, max_per_key=1)
+        with controller.admit("a"):
+            with self.assertRaises(Overloaded) as raised:
+                with controller.admit("a"):
+                    pass
+            self.assertTrue(raised.exception.per_key)
+            with controller.admit("b"), controller.admit(None):
+                self.assertEqual(controller.in_flight, 3)
+        with controller.admit("a"):
+            pass
+
+
+class TestDegradation(unittest.TestCase):
+    """Test cases for deadlines and the degraded lexical path."""
+    
+    def setUp(self):
+        """Set up a calculator with the blank test pipeline."""
+        self.calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()), 
+            max_text_length=100
+        )
+    
+    def test_input_limit(self):
+        """Test that texts over max_text_length are rejected."""
+        with self.assertRaises(InputTooLarge) as raised:
+            self.calculator.calculate_emotion("x" * 101)
+        self.assertEqual((raised.exception.length, raised.exception.limit), (101, 100))
+        with self.assertRaises(InputTooLarge):
+            self.calculator.calculate_emotions(["fine", "x" * 101])
+    
+    def test_degraded_only_when_actions_could_apply(self):
+        """Test that skipping the full pipeline flags only texts the action rules could apply to."""
+        threat = self.calculator.calculate_emotion("I'm going to kill you", relationship="enemy", degrade=True)
+        self.assertTrue(threat.degraded)
+        self.assertNotEqual(threat.emotions, self.calculator.calculate_emotion(
+            "I'm going to kill you", relationship="enemy").emotions)
+        
+        greeting = self.calculator.calculate_emotion("What a lovely day", degrade=True)
+        self.assertFalse(greeting.degraded)
+        self.assertEqual(greeting, self.calculator.calculate_emotion("What a lovely day"))
+    
+    def test_deadline(self):
+        """Test that a missed deadline degrades and a distant one does not."""
+        past = self.calculator.calculate_emotion("I will hurt you", deadline=time.monotonic() - 1)
+        self.assertTrue(past.degraded)
+        future = self.calculator.calculate_emotion("I will hurt you", deadline=time.monotonic() + 60)
+        self.assertFalse(future.degraded)
+        self.assertIsNotNone(self.calculator.seconds_per_char)
+    
+    def test_batch_degradation(self):
+        """Test that batches flag degraded texts and degraded results are not cached."""
+        calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()), 
+            cache=ResultCache()
+        )
+        texts = ["I'm going to kill you", "Hello there"]
+        degraded = calculator.calculate_emotions(texts, degrade=True)
+        self.assertEqual([result.degraded for result in degraded], [True, False])
+        full = calculator.calculate_emotions(texts)
+        self.assertEqual([result.degraded for result in full], [False, False])
+        self.assertEqual(full, [calculator.calculate_emotion(text) for text in texts])
+        with self.assertRaises(ValueError):
+            calculator.calculate_emotions(texts, columnar=True, degrade=True)
+    
+    def test_per_text_degradation(self):
+        """Test that one text's degrade flag or missed deadline does not degrade the rest of its batch."""
+        cached = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()), 
+            cache=ResultCache()
+        )
+        for calculator in (self.calculator, cached):
+            results = calculator.calculate_emotions(
+                ["I'm going to kill you", "I will hurt you"], 
+                degrade=[True, False]
+            )
+            self.assertEqual([result.degraded for result in results], [True, False])
+            results = calculator.calculate_emotions(
+                ["I will kill them", "They will hurt me"], 
+                deadline=[time.monotonic() + 60, time.monotonic() - 1]
+            )
+            self.assertEqual([result.degraded for result in results], [False, True])
+        
+        # A text shared by a degraded and a full item is analyzed once, in full
+        results = cached.calculate_emotions(["We will hurt him", "We will hurt him"], degrade=[True, False])
+        self.assertEqual([result.degraded for result in results], [False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
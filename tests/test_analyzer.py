@@ -0,0 +1,108 @@
+"""Tests for the emotion calculator pipeline."""
+
+import unittest
+
+import spacy
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.utils.cache import ResultCache
+
+
+def make_test_nlp():
+    """Build a small blank pipeline that tags threat verbs without a trained model."""
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("attribute_ruler")
+    ruler.add([[{"LOWER": {"IN": ["kill", "hurt"]}}]], {"POS": "VERB", "LEMMA": "kill"})
+    return nlp
+
+
+class TestEmotionCalculator(unittest.TestCase):
+    """Test cases for the emotion calculator."""
+    
+    def setUp(self):
+        """Set up a calculator backed by a lightweight pipeline."""
+        self.calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp())
+        )
+        self.texts = [
+            "I'm going to kill you",
+            "I'm so happy to see you today!",
+            "That was a disgusting and revolting meal.",
+            "",
+        ]
+    
+    def test_batch_matches_single_calls(self):
+        """Test that batched results match one call per text."""
+        relationships = ["enemy", "friend", "colleague", None]
+        batch = self.calculator.calculate_emotions(self.texts, relationships=relationships)
+        single = [
+            self.calculator.calculate_emotion(text, relationship=relationship)
+            for text, relationship in zip(self.texts, relationships)
+        ]
+        self.assertEqual(batch, single)
+    
+    def test_batch_with_single_relationship(self):
+        """Test that a single relationship applies to every text."""
+        results = self.calculator.calculate_emotions(self.texts, relationships="friend", batch_size=2)
+        self.assertEqual([r.input_text for r in results], self.texts)
+        self.assertTrue(all(r.context.relationship_type == "friend" for r in results))
+    
+    def test_batch_rejects_mismatched_relationships(self):
+        """Test that relationship lists must align with the texts."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_emotions(self.texts, relationships=["friend"])
+
+
+
+class TestFastPath(unittest.TestCase):
+    """Test cases for the tiered fast path."""
+    
+    def setUp(self):
+        """Set up texts that do and do not mention threat actions."""
+        self.texts = [
+            "I'm going to kill you",
+            "KILL them all",
+            "That really hurt, you are so mean!",
+            "I'm so happy to see you today!",
+            "Great skills, I trust you",
+            "That was a disgusting and revolting meal.",
+            "",
+        ]
+        self.relationships = ["enemy", "friend", "adversary", "friend", "stranger", "colleague", None]
+    
+    def make_calculator(self, **kwargs):
+        return EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()), **kwargs)
+    
+    def test_emotions_match_full_path(self):
+        """Test that the fast path gives exactly the emotions of the full path."""
+        full = self.make_calculator()
+        fast = self.make_calculator(fast_path=True)
+        for relationship in ["enemy", "friend", "stranger"]:
+            expected = full.calculate_emotions(self.texts, relationships=relationship)
+            self.assertEqual(fast.calculate_emotions(self.texts, relationships=relationship), expected)
+            self.assertEqual(
+                [fast.calculate_emotion(text, relationship=relationship) for text in self.texts], 
+                expected
+            )
+            batch = fast.calculate_emotions(self.texts, relationships=relationship, columnar=True)
+            self.assertEqual(batch.to_results(), expected)
+    
+    def test_tier_counts(self):
+        """Test that only texts mentioning threat actions take the full tier."""
+        fast = self.make_calculator(fast_path=True)
+        fast.calculate_emotions(self.texts, relationships=self.relationships)
+        self.assertEqual(fast.tier_counts, {"lexical": 3, "full": 4})
+    
+    def test_cached_fast_path(self):
+        """Test that lexical analyses are not cached and results still match."""
+        full = self.make_calculator()
+        fast = self.make_calculator(fast_path=True, cache=ResultCache())
+        expected = full.calculate_emotions(self.texts, relationships=self.relationships)
+        self.assertEqual(fast.calculate_emotions(self.texts, relationships=self.relationships), expected)
+        self.assertEqual(len(fast.cache.backend), len(self.texts) + 4)
+        self.assertEqual(fast.calculate_emotions(self.texts, relationships=self.relationships), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Tests for the request coalescer."""
+
+import asyncio
+import threading
+import unittest
+
+from emotion_calculator.core.batching import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test cases for the micro-batcher."""
+    
+    def setUp(self):
+        """Set up a batcher that records the batches it processes."""
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        
+        def process(items):
+            self.started.set()
+            self.release.wait()
+            self.batches.append(list(items))
+            return [item * 2 for item in items]
+        
+        self.batcher = MicroBatcher(process, max_batch_size=4, max_wait=0.05)
+        self.addCleanup(self.batcher.close)
+    
+    def test_results_resolve_to_callers(self):
+        """Test that each caller receives the result for its own item."""
+        futures = [self.batcher.submit(item) for item in range(10)]
+        self.assertEqual([future.result(timeout=5) for future in futures], [i * 2 for i in range(10)])
+        self.assertTrue(all(len(batch) <= 4 for batch in self.batches))
+    
+    def test_concurrent_calls_are_coalesced(self):
+        """Test that items queued while a batch runs are processed as one batch."""
+        self.release.clear()
+        first = self.batcher.submit(0)
+        self.started.wait(timeout=5)
+        futures = [self.batcher.submit(item) for item in range(1, 4)]
+        self.release.set()
+        first.result(timeout=5)
+        [future.result(timeout=5) for future in futures]
+        self.assertEqual(self.batches, [[0], [1, 2, 3]])
+        self.assertEqual(self.batcher.stats()["items"], 4)
+    
+    def test_errors_propagate(self):
+        """Test that a failing batch fails every future in it."""
+        batcher = MicroBatcher(lambda items: 1 / 0, max_wait=0.0)
+        self.addCleanup(batcher.close)
+        with self.assertRaises(ZeroDivisionError):
+            batcher.process("x", timeout=5)
+    
+    def test_per_item_errors(self):
+        """Test that an Exception returned for one item fails only that item."""
+        batcher = MicroBatcher(
+            lambda items: [ValueError(item) if item < 0 else item for item in items], 
+            max_batch_size=4, 
+            max_wait=0.05
+        )
+        self.addCleanup(batcher.close)
+        futures = [batcher.submit(item) for item in (1, -1, 2)]
+        self.assertEqual(futures[0].result(timeout=5), 1)
+        with self.assertRaises(ValueError):
+            futures[1].result(timeout=5)
+        self.assertEqual(futures[2].result(timeout=5), 2)
+    
+    def test_async_interface(self):
+        """Test that results can be awaited from asyncio code."""
+        async def run():
+            return await asyncio.gather(*(self.batcher.process_async(i) for i in range(5)))
+        
+        self.assertEqual(asyncio.run(run()), [0, 2, 4, 6, 8])
+    
+    def test_closed_batcher_rejects_items(self):
+        """Test that submitting after close raises."""
+        self.batcher.close()
+        with self.assertRaises(RuntimeError):
+            self.batcher.submit(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests for the benchmark baseline comparison."""
+
+import copy
+import os
+import sys
+import unittest
+
+# The benchmark scripts import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+from bench_pipeline import check_baseline  # noqa: E402
+
+BASELINE = {
+    "meta": {"model": "en_core_web_sm", "profile": "full", "sentiment": "textblob",
+             "fast_path": False, "batch_size": 256},
+    "model_load_seconds": 1.0,
+    "peak_rss_mb": 200.0,
+    "stages": {
+        "semantic": {"p50_ms": 2.0, "p99_ms": 8.0, "msgs_per_sec": 400.0},
+        "end_to_end": {"p50_ms": 2.5, "p99_ms": 10.0, "msgs_per_sec": 350.0},
+    },
+}
+
+
+class TestCheckBaseline(unittest.TestCase):
+    """Test cases for comparing benchmark results with a baseline."""
+    
+    def results(self, **stage_changes):
+        """Return a copy of the baseline with some stage metrics replaced."""
+        results = copy.deepcopy(BASELINE)
+        for stage, metrics in stage_changes.items():
+            results["stages"][stage].update(metrics)
+        return results
+    
+    def test_unchanged(self):
+        """Test that results equal to the baseline pass without warnings."""
+        self.assertEqual(check_baseline(self.results(), BASELINE, 0.15), ([], []))
+    
+    def test_regression(self):
+        """Test that slower latency and lower throughput beyond the threshold are reported."""
+        results = self.results(semantic={"p99_ms": 10.0, "msgs_per_sec": 300.0})
+        regressions, warnings = check_baseline(results, BASELINE, 0.15)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("semantic.p99_ms"))
+        self.assertTrue(regressions[1].startswith("semantic.msgs_per_sec"))
+        self.assertEqual(warnings, [])
+        self.assertEqual(check_baseline(results, BASELINE, 0.30), ([], []))
+        
+        results = self.results()
+        results["peak_rss_mb"] = 300.0
+        self.assertEqual(len(check_baseline(results, BASELINE, 0.15)[0]), 1)
+    
+    def test_improvement(self):
+        """Test that faster results are not regressions."""
+        results = self.results(semantic={"p50_ms": 1.0, "p99_ms": 4.0, "msgs_per_sec": 800.0})
+        self.assertEqual(check_baseline(results, BASELINE, 0.15), ([], []))
+    
+    def test_missing_stage(self):
+        """Test that stages only in the run or only in the baseline are warned about, not compared."""
+        results = self.results()
+        del results["stages"]["end_to_end"]
+        results["stages"]["batch"] = {"p50_ms": 100.0, "p99_ms": 100.0, "msgs_per_sec": 1.0}
+        regressions, warnings = check_baseline(results, BASELINE, 0.15)
+        self.assertEqual(regressions, [])
+        self.assertEqual(warnings, [
+            "stage batch is not in the baseline",
+            "stage end_to_end of the baseline was not run"
+        ])
+    
+    def test_model_mismatch(self):
+        """Test that a baseline recorded with another model is warned about."""
+        results = self.results()
+        results["meta"]["model"] = "blank"
+        regressions, warnings = check_baseline(results, BASELINE, 0.15)
+        self.assertEqual(regressions, [])
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("model", warnings[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
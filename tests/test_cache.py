@@ -0,0 +1,133 @@
+"""Tests for the result cache."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import spacy
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.utils.cache import CacheBackend, MemoryCache, ResultCache, SqliteCache
+
+
+class TestCacheBackends(unittest.TestCase):
+    """Test cases for the cache backends."""
+    
+    def test_memory_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = MemoryCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+    
+    def test_memory_ttl(self):
+        """Test that entries expire after their time-to-live."""
+        cache = MemoryCache(ttl=10)
+        with mock.patch("emotion_calculator.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch("emotion_calculator.utils.cache.time.monotonic", return_value=105.0):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("emotion_calculator.utils.cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("a"))
+    
+    def test_sqlite_survives_reopen(self):
+        """Test that the SQLite backend persists entries and evicts beyond max size."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            cache = SqliteCache(path, max_size=2)
+            cache.set("a", {"value": 1})
+            cache.set("b", {"value": 2})
+            cache.set("c", {"value": 3})
+            cache.close()
+            
+            reopened = SqliteCache(path, max_size=2)
+            self.assertEqual(len(reopened), 2)
+            self.assertEqual(reopened.get("c"), {"value": 3})
+            reopened.close()
+    
+    
+    def test_backend_interface(self):
+        """Test that a backend missing part of the interface cannot be instantiated."""
+        class Incomplete(CacheBackend):
+            def get(self, key):
+                return None
+        
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class TestCalculatorCache(unittest.TestCase):
+    """Test cases for caching inside the emotion calculator."""
+    
+    def setUp(self):
+        """Set up cached and uncached calculators sharing a blank pipeline."""
+        analyzer = SemanticAnalyzer(nlp=spacy.blank("en"))
+        self.cache = ResultCache(max_size=100)
+        self.cached = EmotionCalculator(semantic_analyzer=analyzer, cache=self.cache)
+        self.uncached = EmotionCalculator(semantic_analyzer=analyzer)
+    
+    def test_cached_results_match(self):
+        """Test that cached results equal freshly computed ones."""
+        first = self.cached.calculate_emotion("I am so happy!", relationship="friend")
+        second = self.cached.calculate_emotion("I am so happy!", relationship="friend")
+        expected = self.uncached.calculate_emotion("I am so happy!", relationship="friend")
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertEqual(self.cache.stats()["result_hits"], 1)
+    
+    def test_semantic_reused_across_relationships(self):
+        """Test that texts differing only in spacing share one analysis across contexts."""
+        with mock.patch.object(
+            self.cached.semantic_analyzer, "analyze", 
+            wraps=self.cached.semantic_analyzer.analyze
+        ) as analyze:
+            self.cached.calculate_emotion("Hello   there", relationship="friend")
+            result = self.cached.calculate_emotion(" Hello there\n", relationship="enemy")
+        self.assertEqual(analyze.call_count, 1)
+        self.assertEqual(result.input_text, " Hello there\n")
+        self.assertEqual(self.cache.stats()["semantic_hits"], 1)
+    
+    def test_batch_uses_cache(self):
+        """Test that the batch path only analyzes texts missing from the cache."""
+        texts = ["good day", "Good day", "so sad", "good day"]
+        self.cached.calculate_emotion("so sad", relationship="friend")
+        with mock.patch.object(
+            self.cached.semantic_analyzer, "analyze_batch", 
+            wraps=self.cached.semantic_analyzer.analyze_batch
+        ) as analyze_batch:
+            results = self.cached.calculate_emotions(texts, relationships="friend")
+        self.assertEqual(analyze_batch.call_args[0][0], ["good day", "Good day"])
+        self.assertEqual(results, self.uncached.calculate_emotions(texts, relationships="friend"))
+    
+    def test_case_variants_analyzed_separately(self):
+        """Test that texts differing in case get their own analyses, since tagging is case-sensitive."""
+        self.assertNotEqual(ResultCache.semantic_key("I will Kill you"), ResultCache.semantic_key("i will kill you"))
+        self.assertEqual(ResultCache.semantic_key("I will  Kill you "), ResultCache.semantic_key("I will Kill you"))
+    
+    
+    def test_analyzers_sharing_a_backend(self):
+        """Test that analyzers with another profile or sentiment backend do not reuse each other's entries."""
+        backend = MemoryCache()
+        nlp = spacy.blank("en")
+        for sentiment, profile in (("textblob", "full"), ("lexicon", "full"), ("textblob", "no_entities")):
+            calculator = EmotionCalculator(
+                semantic_analyzer=SemanticAnalyzer(nlp=nlp, profile=profile, sentiment=sentiment), 
+                cache=ResultCache(backend)
+            )
+            with mock.patch.object(
+                calculator.semantic_analyzer, "analyze", 
+                wraps=calculator.semantic_analyzer.analyze
+            ) as analyze:
+                calculator.calculate_emotion("What a lovely day")
+            self.assertEqual(analyze.call_count, 1, (sentiment, profile))
+        self.assertEqual(len(backend), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 """Tests for the context judgment module."""
 
+import dataclasses
 import unittest
+
 from emotion_calculator.core.context import ContextJudge
 
 
@@ -28,6 +30,35 @@ class TestContextJudgment(unittest.TestCase):
         result = self.judge.determine_context(relationship="unknown_type")
         self.assertEqual(result.relationship_type, "neutral")
 
+    
+    def test_contexts_are_shared(self):
+        """Test that repeated lookups return the same immutable instance."""
+        first = self.judge.determine_context(relationship="Friend")
+        second = self.judge.determine_context(relationship="friend")
+        self.assertIs(first, second)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            first.trust_level = 0.0
+    
+    def test_additional_context_flags(self):
+        """Test that formal settings and trust breaches adjust the context."""
+        result = self.judge.determine_context(
+            relationship="colleague", 
+            additional_context={"formal_setting": True, "previous_trust_breach": True}
+        )
+        self.assertEqual(result.formality_level, 0.8)
+        self.assertEqual(result.trust_level, 0.375)
+        self.assertIs(result, self.judge.lookup("colleague", True, True))
+    
+    def test_register_relationship(self):
+        """Test that user-registered relationships are looked up like built-in ones."""
+        self.judge.register_relationship("Mentor", 0.8)
+        result = self.judge.determine_context(relationship="MENTOR")
+        self.assertEqual(result.relationship_type, "mentor")
+        self.assertAlmostEqual(result.trust_level, 0.9)
+        self.assertNotIn("mentor", ContextJudge().known_relationships)
+        with self.assertRaises(ValueError):
+            self.judge.register_relationship("nemesis", -2.0)
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
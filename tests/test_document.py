@@ -0,0 +1,102 @@
+"""Tests for document mode."""
+
+import unittest
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.document import iter_chunks
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from tests.test_analyzer import make_test_nlp
+
+
+class TestChunking(unittest.TestCase):
+    """Test cases for splitting documents into chunks."""
+    
+    def test_sentences(self):
+        """Test that sentences are split with offsets into the document."""
+        text = 'I love this. "Are you sure?" she asked!\nI will hurt you'
+        chunks = list(iter_chunks(text))
+        self.assertEqual([c.text for c in chunks], ["I love this.", '"Are you sure?"', "she asked!", "I will hurt you"])
+        self.assertTrue(all(text[c.start:c.end] == c.text for c in chunks))
+        self.assertEqual([c.index for c in chunks], [0, 1, 2, 3])
+    
+    def test_turns(self):
+        """Test that speaker labels and blank lines start new turns."""
+        text = "Alice: hello there.\nHow are you?\nBob: fine.\n\nA new paragraph"
+        self.assertEqual(
+            [c.text for c in iter_chunks(text, split="turn")],
+            ["Alice: hello there.\nHow are you?", "Bob: fine.", "A new paragraph"]
+        )
+    
+    def test_streamed_pieces_match_whole_text(self):
+        """Test that reading a document line by line gives the same chunks."""
+        text = "Alice: hello. Bye!\nBob: what?\n\nEnd of story.\n"
+        for split in ("sentence", "turn"):
+            self.assertEqual(
+                list(iter_chunks(text.splitlines(keepends=True), split=split)),
+                list(iter_chunks(text, split=split))
+            )
+    
+    def test_long_sentences_are_cut(self):
+        """Test that chunks never exceed max_chars, even without boundaries."""
+        text = "word " * 500
+        for document in (text, iter(text)):
+            chunks = list(iter_chunks(document, max_chars=23))
+            self.assertTrue(all(len(c.text) <= 23 for c in chunks))
+            self.assertEqual(sum(len(c.text.split()) for c in chunks), 500)
+    
+    def test_rejects_unknown_split(self):
+        """Test that unknown split modes raise ValueError."""
+        with self.assertRaises(ValueError):
+            list(iter_chunks("text", split="paragraph"))
+
+
+class TestDocumentMode(unittest.TestCase):
+    """Test cases for scoring whole documents."""
+    
+    def setUp(self):
+        """Set up a calculator backed by a lightweight pipeline."""
+        self.calculator = EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()))
+    
+    def test_timeline_matches_single_calls(self):
+        """Test that every chunk is scored like a standalone message."""
+        text = "I'm so happy to see you today! I'm going to kill you. That was disgusting."
+        document = self.calculator.calculate_document(text, relationship="friend", batch_size=2)
+        self.assertEqual(len(document.chunks), 3)
+        for chunk, result in zip(document.chunks, document.results):
+            self.assertEqual(result, self.calculator.calculate_emotion(chunk.text, relationship="friend"))
+        self.assertEqual(document.timeline(), [(c.start, r.dominant_emotion) for c, r in zip(document.chunks, document.results)])
+        self.assertEqual(document.context.relationship_type, "friend")
+    
+    def test_aggregate_is_length_weighted(self):
+        """Test the document-level distribution."""
+        document = self.calculator.calculate_document("I'm so happy to see you today! I'm going to kill you.")
+        weights = [len(c.text) for c in document.chunks]
+        for emotion, value in document.emotions.items():
+            expected = sum(r.emotions[emotion] * w for r, w in zip(document.results, weights)) / sum(weights)
+            self.assertEqual(value, round(expected))
+        self.assertIn(document.dominant_emotion, document.emotions)
+    
+    def test_stream_is_lazy(self):
+        """Test that results are produced before the whole document is read."""
+        consumed = []
+        
+        def lines():
+            for index in range(100):
+                consumed.append(index)
+                yield f"Line {index} is fine.\n"
+        
+        stream = self.calculator.stream_document(lines(), batch_size=4)
+        chunk, _ = next(stream)
+        self.assertEqual(chunk.text, "Line 0 is fine.")
+        self.assertLess(len(consumed), 10)
+    
+    def test_empty_document(self):
+        """Test that an empty document has no chunks and an empty aggregate."""
+        document = self.calculator.calculate_document("   ")
+        self.assertEqual(document.chunks, [])
+        self.assertEqual(document.emotions, {})
+        self.assertEqual(document.dominant_emotion, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -49,6 +49,30 @@ class TestEmotionMapping(unittest.TestCase):
         
         result = self.mapper.map_emotions(semantic_data, context_data)
         self.assertGreater(result.values["Joy"], 0.3)
+    
+    def test_keywords_match_whole_words(self):
+        """Test that trigger keywords inside other words are ignored."""
+        made = SemanticAnalysisResult(
+            sentiment=0.0,
+            subjectivity=0.0,
+            entities=[],
+            actions=[],
+            keywords=[],
+            full_text="I made dinner"
+        )
+        plain = SemanticAnalysisResult(
+            sentiment=0.0,
+            subjectivity=0.0,
+            entities=[],
+            actions=[],
+            keywords=[],
+            full_text="I cooked dinner"
+        )
+        
+        self.assertEqual(
+            self.mapper.map_emotions(made, ContextResult()),
+            self.mapper.map_emotions(plain, ContextResult())
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""Tests for the semantic feature store."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.lexicon import Lexicon
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.data.feature_store import FeatureStore, build_feature_store, rescore
+from tests.test_analyzer import make_test_nlp
+
+RECORDS = [
+    {"text": "I'm going to kill you", "relationship": "enemy", "context": None},
+    {"text": "What a lovely, happy day", "relationship": "friend", "context": {"formal_setting": True}},
+    {"text": "That was disgusting.", "relationship": None, "context": None},
+    {"text": "", "relationship": "colleague", "context": {"previous_trust_breach": True}},
+]
+
+
+class TestFeatureStore(unittest.TestCase):
+    """Test cases for saving and re-scoring semantic features."""
+    
+    def setUp(self):
+        """Save the features of a small corpus."""
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, "features")
+        self.calculator = EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()))
+        self.assertEqual(build_feature_store(self.calculator, RECORDS, self.path, chunk_size=3), len(RECORDS))
+    
+    def expected(self, calculator):
+        return calculator.calculate_emotions(
+            [r["text"] for r in RECORDS], 
+            relationships=[r["relationship"] for r in RECORDS], 
+            additional_context=[r["context"] for r in RECORDS]
+        )
+    
+    def test_round_trip(self):
+        """Test that stored columns read back as written."""
+        store = FeatureStore(self.path)
+        self.assertEqual(len(store), len(RECORDS))
+        self.assertEqual([store.text(row) for row in range(len(store))], [r["text"] for r in RECORDS])
+        self.assertEqual([store.relationship(row) for row in range(len(store))], [r["relationship"] for r in RECORDS])
+        self.assertEqual(store.additional_context(1), {"formal_setting": True})
+        self.assertEqual(store.actions(0), ["kill"])
+        self.assertEqual(store.threat_mask().tolist(), [True, False, False, False])
+    
+    def test_rescore_matches_pipeline(self):
+        """Test that re-scoring gives the same results as the full pipeline."""
+        store = FeatureStore(self.path)
+        expected = self.expected(self.calculator)
+        self.assertEqual(rescore(self.calculator, store).to_results(), expected)
+        self.assertEqual(rescore(self.calculator, store, vectorized=True).to_results(), expected)
+    
+    def test_rescore_reads_texts_lazily(self):
+        """Test that re-scoring decodes a text only when its row is read."""
+        store = FeatureStore(self.path)
+        with mock.patch.object(store, "text", wraps=store.text) as text:
+            batch = rescore(self.calculator, store, vectorized=True)
+            self.assertEqual(text.call_count, 0)
+            self.assertEqual(batch[1].input_text, RECORDS[1]["text"])
+            self.assertEqual(text.call_count, 1)
+        self.assertEqual([view.context for view in batch], [r.context for r in self.expected(self.calculator)])
+    
+    def test_rescore_with_new_configuration(self):
+        """Test that changed keywords and relationships apply without rerunning NLP."""
+        default = Lexicon.default()
+        triggers = dict(default.triggers, Joy={"sentiment": 0.7, "keywords": ["lovely"]})
+        relationships = dict(default.relationships, friend=0.2)
+        tuned = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()), 
+            lexicon=Lexicon(default.emotions, triggers, relationships)
+        )
+        store = FeatureStore(self.path)
+        self.assertEqual(rescore(tuned, store).to_results(), self.expected(tuned))
+    
+    def test_failed_build_leaves_no_store(self):
+        """Test that an error while building does not leave a store that opens with missing rows."""
+        path = os.path.join(self.tempdir.name, "failed")
+        
+        def records():
+            yield from RECORDS
+            raise ValueError("Line 5: malformed record")
+        
+        with self.assertRaises(ValueError):
+            build_feature_store(self.calculator, records(), path, chunk_size=3)
+        self.assertFalse(os.path.exists(path))
+        with self.assertRaises(ValueError):
+            build_feature_store(self.calculator, records(), self.path, chunk_size=3)
+        with self.assertRaises(FileNotFoundError):
+            FeatureStore(self.path)
+    
+    def test_rejects_unknown_version(self):
+        """Test that stores written by another format version are refused."""
+        meta_path = os.path.join(self.path, "meta.json")
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["format_version"] = 99
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        with self.assertRaises(ValueError):
+            FeatureStore(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
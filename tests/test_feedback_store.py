@@ -0,0 +1,62 @@
+"""Tests for the feedback store."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from emotion_calculator.data.feedback_store import FeedbackStore
+
+
+class TestFeedbackStore(unittest.TestCase):
+    """Test cases for the append-only feedback store."""
+    
+    def setUp(self):
+        """Set up an in-memory store."""
+        self.store = FeedbackStore(":memory:")
+        self.addCleanup(self.store.close)
+    
+    def test_same_second_submissions_are_kept(self):
+        """Test that identical session and timestamp do not overwrite each other."""
+        entry = {"sessionId": "s1", "rating": 4, "timestamp": "2025-03-07T03:09:53"}
+        self.store.add(entry)
+        self.store.add(dict(entry, rating=2))
+        self.assertEqual(self.store.count("s1"), 2)
+    
+    def test_summary_aggregates(self):
+        """Test that counts, averages and the histogram are maintained incrementally."""
+        self.store.add({"sessionId": "a", "rating": 5, "feedback": "great"})
+        self.store.add({"sessionId": "b", "rating": "3"})
+        self.store.add({"sessionId": "c"})
+        summary = self.store.summary()
+        self.assertEqual(summary["total_entries"], 3)
+        self.assertEqual(summary["rating_sum"], 8)
+        self.assertAlmostEqual(summary["avg_rating"], 8 / 3)
+        self.assertEqual(summary["comment_count"], 1)
+        self.assertEqual(summary["rating_histogram"], {1: 0, 2: 0, 3: 1, 4: 0, 5: 1})
+    
+    def test_pagination_newest_first(self):
+        """Test that pages return entries newest first, optionally per session."""
+        for minute in range(5):
+            session = "odd" if minute % 2 else "even"
+            self.store.add({"sessionId": session, "rating": minute, "timestamp": f"2025-01-01T00:0{minute}:00"})
+        self.assertEqual([e["rating"] for e in self.store.page(1, per_page=2)], [4, 3])
+        self.assertEqual([e["rating"] for e in self.store.page(3, per_page=2)], [0])
+        self.assertEqual([e["rating"] for e in self.store.page(1, session_id="odd")], [3, 1])
+    
+    def test_migrate_json_dir_once(self):
+        """Test that legacy JSON files are imported exactly once."""
+        with tempfile.TemporaryDirectory() as directory:
+            for index in range(3):
+                with open(os.path.join(directory, f"feedback_s{index}_20250307_0309{index}0.json"), "w") as f:
+                    json.dump({"sessionId": f"s{index}", "rating": 5}, f)
+            with open(os.path.join(directory, "feedback_broken.json"), "w") as f:
+                f.write("{not json")
+            
+            self.assertEqual(self.store.migrate_json_dir(directory), 3)
+            self.assertEqual(self.store.migrate_json_dir(directory), 0)
+        self.assertEqual(self.store.summary()["total_entries"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Import-time budget tests for the emotion calculator package."""
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+# Wall-clock budgets (seconds) on top of bare interpreter startup
+IMPORT_BUDGET = 0.5
+CLI_HELP_BUDGET = 0.5
+
+HEAVY_MODULES = ("spacy", "textblob", "thinc", "numpy")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code: str) -> float:
+    """Run code in a fresh interpreter and return its wall-clock time."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def best_of(code: str, repeat: int = 3) -> float:
+    """Return the fastest of several timed runs to reduce noise."""
+    return min(run_python(code) for _ in range(repeat))
+
+
+class TestImportTime(unittest.TestCase):
+    """Test cases for package import and CLI startup cost."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Measure bare interpreter startup as the baseline."""
+        cls.startup = best_of("pass")
+    
+    def test_import_skips_heavy_modules(self):
+        """Test that importing the package does not import the NLP stack."""
+        run_python(
+            "import sys, emotion_calculator\n"
+            "from emotion_calculator.data.models import EmotionResult\n"
+            "from emotion_calculator.config.emotion_config import EMOTIONS\n"
+            f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+            "assert not loaded, loaded"
+        )
+    
+    def test_import_budget(self):
+        """Test that importing the package stays within its time budget."""
+        elapsed = best_of("import emotion_calculator") - self.startup
+        self.assertLess(elapsed, IMPORT_BUDGET)
+    
+    def test_cli_help_budget(self):
+        """Test that the CLI prints help quickly and without loading the NLP stack."""
+        code = (
+            "import sys\n"
+            "from emotion_calculator import cli\n"
+            "sys.argv = ['emotion-calculator', '--help']\n"
+            "try:\n"
+            "    cli.main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+            "assert not loaded, loaded"
+        )
+        elapsed = best_of(code) - self.startup
+        self.assertLess(elapsed, CLI_HELP_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
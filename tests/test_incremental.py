@@ -0,0 +1,102 @@
+"""Tests for incremental re-analysis of edited text."""
+
+import time
+import unittest
+
+from emotion_calculator.core.admission import InputTooLarge
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.incremental import DeltaConflict, SentenceCache
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from tests.test_analyzer import make_test_nlp
+
+
+class TestIncremental(unittest.TestCase):
+    """Test cases for the per-session sentence cache."""
+    
+    def setUp(self):
+        """Set up a calculator with a sentence cache."""
+        self.calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()),
+            sentence_cache=SentenceCache(max_sessions=2)
+        )
+    
+    def test_single_sentence_matches_full_analysis(self):
+        """Test that a one-sentence text scores like calculate_emotion."""
+        text = "I'm going to kill you"
+        update = self.calculator.calculate_incremental("s1", text=text, relationship="enemy")
+        self.assertEqual(update.result, self.calculator.calculate_emotion(text, relationship="enemy"))
+        self.assertEqual((update.version, update.analyzed, update.reused), (1, 1, 0))
+    
+    def test_only_changed_sentences_are_analyzed(self):
+        """Test that edits re-analyze only new or changed sentences."""
+        text = "What a lovely day. I am so happy. See you soon."
+        first = self.calculator.calculate_incremental("s1", text=text)
+        self.assertEqual(first.analyzed, 3)
+        
+        # Append a sentence through an edit against the current version
+        appended = self.calculator.calculate_incremental(
+            "s1", edits=[(len(text), len(text), " I will hurt you.")], version=first.version
+        )
+        self.assertEqual((appended.version, appended.analyzed, appended.reused), (2, 1, 3))
+        self.assertEqual(appended.result.input_text, text + " I will hurt you.")
+        self.assertGreater(appended.result.emotions["Fear"], first.result.emotions["Fear"])
+        
+        # Undoing the edit needs no analysis at all
+        undone = self.calculator.calculate_incremental("s1", text=text)
+        self.assertEqual((undone.analyzed, undone.reused), (0, 3))
+        self.assertEqual(undone.result, first.result)
+    
+    def test_stale_edits_conflict(self):
+        """Test that edits against an old version are rejected."""
+        self.calculator.calculate_incremental("s1", text="Hello there.")
+        with self.assertRaises(DeltaConflict) as raised:
+            self.calculator.calculate_incremental("s1", edits=[(0, 0, "Oh. ")], version=0)
+        self.assertEqual(raised.exception.version, 1)
+        with self.assertRaises(DeltaConflict):
+            self.calculator.calculate_incremental("s1", edits=[(20, 30, "x")], version=1)
+    
+    def test_sessions_are_separate_and_bounded(self):
+        """Test that sessions keep their own text and the least recently used are evicted."""
+        for session_id in ("a", "b", "c"):
+            self.calculator.calculate_incremental(session_id, text=f"Session {session_id}.")
+        cache = self.calculator.sentence_cache
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.edit("c", edits=[], version=1), ("Session c.", 1))
+    
+    def test_input_limit(self):
+        """Test that an edit making the text too long is rejected without changing it."""
+        calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()), 
+            sentence_cache=SentenceCache(), 
+            max_text_length=20
+        )
+        calculator.calculate_incremental("s1", text="Hello there.")
+        with self.assertRaises(InputTooLarge):
+            calculator.calculate_incremental("s1", edits=[(12, 12, " How are you today?")], version=1)
+        self.assertEqual(calculator.sentence_cache.edit("s1", edits=[], version=1), ("Hello there.", 1))
+        with self.assertRaises(InputTooLarge):
+            calculator.calculate_incremental("s2", text="x" * 21)
+    
+    def test_requires_sentence_cache(self):
+        """Test that calculators without a sentence cache reject incremental calls."""
+        calculator = EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()))
+        with self.assertRaises(ValueError):
+            calculator.calculate_incremental("s1", text="Hello")
+    
+    def test_deadline(self):
+        """Test that new sentences past the deadline are degraded and not cached."""
+        text = "Hello there. I'm going to kill you."
+        late = self.calculator.calculate_incremental("s1", text=text, deadline=time.monotonic() - 1)
+        self.assertTrue(late.result.degraded)
+        self.assertEqual(late.analyzed, 2)
+        
+        # The degraded sentences are analyzed in full by the next call
+        full = self.calculator.calculate_incremental("s1", text=text, deadline=time.monotonic() + 60)
+        self.assertFalse(full.result.degraded)
+        self.assertEqual((full.analyzed, full.reused), (2, 0))
+        self.assertTrue(self.calculator.calculate_incremental("s2", text=text, degrade=True).result.degraded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+"""Tests for the compiled keyword matcher."""
+
+import unittest
+
+from emotion_calculator.core.keywords import KeywordMatcher
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Test cases for the keyword matcher."""
+    
+    def setUp(self):
+        """Set up a matcher with single- and multi-word keywords."""
+        self.matcher = KeywordMatcher({
+            "Anger": ["mad", "hate"],
+            "Anticipation": ["looking forward", "soon", "looking forward to it"],
+            "Fear": ["kill", "hate"],
+        })
+    
+    def test_whole_word_matching(self):
+        """Test that keywords do not match inside longer words."""
+        self.assertEqual(self.matcher.find("She made it"), set())
+        self.assertEqual(self.matcher.find("I'm MAD!"), {"mad"})
+    
+    def test_multi_word_phrases(self):
+        """Test that overlapping multi-word phrases are all found."""
+        found = self.matcher.find("Really looking   forward to it, see you soon")
+        self.assertEqual(found, {"looking forward", "looking forward to it", "soon"})
+    
+    def test_distinct_hits_per_label(self):
+        """Test that hits count distinct keywords and shared keywords count for each label."""
+        hits = self.matcher.count_hits("hate hate hate, so mad")
+        self.assertEqual(hits, {"Anger": 2, "Anticipation": 0, "Fear": 1})
+        self.assertEqual(self.matcher.hit_vector("kill"), [0, 0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
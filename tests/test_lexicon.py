@@ -0,0 +1,123 @@
+"""Tests for external emotion lexicons."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.lexicon import Lexicon, LexiconReloader, load_lexicon
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.utils.cache import ResultCache
+from tests.test_analyzer import make_test_nlp
+
+
+class TestLexicon(unittest.TestCase):
+    """Test cases for loading lexicon files."""
+    
+    def setUp(self):
+        """Create a temporary directory for lexicon files."""
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+    
+    def write(self, name, content):
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+    
+    def test_layers_over_defaults(self):
+        """Test that JSON and TSV files override the built-in tables."""
+        paths = [
+            self.write("base.json", json.dumps({"triggers": {"Joy": {"keywords": ["delighted"]}}})),
+            self.write("extra.json", json.dumps({"relationships": {"mentor": 0.8}})),
+            self.write("rows.tsv", "# kind\tname\tvalue\nkeyword\tAnger\tlivid\nsentiment\tAnger\t-0.9\n"),
+        ]
+        lexicon = load_lexicon(paths)
+        self.assertEqual(lexicon.emotions, Lexicon.default().emotions)
+        self.assertEqual(lexicon.triggers["Joy"]["keywords"], ["delighted"])
+        self.assertEqual(lexicon.triggers["Joy"]["sentiment"], 0.7)
+        self.assertEqual(lexicon.triggers["Anger"], {"sentiment": -0.9, "keywords": ["livid"]})
+        self.assertEqual(lexicon.relationships["mentor"], 0.8)
+        self.assertEqual(lexicon.relationships["friend"], 1.0)
+        self.assertEqual(lexicon.matcher.count_hits("I am delighted")["Joy"], 1)
+    
+    def test_yaml(self):
+        """Test that YAML files are read when PyYAML is installed."""
+        try:
+            import yaml  # noqa: F401
+        except ImportError:
+            self.skipTest("PyYAML is not installed")
+        lexicon = load_lexicon([self.write("lexicon.yml", "relationships:\n  mentor: 0.8\n")])
+        self.assertEqual(lexicon.relationships["mentor"], 0.8)
+    
+    def test_rejects_invalid_lexicons(self):
+        """Test that invalid files raise ValueError."""
+        with self.assertRaises(ValueError):
+            load_lexicon([self.write("bad.json", json.dumps({"emotions": ["Joy"]}))])
+        with self.assertRaises(ValueError):
+            load_lexicon([self.write("bad.tsv", "relationship\trival\t-3\n")])
+        with self.assertRaises(ValueError):
+            load_lexicon([self.write("lexicon.txt", "")])
+    
+    def test_compiled_cache(self):
+        """Test that unchanged files load from the compiled cache."""
+        path = self.write("lexicon.json", json.dumps({"relationships": {"mentor": 0.8}}))
+        cache_dir = os.path.join(self.tempdir.name, "cache")
+        first = load_lexicon([path], cache_dir=cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        second = load_lexicon([path], cache_dir=cache_dir)
+        self.assertEqual(second.source_hash, first.source_hash)
+        self.assertEqual(second.matcher.index, first.matcher.index)
+        
+        self.write("lexicon.json", json.dumps({"relationships": {"mentor": 0.6}}))
+        third = load_lexicon([path], cache_dir=cache_dir)
+        self.assertNotEqual(third.source_hash, first.source_hash)
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+    
+    def test_reloader_swaps_lexicon(self):
+        """Test that a running calculator picks up edited files."""
+        path = self.write("lexicon.json", json.dumps({"triggers": {"Joy": {"keywords": ["happy"]}}}))
+        calculator = EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()))
+        reloader = LexiconReloader([path], targets=[calculator.emotion_mapper, calculator.context_judge])
+        before = calculator.calculate_emotions(["what a wonderful day"], relationships="mentor")[0]
+        self.assertEqual(before.context.relationship_type, "neutral")
+        
+        self.write("lexicon.json", json.dumps({
+            "triggers": {"Joy": {"keywords": ["wonderful"]}},
+            "relationships": {"mentor": 0.8}
+        }))
+        self.assertTrue(reloader.reload())
+        after = calculator.calculate_emotions(["what a wonderful day"], relationships="mentor")[0]
+        self.assertEqual(after.context.relationship_type, "mentor")
+        self.assertGreater(after.emotions["Joy"], before.emotions["Joy"])
+        self.assertEqual(calculator.calculate_emotion("what a wonderful day", relationship="mentor"), after)
+        
+        # A broken file keeps the current lexicon in place
+        self.write("lexicon.json", "{not json")
+        self.assertFalse(reloader.reload())
+        self.assertIsNotNone(reloader.last_error)
+        self.assertIs(calculator.emotion_mapper.lexicon, reloader.lexicon)
+    
+    
+    def test_reload_invalidates_cached_results(self):
+        """Test that results cached before a reload or a registered relationship are scored again."""
+        path = self.write("lexicon.json", json.dumps({"triggers": {"Joy": {"keywords": ["happy"]}}}))
+        calculator = EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()), cache=ResultCache())
+        reloader = LexiconReloader([path], targets=[calculator.emotion_mapper, calculator.context_judge])
+        before = calculator.calculate_emotion("what a wonderful day", relationship="mentor")
+        self.assertEqual(calculator.calculate_emotions(["what a wonderful day"], relationships="mentor"), [before])
+        
+        self.write("lexicon.json", json.dumps({"triggers": {"Joy": {"keywords": ["wonderful"]}}}))
+        self.assertTrue(reloader.reload())
+        after = calculator.calculate_emotion("what a wonderful day", relationship="mentor")
+        self.assertGreater(after.emotions["Joy"], before.emotions["Joy"])
+        self.assertEqual(calculator.calculate_emotions(["what a wonderful day"], relationships="mentor"), [after])
+        
+        calculator.context_judge.register_relationship("mentor", 0.8)
+        registered = calculator.calculate_emotion("what a wonderful day", relationship="mentor")
+        self.assertEqual(registered.context.relationship_type, "mentor")
+        self.assertEqual(calculator.cache.hits["result"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
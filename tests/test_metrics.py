@@ -0,0 +1,99 @@
+"""Tests for pipeline metrics."""
+
+import unittest
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.utils.cache import ResultCache
+from emotion_calculator.utils.metrics import MetricsRegistry, StageTimer
+from tests.test_analyzer import make_test_nlp
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for the metrics registry."""
+    
+    def test_render_prometheus_text(self):
+        """Test counters, cumulative histogram buckets and gauges in the text format."""
+        metrics = MetricsRegistry()
+        metrics.describe_histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        metrics.observe("latency_seconds", 0.05, {"stage": "nlp"})
+        metrics.observe("latency_seconds", 0.5, {"stage": "nlp"})
+        metrics.observe("latency_seconds", 5.0, {"stage": "nlp"})
+        metrics.inc("requests", labels={"status": "200"})
+        metrics.inc("requests", labels={"status": "200"})
+        metrics.gauge("queue_depth", lambda: 3, "Waiting items")
+        metrics.gauge("broken", lambda: 1 / 0)
+        
+        lines = metrics.render().splitlines()
+        self.assertIn('emotion_requests_total{status="200"} 2', lines)
+        self.assertIn("# TYPE emotion_latency_seconds histogram", lines)
+        self.assertIn('emotion_latency_seconds_bucket{stage="nlp",le="0.1"} 1', lines)
+        self.assertIn('emotion_latency_seconds_bucket{stage="nlp",le="1"} 2', lines)
+        self.assertIn('emotion_latency_seconds_bucket{stage="nlp",le="+Inf"} 3', lines)
+        self.assertIn('emotion_latency_seconds_count{stage="nlp"} 3', lines)
+        self.assertIn("emotion_queue_depth 3", lines)
+        self.assertFalse(any(line.startswith("emotion_broken ") for line in lines))
+    
+    def test_label_values_are_escaped(self):
+        """Test that quotes in label values cannot break the format."""
+        metrics = MetricsRegistry()
+        metrics.inc("requests", labels={"endpoint": 'a"b'})
+        self.assertIn('emotion_requests_total{endpoint="a\\"b"} 1', metrics.render())
+    
+    def test_stage_timer(self):
+        """Test that each mark records one stage and a disabled timer does nothing."""
+        metrics = MetricsRegistry()
+        timer = StageTimer(metrics, "request_seconds", {"endpoint": "analyze"})
+        timer.mark("parse")
+        timer.mark("score")
+        self.assertEqual(metrics.histogram_count("request_seconds", {"endpoint": "analyze", "stage": "score"}), 1)
+        StageTimer(None, "request_seconds").mark("parse")
+
+
+class TestCalculatorMetrics(unittest.TestCase):
+    """Test cases for the calculator's timing hooks."""
+    
+    def setUp(self):
+        """Set up an instrumented calculator and a plain one."""
+        self.metrics = MetricsRegistry()
+        self.calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()),
+            cache=ResultCache(),
+            metrics=self.metrics
+        )
+        self.plain = EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()))
+    
+    def count(self, stage, mode="single"):
+        return self.metrics.histogram_count("stage_seconds", {"stage": stage, "mode": mode})
+    
+    def test_single_call_stages(self):
+        """Test that every stage of calculate_emotion is timed once."""
+        result = self.calculator.calculate_emotion("I'm so happy to see you", relationship="friend")
+        self.assertEqual(result, self.plain.calculate_emotion("I'm so happy to see you", relationship="friend"))
+        for stage in ("nlp", "sentiment", "features", "context", "mapping", "calculate"):
+            self.assertEqual(self.count(stage), 1, stage)
+        
+        # A cached result skips the pipeline but the call is still timed
+        self.calculator.calculate_emotion("I'm so happy to see you", relationship="friend")
+        self.assertEqual(self.count("nlp"), 1)
+        self.assertEqual(self.count("calculate"), 2)
+        self.assertIn('emotion_cache_hits_total{kind="result"} 1', self.metrics.render())
+    
+    def test_batch_stages(self):
+        """Test that batch calls record batch timings and sizes."""
+        texts = ["I'm going to kill you", "What a lovely day", "Fine"]
+        results = self.calculator.calculate_emotions(texts, relationships="friend")
+        self.assertEqual(results, self.plain.calculate_emotions(texts, relationships="friend"))
+        for stage in ("nlp", "context", "mapping", "calculate"):
+            self.assertEqual(self.count(stage, "batch"), 1, stage)
+        self.assertEqual(self.count("sentiment"), len(texts))
+        self.assertIn('emotion_batch_size_bucket{le="4"} 1', self.metrics.render())
+    
+    def test_disabled_by_default(self):
+        """Test that calculators without a registry record nothing."""
+        self.assertIsNone(self.plain.metrics)
+        self.assertIsNone(self.plain.semantic_analyzer.metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
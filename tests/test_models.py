@@ -0,0 +1,50 @@
+"""Tests for the compact result models."""
+
+import unittest
+
+import numpy as np
+import spacy
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+
+
+class TestEmotionResultBatch(unittest.TestCase):
+    """Test cases for the columnar result batch."""
+    
+    def setUp(self):
+        """Set up a calculator and a small batch of texts."""
+        self.calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=spacy.blank("en"))
+        )
+        self.texts = ["I am happy", "so sad and sorry", "wow, unexpected", ""]
+        self.relationships = ["friend", "enemy", None, "colleague"]
+    
+    def test_rows_match_regular_results(self):
+        """Test that materialized rows equal the list-based results."""
+        batch = self.calculator.calculate_emotions(
+            self.texts, relationships=self.relationships, columnar=True
+        )
+        expected = self.calculator.calculate_emotions(self.texts, relationships=self.relationships)
+        self.assertEqual(len(batch), len(expected))
+        self.assertEqual(batch.to_results(), expected)
+        self.assertEqual(batch.dominant_emotions(), [r.dominant_emotion for r in expected])
+        self.assertEqual(batch[-1].emotions, expected[-1].emotions)
+    
+    def test_views_do_not_copy(self):
+        """Test that row and NumPy views share the batch's memory."""
+        batch = self.calculator.calculate_emotions(self.texts, columnar=True)
+        array = batch.to_numpy()
+        self.assertEqual(array.shape, (4, len(batch.emotion_names)))
+        self.assertTrue(np.shares_memory(array, batch[1].scores))
+        self.assertTrue(np.shares_memory(array, batch.column("Joy")))
+    
+    def test_index_out_of_range(self):
+        """Test that indexing past the end raises IndexError."""
+        batch = self.calculator.calculate_emotions(self.texts, columnar=True)
+        with self.assertRaises(IndexError):
+            batch[len(self.texts)]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests for the shared NLP model registry."""
+
+import unittest
+from unittest import mock
+
+import spacy
+
+from emotion_calculator.core import nlp_registry
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+
+
+class TestNlpRegistry(unittest.TestCase):
+    """Test cases for the process-wide model registry."""
+    
+    def setUp(self):
+        """Patch spaCy loading with a blank pipeline and count the loads."""
+        nlp_registry.clear()
+        patcher = mock.patch(
+            "spacy.load", side_effect=lambda *args, **kwargs: spacy.blank("en")
+        )
+        self.load = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(nlp_registry.clear)
+    
+    def test_model_loaded_lazily(self):
+        """Test that building calculators does not load the model."""
+        calculator = EmotionCalculator()
+        self.load.assert_not_called()
+        calculator.calculate_emotion("Hello there")
+        self.assertEqual(self.load.call_count, 1)
+    
+    def test_instances_share_model(self):
+        """Test that analyzers with the same model and profile share one pipeline."""
+        first = SemanticAnalyzer()
+        second = SemanticAnalyzer()
+        self.assertIs(first.nlp, second.nlp)
+        self.assertEqual(self.load.call_count, 1)
+    
+    def test_profiles_loaded_separately(self):
+        """Test that each profile gets its own pipeline."""
+        self.assertIsNot(SemanticAnalyzer(profile="fast").nlp, SemanticAnalyzer().nlp)
+        self.assertEqual(self.load.call_count, 2)
+    
+    def test_preload_and_register(self):
+        """Test that preloaded and registered pipelines are reused."""
+        nlp_registry.preload(profiles=["fast"], freeze=False)
+        custom = spacy.blank("en")
+        nlp_registry.register(custom, profile="no_entities")
+        self.assertIs(SemanticAnalyzer(profile="no_entities").nlp, custom)
+        SemanticAnalyzer(profile="fast").nlp
+        self.assertEqual(self.load.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
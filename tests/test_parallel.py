@@ -0,0 +1,66 @@
+"""Tests for multi-process sharded scoring."""
+
+import functools
+import unittest
+
+import spacy
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.parallel import ParallelEmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+
+
+class TestParallelEmotionCalculator(unittest.TestCase):
+    """Test cases for the parallel executor."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Start a small worker pool using blank pipelines."""
+        cls.parallel = ParallelEmotionCalculator(
+            workers=2, 
+            chunk_size=3, 
+            nlp_factory=functools.partial(spacy.blank, "en"), 
+            max_pending=2
+        )
+        cls.serial = EmotionCalculator(semantic_analyzer=SemanticAnalyzer(nlp=spacy.blank("en")))
+        cls.texts = [f"message {index} is {word}" for index, word in enumerate(
+            ["happy", "sad", "mad", "great", "scary", "gross", "wow", "honest", "soon", "fine", "kill"]
+        )]
+        cls.relationships = ["friend", "enemy", None, "colleague"] * 2 + ["stranger"] * 3
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Shut the worker pool down."""
+        cls.parallel.close()
+    
+    def test_ordered_results_match_serial(self):
+        """Test that parallel results equal serial results in input order."""
+        results = self.parallel.calculate_emotions(self.texts, relationships=self.relationships)
+        expected = self.serial.calculate_emotions(self.texts, relationships=self.relationships)
+        self.assertEqual(results, expected)
+    
+    def test_unordered_results_cover_input(self):
+        """Test that as-completed results carry their input indices."""
+        pairs = list(self.parallel.imap(iter(self.texts), relationships="friend", ordered=False))
+        self.assertEqual(sorted(index for index, _ in pairs), list(range(len(self.texts))))
+        for index, result in pairs:
+            self.assertEqual(result.input_text, self.texts[index])
+    
+    def test_mismatched_lengths(self):
+        """Test that per-text inputs of another length raise instead of dropping messages."""
+        with self.assertRaises(ValueError):
+            self.parallel.calculate_emotions(self.texts, relationships=self.relationships[:-1])
+        with self.assertRaises(ValueError):
+            self.parallel.imap(self.texts, additional_context=[None] * (len(self.texts) + 1))
+        with self.assertRaises(ValueError):
+            list(self.parallel.imap(iter(self.texts), relationships=iter(self.relationships[:4])))
+        with self.assertRaises(ValueError):
+            list(self.parallel.imap(iter(self.texts[:4]), relationships=iter(self.relationships)))
+    
+    def test_empty_input(self):
+        """Test that empty input gives no results."""
+        self.assertEqual(self.parallel.calculate_emotions([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
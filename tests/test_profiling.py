@@ -0,0 +1,75 @@
+"""Tests for the pipeline profiler."""
+
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.utils.metrics import MetricsRegistry
+from emotion_calculator.utils.profiling import PipelineProfiler
+from tests.test_analyzer import make_test_nlp
+
+
+class TestPipelineProfiler(unittest.TestCase):
+    """Test cases for profiling calculator calls."""
+    
+    def setUp(self):
+        """Set up a calculator with the blank test pipeline and an output directory."""
+        self.metrics = MetricsRegistry()
+        self.calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()), 
+            metrics=self.metrics
+        )
+        self.calculator.calculate_emotion("Warm up")
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+    
+    def test_writes_profile_files(self):
+        """Test that a run writes cProfile stats, collapsed stacks and per-stage allocations."""
+        profiler = PipelineProfiler(self.output_dir, interval=0.0005)
+        with profiler.profile(self.calculator, "test") as run:
+            for _ in range(20):
+                self.calculator.calculate_emotion("I'm going to kill you", relationship="enemy")
+            self.calculator.calculate_emotions(["Hello there"] * 10)
+        
+        self.assertEqual(
+            [os.path.basename(path) for path in run.paths], 
+            ["test-0001.prof", "test-0001.folded", "test-0001.alloc.txt"]
+        )
+        functions = {name for _, _, name in pstats.Stats(run.paths[0]).stats}
+        self.assertIn("calculate_emotion", functions)
+        with open(run.paths[1], encoding="utf-8") as f:
+            for line in f:
+                stack, count = line.rsplit(" ", 1)
+                self.assertTrue(int(count) > 0 and stack)
+        for stage in ("nlp", "sentiment", "features", "context", "mapping", "calculate"):
+            self.assertIn(stage, run.stages)
+        self.assertEqual(run.stages["nlp"].calls, 21)  # 20 single calls and one batch
+        with open(run.paths[2], encoding="utf-8") as f:
+            self.assertIn("nlp: 21 calls", f.read())
+    
+    def test_restores_metrics(self):
+        """Test that the calculator's registry is restored and profiled stage timings are not recorded."""
+        before = self.metrics.histogram_count("stage_seconds", {"stage": "nlp", "mode": "single"})
+        with PipelineProfiler(self.output_dir).profile(self.calculator):
+            self.calculator.calculate_emotion("Hello")
+        self.assertIs(self.calculator.metrics, self.metrics)
+        self.assertIs(self.calculator.semantic_analyzer.metrics, self.metrics)
+        self.assertEqual(self.metrics.histogram_count("stage_seconds", {"stage": "nlp", "mode": "single"}), before)
+    
+    def test_one_run_at_a_time(self):
+        """Test that nested runs are skipped and sampling picks one call in N."""
+        profiler = PipelineProfiler(self.output_dir, allocations=False)
+        self.assertEqual([profiler.sample(3) for _ in range(6)], [False, False, True, False, False, True])
+        with profiler.profile(self.calculator) as outer:
+            self.assertFalse(profiler.sample(1))
+            with profiler.profile(self.calculator) as inner:
+                self.assertIsNone(inner)
+        self.assertEqual(len(outer.paths), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 """Tests for the semantic analysis module."""
 
 import unittest
+
+import spacy
+
 from emotion_calculator.core.semantic import SemanticAnalyzer
 
 
@@ -27,5 +30,33 @@ class TestSemanticAnalysis(unittest.TestCase):
         self.assertIn("kill", result.actions)
 
 
+
+class TestAnalyzerProfiles(unittest.TestCase):
+    """Test cases for analyzer pipeline profiles."""
+    
+    def setUp(self):
+        """Set up a blank pipeline with a rule-based entity recognizer."""
+        self.nlp = spacy.blank("en")
+        ruler = self.nlp.add_pipe("entity_ruler")
+        ruler.add_patterns([{"label": "PERSON", "pattern": "Alice"}])
+    
+    def test_unknown_profile(self):
+        """Test that unknown profiles are rejected."""
+        with self.assertRaises(ValueError):
+            SemanticAnalyzer(nlp=self.nlp, profile="tiny")
+    
+    def test_fast_profile_keeps_entities(self):
+        """Test that the fast profile still extracts entities."""
+        analyzer = SemanticAnalyzer(nlp=self.nlp, profile="fast")
+        result = analyzer.analyze("Alice is here.")
+        self.assertEqual(result.entities, [{"text": "Alice", "label": "PERSON"}])
+    
+    def test_no_entities_profile(self):
+        """Test that the no_entities profile skips entity extraction."""
+        analyzer = SemanticAnalyzer(nlp=self.nlp, profile="no_entities")
+        result = analyzer.analyze("Alice is here.")
+        self.assertEqual(result.entities, [])
+
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
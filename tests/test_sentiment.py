@@ -0,0 +1,68 @@
+"""Tests for the sentiment backends."""
+
+import unittest
+
+import spacy
+
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.core.sentiment import LexiconSentiment, SentimentBackend, TextBlobSentiment, get_backend
+
+
+class TestLexiconSentiment(unittest.TestCase):
+    """Test cases for the lexicon sentiment backend."""
+    
+    def setUp(self):
+        """Set up a blank pipeline and both backends."""
+        self.nlp = spacy.blank("en")
+        self.lexicon = LexiconSentiment()
+        self.textblob = TextBlobSentiment()
+    
+    def score(self, backend, text):
+        return backend.score(self.nlp(text), text)
+    
+    def test_matches_textblob(self):
+        """Test that the lexicon backend reproduces TextBlob's scores."""
+        texts = [
+            "This is good",
+            "This is not good",
+            "This is very very bad!",
+            "really not good",
+            "I don't like this terrible thing",
+            "That was a disgusting and revolting meal.",
+            "I'm going to kill you",
+            "",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                expected = self.score(self.textblob, text)
+                actual = self.score(self.lexicon, text)
+                self.assertAlmostEqual(actual[0], expected[0])
+                self.assertAlmostEqual(actual[1], expected[1])
+    
+    def test_custom_lexicon(self):
+        """Test negation and intensifiers with a user-supplied lexicon."""
+        backend = LexiconSentiment({"nice": (0.5, 0.8), "super": (0.0, 0.5, 2.0, True)})
+        self.assertEqual(self.score(backend, "nice"), (0.5, 0.8))
+        self.assertEqual(self.score(backend, "super nice"), (1.0, 1.0))
+        self.assertEqual(self.score(backend, "not nice"), (-0.25, 0.8))
+        self.assertEqual(self.score(backend, "plain words"), (0.0, 0.0))
+    
+    def test_analyzer_backend(self):
+        """Test that the analyzer uses the configured backend."""
+        analyzer = SemanticAnalyzer(nlp=self.nlp, sentiment="lexicon")
+        self.assertIsInstance(analyzer.sentiment_backend, LexiconSentiment)
+        self.assertAlmostEqual(analyzer.analyze("This is good").sentiment, 0.7)
+        with self.assertRaises(ValueError):
+            get_backend("vader")
+    
+    def test_backend_requires_score(self):
+        """Test that a backend without score cannot be instantiated."""
+        class Incomplete(SentimentBackend):
+            name = "incomplete"
+        
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Tests for per-session conversation context."""
+
+import time
+import unittest
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.context import ContextJudge
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.core.session import ConversationState, SessionContextStore
+from emotion_calculator.data.models import ContextResult, EmotionResult
+from tests.test_analyzer import make_test_nlp
+
+
+def make_result(joy=0, anger=0, trust=0, formality=0.5):
+    """Build an EmotionResult with the given percentages."""
+    return EmotionResult(
+        input_text="",
+        context=ContextResult(formality_level=formality),
+        emotions={"Joy": joy, "Anger": anger, "Trust": trust}
+    )
+
+
+class TestConversationState(unittest.TestCase):
+    """Test cases for the decayed conversation aggregates."""
+
+    def test_empty_state_is_neutral(self):
+        """Test that a fresh state has no influence."""
+        state = ConversationState()
+        self.assertEqual(state.valence, 0.0)
+        self.assertEqual(state.trust, 0.0)
+        self.assertEqual(state.formality, 0.5)
+
+    def test_recent_messages_weigh_more(self):
+        """Test that older messages decay."""
+        state = ConversationState(decay=0.5)
+        state.update(make_result(anger=100))
+        state.update(make_result(joy=100))
+        self.assertEqual(state.messages, 2)
+        self.assertAlmostEqual(state.valence, (1.0 - 0.5) / 1.5)
+
+    def test_round_trip(self):
+        """Test that a state survives to_dict/from_dict."""
+        state = ConversationState(decay=0.7)
+        state.update(make_result(joy=60, trust=20, formality=0.8))
+        restored = ConversationState.from_dict(state.to_dict())
+        self.assertEqual(restored.to_dict(), state.to_dict())
+
+
+class TestSessionContextStore(unittest.TestCase):
+    """Test cases for the session store."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the store stays within max_sessions."""
+        store = SessionContextStore(max_sessions=2)
+        store.get("a")
+        store.get("b")
+        store.get("a")
+        store.get("c")
+        self.assertEqual(len(store), 2)
+        self.assertIn("a", store)
+        self.assertNotIn("b", store)
+
+    def test_idle_sessions_are_dropped(self):
+        """Test that idle sessions start over."""
+        store = SessionContextStore(idle_timeout=0.01)
+        store.update("a", make_result(joy=100))
+        time.sleep(0.02)
+        self.assertEqual(store.get("a").messages, 0)
+
+    def test_snapshot_restore(self):
+        """Test that sessions can be restored from a snapshot."""
+        store = SessionContextStore()
+        store.update("a", make_result(joy=80, trust=10))
+        restored = SessionContextStore()
+        restored.restore(store.snapshot())
+        self.assertEqual(restored.snapshot(), store.snapshot())
+
+
+class TestSessionContext(unittest.TestCase):
+    """Test cases for history-aware context judgment."""
+
+    def test_history_shifts_context(self):
+        """Test that a friendly history raises trust and a hostile one lowers it."""
+        judge = ContextJudge()
+        base = judge.determine_context(relationship="colleague")
+        friendly = judge.determine_context(relationship="colleague", history=[make_result(joy=90)])
+        hostile = judge.determine_context(relationship="colleague", history=[make_result(anger=90)])
+        self.assertGreater(friendly.trust_level, base.trust_level)
+        self.assertLess(hostile.trust_level, base.trust_level)
+
+    def test_list_history_matches_state(self):
+        """Test that a list of results and an equivalent state give the same context."""
+        judge = ContextJudge()
+        history = [make_result(joy=70), make_result(anger=40, trust=20)]
+        state = ConversationState()
+        for result in history:
+            state.update(result)
+        self.assertEqual(
+            judge.determine_context(relationship="friend", history=history),
+            judge.determine_context(relationship="friend", history=state)
+        )
+
+    def test_calculator_tracks_sessions(self):
+        """Test that batched and single session scoring agree and keep sessions apart."""
+        texts = ["I'm so happy to see you today!", "I'm going to kill you", "Hello"]
+        session_ids = ["a", "a", "b"]
+
+        def make_calculator():
+            return EmotionCalculator(
+                semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()),
+                sessions=SessionContextStore()
+            )
+
+        single = make_calculator()
+        expected = [
+            single.calculate_emotion(text, relationship="friend", session_id=session_id)
+            for text, session_id in zip(texts, session_ids)
+        ]
+        batch = make_calculator().calculate_emotions(texts, relationships="friend", session_ids=session_ids)
+        self.assertEqual(batch, expected)
+        self.assertEqual(single.sessions.get("a").messages, 2)
+        self.assertEqual(single.sessions.get("b").messages, 1)
+
+    def test_failed_batch_leaves_sessions_unchanged(self):
+        """Test that a batch failing part way through does not update any session."""
+        calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=make_test_nlp()),
+            sessions=SessionContextStore()
+        )
+        score = calculator._score
+
+        def failing(text, *args, **kwargs):
+            if text == "explode":
+                raise RuntimeError("scoring failure")
+            return score(text, *args, **kwargs)
+
+        calculator._score = failing
+        with self.assertRaises(RuntimeError):
+            calculator.calculate_emotions(["Hello", "Hi again", "explode"], session_ids=["a", "a", "b"])
+        self.assertEqual(calculator.sessions.get("a").messages, 0)
+        self.assertEqual(calculator.sessions.get("b").messages, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""Tests for streaming batch scoring."""
+
+import io
+import json
+import unittest
+
+import spacy
+
+from emotion_calculator.core.analyzer import EmotionCalculator
+from emotion_calculator.core.semantic import SemanticAnalyzer
+from emotion_calculator.utils.streaming import RecordWriter, chunked, detect_format, read_records, score_stream
+
+
+class TestRecordIO(unittest.TestCase):
+    """Test cases for reading and writing records."""
+    
+    def test_detect_format(self):
+        """Test that formats are detected from file extensions."""
+        self.assertEqual(detect_format("logs.CSV"), "csv")
+        self.assertEqual(detect_format("logs.ndjson"), "jsonl")
+        self.assertEqual(detect_format("-", default="csv"), "csv")
+    
+    def test_read_csv(self):
+        """Test that CSV rows are parsed with relationship and context columns."""
+        stream = io.StringIO(
+            "text,relationship,context\n"
+            "hello,friend,formal_setting\n"
+            "\"bye, now\",,\"{\"\"previous_trust_breach\"\": true}\"\n"
+        )
+        records = list(read_records(stream, "csv"))
+        self.assertEqual(records[0]["context"], {"formal_setting": True})
+        self.assertEqual(records[1]["text"], "bye, now")
+        self.assertIsNone(records[1]["relationship"])
+        self.assertEqual(records[1]["context"], {"previous_trust_breach": True})
+    
+    def test_malformed_rows(self):
+        """Test that malformed rows fail with their line number, or are skipped and reported."""
+        lines = '{"text": "hello"}\n\n{"text": \n[1, 2]\n{"text": 5}\n{"text": "bye"}\n'
+        with self.assertRaisesRegex(ValueError, "^Line 3: "):
+            list(read_records(io.StringIO(lines), "jsonl"))
+        
+        errors = io.StringIO()
+        records = list(read_records(io.StringIO(lines), "jsonl", on_error="skip", error_stream=errors))
+        self.assertEqual([record["text"] for record in records], ["hello", "bye"])
+        self.assertEqual(
+            [line.split(":")[0] for line in errors.getvalue().splitlines()], 
+            ["Skipping line 3", "Skipping line 4", "Skipping line 5"]
+        )
+        
+        stream = io.StringIO('text,context\nok,\nbad,"{oops"\n')
+        with self.assertRaisesRegex(ValueError, "^Line 3: "):
+            list(read_records(stream, "csv"))
+    
+    def test_missing_text_and_bad_relationship(self):
+        """Test that rows without text or with a non-string relationship are malformed, not scored."""
+        lines = '{"relationship": "friend"}\n{"text": null}\n{"text": "hi there", "relationship": 5}\n{"text": "ok"}\n'
+        for line in lines.splitlines()[:3]:
+            with self.assertRaisesRegex(ValueError, "^Line 1: "):
+                list(read_records(io.StringIO(line + "\n"), "jsonl"))
+        errors = io.StringIO()
+        records = list(read_records(io.StringIO(lines), "jsonl", on_error="skip", error_stream=errors))
+        self.assertEqual([record["text"] for record in records], ["ok"])
+        self.assertEqual(len(errors.getvalue().splitlines()), 3)
+        
+        stream = io.StringIO("relationship\nfriend\n")
+        with self.assertRaisesRegex(ValueError, "^Line 2: missing text"):
+            list(read_records(stream, "csv"))
+    
+    def test_chunked(self):
+        """Test that chunks have at most the requested size."""
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+
+class TestScoreStream(unittest.TestCase):
+    """Test cases for chunked stream scoring."""
+    
+    def setUp(self):
+        """Set up a calculator backed by a blank pipeline."""
+        self.calculator = EmotionCalculator(
+            semantic_analyzer=SemanticAnalyzer(nlp=spacy.blank("en"))
+        )
+    
+    def test_results_match_single_calls(self):
+        """Test that streamed output matches calculate_emotion per record."""
+        lines = [
+            {"text": "I am happy", "relationship": "friend", "id": 1},
+            {"text": "so sad", "relationship": "enemy", "context": {"formal_setting": True}},
+            {"text": "wow"},
+        ]
+        stream = io.StringIO("".join(json.dumps(line) + "\n" for line in lines))
+        output = io.StringIO()
+        
+        count = score_stream(
+            self.calculator, read_records(stream, "jsonl"), RecordWriter(output, "jsonl"),
+            chunk_size=2, progress=None
+        )
+        
+        self.assertEqual(count, 3)
+        scored = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(scored[0]["id"], 1)
+        for line, row in zip(lines, scored):
+            expected = self.calculator.calculate_emotion(
+                line["text"], relationship=line.get("relationship"),
+                additional_context=line.get("context")
+            )
+            self.assertEqual(row["emotions"], expected.emotions)
+            self.assertEqual(row["dominant_emotion"], expected.dominant_emotion)
+    
+    def test_reads_one_chunk_at_a_time(self):
+        """Test that input is consumed lazily, one chunk at a time."""
+        consumed = []
+        consumed_at_write = []
+        
+        def records():
+            for index in range(10):
+                consumed.append(index)
+                yield {"text": f"message {index}", "relationship": None, "context": None}
+        
+        writer = RecordWriter(io.StringIO(), "csv")
+        original_write = writer.write
+        
+        def write(record, emotions, dominant_emotion):
+            consumed_at_write.append(len(consumed))
+            original_write(record, emotions, dominant_emotion)
+        
+        writer.write = write
+        score_stream(self.calculator, records(), writer, chunk_size=3, progress=None)
+        self.assertEqual(consumed_at_write, [3, 3, 3, 6, 6, 6, 9, 9, 9, 10])
+        self.assertEqual(len(writer.stream.getvalue().splitlines()), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
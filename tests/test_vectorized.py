@@ -0,0 +1,57 @@
+"""Tests for the vectorized emotion mapper."""
+
+import random
+import unittest
+
+import numpy as np
+
+from emotion_calculator.core.emotions import EmotionMapper
+from emotion_calculator.core.vectorized import VectorizedEmotionMapper
+from emotion_calculator.data.models import ContextResult, SemanticAnalysisResult
+
+
+class TestVectorizedEmotionMapper(unittest.TestCase):
+    """Test cases for the vectorized emotion mapper."""
+    
+    def setUp(self):
+        """Set up scalar and vectorized mappers and a random batch."""
+        self.mapper = EmotionMapper()
+        self.vectorized = VectorizedEmotionMapper(self.mapper)
+        
+        rng = random.Random(7)
+        words = ["happy", "sad", "mad", "made", "kill", "wow", "trust", "looking forward", "soon", "hello"]
+        self.semantics = []
+        self.contexts = []
+        for _ in range(200):
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+            self.semantics.append(SemanticAnalysisResult(
+                sentiment=rng.choice([rng.uniform(-1, 1), -1.0, 0.0, 0.5, 1.0]),
+                subjectivity=rng.random(),
+                entities=[],
+                actions=rng.choice([[], ["kill"], ["hurt", "go"], ["see"]]),
+                keywords=[],
+                full_text=text
+            ))
+            self.contexts.append(ContextResult(relationship_value=rng.choice([-1.0, -0.5, 0.0, 0.5, 1.0])))
+    
+    def test_matches_scalar_path_exactly(self):
+        """Test that every row equals the scalar mapping bit for bit."""
+        matrix = self.vectorized.map_batch(self.semantics, self.contexts)
+        self.assertEqual(matrix.shape, (len(self.semantics), len(self.mapper.emotions)))
+        for row, (semantic, context) in enumerate(zip(self.semantics, self.contexts)):
+            expected = self.mapper.map_emotions(semantic, context)
+            self.assertEqual(self.vectorized.distribution(matrix, row), expected)
+    
+    def test_rows_are_normalized(self):
+        """Test that every row sums to one."""
+        matrix = self.vectorized.map_batch(self.semantics, self.contexts)
+        np.testing.assert_allclose(matrix.sum(axis=1), 1.0)
+    
+    def test_empty_batch(self):
+        """Test that an empty batch gives an empty matrix."""
+        matrix = self.vectorized.map_batch([], [])
+        self.assertEqual(matrix.shape, (0, len(self.mapper.emotions)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,297 @@
+"""Tests for the Flask routes."""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+# The app opens its feedback database on import
+os.environ.setdefault("EMOTION_FEEDBACK_DB", os.path.join(tempfile.mkdtemp(), "feedback.db"))
+
+import web_app  # noqa: E402
+from emotion_calculator.core.admission import AdmissionController  # noqa: E402
+from emotion_calculator.core.batching import MicroBatcher  # noqa: E402
+from tests.test_analyzer import make_test_nlp  # noqa: E402
+
+web_app.calculator.semantic_analyzer.nlp = make_test_nlp()
+
+
+@contextmanager
+def failing_pipeline(word):
+    """Make the semantic analysis of any text containing a word, or of a batch holding one, raise."""
+    analyzer = web_app.calculator.semantic_analyzer
+    analyze, analyze_batch = analyzer.analyze, analyzer.analyze_batch
+    
+    def failing(text):
+        if word in text:
+            raise RuntimeError("pipeline failure")
+        return analyze(text)
+    
+    def failing_batch(texts, *args, **kwargs):
+        if any(word in text for text in texts):
+            raise RuntimeError("pipeline failure")
+        return analyze_batch(texts, *args, **kwargs)
+    
+    with mock.patch.object(analyzer, "analyze", failing), \
+            mock.patch.object(analyzer, "analyze_batch", failing_batch):
+        yield
+
+
+class WebAppTestCase(unittest.TestCase):
+    """Base class giving each test a client of the app."""
+    
+    def setUp(self):
+        """Set up a test client."""
+        self.client = web_app.app.test_client()
+
+
+class TestAnalyzeRoute(WebAppTestCase):
+    """Test cases for /analyze."""
+    
+    def test_analyze(self):
+        """Test that a valid request is scored."""
+        response = self.client.post("/analyze", json={"text": "I am so happy today", "relationship": "friend"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("emotions", response.get_json())
+    
+    def test_rejects_bad_types(self):
+        """Test that fields of the wrong type get a 400 instead of reaching the pipeline."""
+        for body in (
+            ["not", "an", "object"],
+            {"text": 5},
+            {"text": "Hello", "relationship": ["friend"]},
+            {"text": "Hello", "sessionId": {"id": 1}}
+        ):
+            response = self.client.post("/analyze", json=body)
+            self.assertEqual(response.status_code, 400, body)
+        response = self.client.post("/analyze", data="not json", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+    
+    def test_bad_item_does_not_fail_its_batch(self):
+        """Test that a request failing in the pipeline does not fail the request it was batched with."""
+        batch_sizes = []
+        
+        def score_batch(items):
+            batch_sizes.append(len(items))
+            return web_app.score_batch(items)
+        
+        batcher = MicroBatcher(score_batch, max_batch_size=2, max_wait=0.5)
+        self.addCleanup(batcher.close)
+        responses = {}
+        
+        def post(text):
+            client = web_app.app.test_client()
+            responses[text] = client.post("/analyze", json={"text": text})
+        
+        with mock.patch.object(web_app, "analyze_batcher", batcher), failing_pipeline("explode"):
+            threads = [threading.Thread(target=post, args=(text,))
+                       for text in ("This will explode", "What a lovely morning")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(batch_sizes, [2])
+        self.assertEqual(responses["What a lovely morning"].status_code, 200)
+        self.assertEqual(responses["This will explode"].status_code, 500)
+    
+    def test_failed_batch_updates_sessions_once(self):
+        """Test that the per-item fallback after a failed batch applies each message to its session once."""
+        calculator = web_app.calculator
+        score = calculator._score
+        
+        def failing(text, *args, **kwargs):
+            if "explode" in text:
+                raise RuntimeError("scoring failure")
+            return score(text, *args, **kwargs)
+        
+        items = [
+            ("Good morning", "friend", "fallback-a", None, False), 
+            ("How are you?", "friend", "fallback-a", None, False), 
+            ("This will explode", "friend", "fallback-b", None, False), 
+            ("See you soon", "friend", "fallback-c", None, False)
+        ]
+        with mock.patch.object(calculator, "_score", failing):
+            results = web_app.score_batch(items)
+        self.assertIsInstance(results[2], RuntimeError)
+        self.assertEqual([web_app.sessions.get(session_id).messages for session_id in ("fallback-a", "fallback-c")], [2, 1])
+
+
+class TestDeltaRoute(WebAppTestCase):
+    """Test cases for /analyze/delta."""
+    
+    def test_edits(self):
+        """Test that edits against the current version only re-analyze the changed sentence."""
+        response = self.client.post("/analyze/delta", json={"sessionId": "edits", "text": "Hello there. I am happy."})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["version"], 1)
+        response = self.client.post("/analyze/delta", json={
+            "sessionId": "edits", "version": 1, "edits": [{"start": 24, "end": 24, "text": " You are kind."}]
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual((data["version"], data["analyzed"], data["reused"]), (2, 1, 2))
+    
+    def test_stale_version_conflicts(self):
+        """Test that edits based on an old version get a 409 and the full text can be resent."""
+        self.client.post("/analyze/delta", json={"sessionId": "stale", "text": "Hello there."})
+        self.client.post("/analyze/delta", json={"sessionId": "stale", "text": "Hello there. Bye."})
+        response = self.client.post("/analyze/delta", json={
+            "sessionId": "stale", "version": 1, "edits": [{"start": 0, "end": 5, "text": "Hi"}]
+        })
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json()["version"], 2)
+        response = self.client.post("/analyze/delta", json={"sessionId": "stale", "text": "Hi there. Bye."})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["version"], 3)
+    
+    def test_out_of_range_edit_conflicts(self):
+        """Test that an edit outside the current text gets a 409."""
+        self.client.post("/analyze/delta", json={"sessionId": "range", "text": "Hello."})
+        response = self.client.post("/analyze/delta", json={
+            "sessionId": "range", "version": 1, "edits": [{"start": 4, "end": 40, "text": ""}]
+        })
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json()["version"], 1)
+    
+    def test_invalid_requests(self):
+        """Test that requests without a session or with malformed edits get a 400."""
+        response = self.client.post("/analyze/delta", json={"text": "Hello."})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post("/analyze/delta", json={
+            "sessionId": "invalid", "version": 0, "edits": [{"end": 1, "text": "x"}]
+        })
+        self.assertEqual(response.status_code, 400)
+    
+    def test_rejects_bad_types(self):
+        """Test that fields of the wrong type get a 400 instead of reaching the pipeline."""
+        for body in (
+            ["not", "an", "object"],
+            {"sessionId": 5, "text": "Hello."},
+            {"sessionId": "types", "text": 5},
+            {"sessionId": "types", "text": "Hello.", "relationship": 5},
+            {"sessionId": "types", "version": "1", "edits": []},
+            {"sessionId": "types", "version": 1, "edits": {"start": 0}},
+            {"sessionId": "types", "version": 1, "edits": ["Hello"]},
+            {"sessionId": "types", "version": 1, "edits": [{"start": "0", "end": 1, "text": "x"}]},
+            {"sessionId": "types", "version": 1, "edits": [{"start": 0, "end": 1, "text": 5}]}
+        ):
+            response = self.client.post("/analyze/delta", json=body)
+            self.assertEqual(response.status_code, 400, body)
+
+
+class TestBulkRoute(WebAppTestCase):
+    """Test cases for /analyze/batch."""
+    
+    def post_bulk(self, **kwargs):
+        """Post to /analyze/batch and return the status and the parsed NDJSON lines."""
+        response = self.client.post("/analyze/batch", **kwargs)
+        body = response.get_data(as_text=True)
+        if response.status_code != 200:
+            return response.status_code, body
+        return response.status_code, [json.loads(line) for line in body.splitlines()]
+    
+    def test_json_array(self):
+        """Test that a JSON array, or an object with items, is scored in order."""
+        items = [{"text": "I am so happy", "relationship": "friend"}, {"text": "This is awful", "sessionId": "bulk"}]
+        for body in (items, {"items": items}):
+            status, lines = self.post_bulk(json=body)
+            self.assertEqual(status, 200)
+            self.assertEqual([line["index"] for line in lines], [0, 1])
+            self.assertEqual(lines[1]["sessionId"], "bulk")
+            self.assertEqual(lines[0]["context"]["relationship"], "friend")
+        self.assertEqual(self.post_bulk(json={"text": "not a list"})[0], 400)
+        self.assertEqual(self.post_bulk(json=[]), (200, []))
+    
+    def test_ndjson(self):
+        """Test that NDJSON bodies are scored line by line, skipping blank lines."""
+        body = '{"text": "I am so happy"}\n\n{"text": "This is awful"}\n'
+        status, lines = self.post_bulk(data=body, content_type="application/x-ndjson")
+        self.assertEqual(status, 200)
+        self.assertEqual([line["index"] for line in lines], [0, 1])
+        self.assertTrue(all("emotions" in line for line in lines))
+    
+    def test_per_item_errors(self):
+        """Test that malformed lines and invalid items get error objects without failing the rest."""
+        body = "\n".join([
+            '{"text": "I am so happy"}', 
+            '{"text": ', 
+            '["not", "an", "object"]', 
+            '{"text": ""}', 
+            '{"text": "Hello", "relationship": 3}', 
+            '{"text": "This is awful"}'
+        ])
+        status, lines = self.post_bulk(data=body, content_type="application/x-ndjson")
+        self.assertEqual(status, 200)
+        by_index = {line["index"]: line for line in lines}
+        self.assertEqual(sorted(by_index), list(range(6)))
+        self.assertIn("emotions", by_index[0])
+        self.assertTrue(by_index[1]["error"].startswith("Invalid JSON"))
+        for index in (2, 3, 4):
+            self.assertIn("error", by_index[index])
+            self.assertNotIn("emotions", by_index[index])
+        self.assertIn("emotions", by_index[5])
+    
+    def test_bad_item_does_not_fail_its_chunk(self):
+        """Test that an item failing in the pipeline is reported alone while its chunk is scored."""
+        items = [{"text": "Good morning"}, {"text": "This will explode"}, {"text": "See you soon"}]
+        with failing_pipeline("explode"):
+            status, lines = self.post_bulk(json=items)
+        self.assertEqual(status, 200)
+        self.assertEqual([line["index"] for line in lines], [0, 1, 2])
+        self.assertIn("emotions", lines[0])
+        self.assertEqual(lines[1]["error"], "pipeline failure")
+        self.assertIn("emotions", lines[2])
+
+
+class TestAdmission(WebAppTestCase):
+    """Test cases for input limits and admission control on every analysis route."""
+    
+    def test_delta_limits(self):
+        """Test that /analyze/delta rejects long drafts and sessions over their limit."""
+        too_long = "x" * (web_app.MAX_TEXT_CHARS + 1)
+        response = self.client.post("/analyze/delta", json={"sessionId": "limits", "text": too_long})
+        self.assertEqual(response.status_code, 413)
+        
+        controller = AdmissionController(max_in_flight=10, max_per_key=1, retry_after=2.0)
+        with mock.patch.object(web_app, "admission", controller), controller.admit("limits"):
+            response = self.client.post("/analyze/delta", json={"sessionId": "limits", "text": "Hello."})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "2")
+        self.assertEqual(controller.in_flight, 0)
+    
+    def test_batch_limits(self):
+        """Test that /analyze/batch is rejected at capacity and reports long items one by one."""
+        controller = AdmissionController(max_in_flight=0)
+        with mock.patch.object(web_app, "admission", controller):
+            response = self.client.post("/analyze/batch", json=[{"text": "Hello"}])
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+        
+        controller = AdmissionController(max_in_flight=1)
+        too_long = "x" * (web_app.MAX_TEXT_CHARS + 1)
+        with mock.patch.object(web_app, "admission", controller):
+            response = self.client.post("/analyze/batch", json=[{"text": too_long}, {"text": "Hello"}])
+            lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+            response.close()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("error", lines[0])
+        self.assertIn("emotions", lines[1])
+        self.assertEqual(controller.in_flight, 0)
+    
+    def test_delta_and_batch_deadlines(self):
+        """Test that /analyze/delta and /analyze/batch degrade texts that miss their deadline."""
+        with mock.patch.object(web_app, "DEADLINE_MS", -1000.0):
+            response = self.client.post("/analyze/delta", json={"sessionId": "late", "text": "I will hurt you."})
+            self.assertTrue(response.get_json()["degraded"])
+            response = self.client.post("/analyze/batch", json=[{"text": "I will hurt them"}])
+            lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertTrue(lines[0]["degraded"])
+        response = self.client.post("/analyze/delta", json={"sessionId": "late", "text": "I will hurt you."})
+        self.assertFalse(response.get_json()["degraded"])
+
+
+if __name__ == "__main__":
+    unittest.main()
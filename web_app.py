@@ -1,17 +1,25 @@
 """Web interface for the YouthMind Emotion Analysis."""
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 import logging
 import sys
 import os
 import json
+import math
+import time
+import itertools
+from concurrent.futures import TimeoutError as FutureTimeout
 from datetime import datetime
 
-# Add modules directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from modules.semantic_analysis import SemanticAnalyzer
-from modules.emotion_mapping import EmotionMapper
+from emotion_calculator import EmotionCalculator
+from emotion_calculator.core.admission import AdmissionController, InputTooLarge, Overloaded
+from emotion_calculator.core.batching import MicroBatcher
+from emotion_calculator.core.incremental import DeltaConflict, SentenceCache
+from emotion_calculator.core.lexicon import LexiconReloader
+from emotion_calculator.core.session import SessionContextStore
+from emotion_calculator.data.feedback_store import FeedbackStore
+from emotion_calculator.utils.metrics import MetricsRegistry, StageTimer
+from emotion_calculator.utils.profiling import PipelineProfiler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -19,8 +27,119 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger('youthmind_app')
 
 # Initialize components
-semantic_analyzer = SemanticAnalyzer()
-emotion_mapper = EmotionMapper()
+# Conversation context is kept per sessionId; idle sessions are dropped after
+# EMOTION_SESSION_IDLE_S seconds and the least recently used beyond EMOTION_MAX_SESSIONS.
+MAX_SESSIONS = int(os.environ.get('EMOTION_MAX_SESSIONS', '10000'))
+SESSION_IDLE_S = float(os.environ.get('EMOTION_SESSION_IDLE_S', '3600'))
+sessions = SessionContextStore(max_sessions=MAX_SESSIONS, idle_timeout=SESSION_IDLE_S or None)
+
+# Optional Prometheus metrics on /metrics (EMOTION_METRICS=1): per-stage latency of
+# the pipeline and of request handling, cache hits, batch sizes and queue depth.
+# Nothing is timed when disabled.
+metrics = None
+if os.environ.get('EMOTION_METRICS', '').lower() in ('1', 'true', 'yes'):
+    metrics = MetricsRegistry()
+    metrics.describe_histogram('request_seconds', 'Time spent per request handling stage')
+    metrics.describe_counter('requests', 'Handled requests by endpoint and status')
+    metrics.gauge('sessions', lambda: len(sessions), 'Conversation sessions held in memory')
+
+# Drafts edited through /analyze/delta keep their sentence analyses per sessionId,
+# with the same limits as the conversation sessions.
+sentence_cache = SentenceCache(max_sessions=MAX_SESSIONS, idle_timeout=SESSION_IDLE_S or None)
+
+# Admission control for /analyze, /analyze/delta and /analyze/batch: requests beyond
+# EMOTION_MAX_IN_FLIGHT overall (503) or EMOTION_MAX_SESSION_IN_FLIGHT per sessionId
+# (429) are rejected with Retry-After instead of queueing, and texts longer than
+# EMOTION_MAX_TEXT_CHARS get a 413 (a per-item error in bulk requests).
+# Each request (each chunk of a bulk request) has EMOTION_DEADLINE_MS to be scored;
+# when the full pipeline is not expected to make it, the action rules are skipped
+# and the response is flagged "degraded". Set any of these to 0 to disable it.
+MAX_TEXT_CHARS = int(os.environ.get('EMOTION_MAX_TEXT_CHARS', '20000'))
+DEADLINE_MS = float(os.environ.get('EMOTION_DEADLINE_MS', '1000'))
+admission = AdmissionController(
+    max_in_flight=int(os.environ.get('EMOTION_MAX_IN_FLIGHT', '256')) or sys.maxsize,
+    max_per_key=int(os.environ.get('EMOTION_MAX_SESSION_IN_FLIGHT', '4')) or None,
+    retry_after=float(os.environ.get('EMOTION_RETRY_AFTER_S', '1'))
+)
+if metrics is not None:
+    metrics.gauge('in_flight', lambda: admission.in_flight, 'Requests being served by /analyze')
+    metrics.counter_func('rejected', lambda: admission.rejected, 'Requests rejected by admission control')
+
+calculator = EmotionCalculator(sessions=sessions, metrics=metrics, sentence_cache=sentence_cache,
+                               max_text_length=MAX_TEXT_CHARS or None)
+
+# Optional lexicon files (JSON/YAML/TSV, separated by os.pathsep) layered over the
+# built-in emotion triggers and relationships. Edits are picked up every
+# EMOTION_LEXICON_RELOAD_S seconds without a restart; compiled lexicons are cached
+# in EMOTION_LEXICON_CACHE so later startups skip compilation.
+LEXICON_PATHS = [path for path in os.environ.get('EMOTION_LEXICON', '').split(os.pathsep) if path]
+lexicon_reloader = None
+if LEXICON_PATHS:
+    lexicon_reloader = LexiconReloader(
+        LEXICON_PATHS,
+        targets=[calculator.emotion_mapper, calculator.context_judge],
+        cache_dir=os.environ.get('EMOTION_LEXICON_CACHE',
+                                 os.path.join(os.path.dirname(__file__), '.lexicon_cache')),
+        interval=float(os.environ.get('EMOTION_LEXICON_RELOAD_S', '5')),
+        on_error=lambda e: logger.error("Keeping the current lexicon, reload failed: %s", e)
+    )
+    lexicon_reloader.start()
+    logger.info("Loaded lexicon %r", lexicon_reloader.lexicon)
+
+# Request coalescing: concurrent /analyze calls are gathered for up to
+# BATCH_MAX_WAIT_MS and scored together in one batched pipeline call.
+# Set EMOTION_BATCH_MAX_SIZE=1 to score every request on its own thread.
+BATCH_MAX_SIZE = int(os.environ.get('EMOTION_BATCH_MAX_SIZE', '32'))
+BATCH_MAX_WAIT_MS = float(os.environ.get('EMOTION_BATCH_MAX_WAIT_MS', '5'))
+# With more than EMOTION_DEGRADE_QUEUE_DEPTH requests waiting to be batched, new
+# requests skip the action rules so the queue drains instead of growing.
+DEGRADE_QUEUE_DEPTH = int(os.environ.get('EMOTION_DEGRADE_QUEUE_DEPTH', str(BATCH_MAX_SIZE * 4)))
+
+def score_batch(items):
+    """Score a batch of (text, relationship, session_id, deadline, degrade) items in one pipeline call."""
+    texts = [item[0] for item in items]
+    relationships = [item[1] for item in items]
+    session_ids = [item[2] for item in items]
+    try:
+        # Each item keeps its own deadline and degrade flag; only late or degraded items skip the full pipeline
+        return calculator.calculate_emotions(texts, relationships=relationships,
+                                             session_ids=session_ids,
+                                             deadline=[item[3] for item in items],
+                                             degrade=[item[4] for item in items])
+    except Exception:
+        # Score items one at a time so one bad request does not fail the rest of its batch;
+        # the batcher fails only the futures whose result is an exception
+        results = []
+        for text, relationship, session_id, deadline, degrade in items:
+            try:
+                results.append(calculator.calculate_emotion(text, relationship=relationship,
+                                                            session_id=session_id,
+                                                            deadline=deadline, degrade=degrade))
+            except Exception as e:
+                results.append(e)
+        return results
+
+# Items scored per pipeline call by the bulk /analyze/batch endpoint
+BULK_CHUNK_SIZE = int(os.environ.get('EMOTION_BULK_CHUNK_SIZE', '64'))
+
+analyze_batcher = None
+if BATCH_MAX_SIZE > 1:
+    analyze_batcher = MicroBatcher(score_batch,
+                                   max_batch_size=BATCH_MAX_SIZE,
+                                   max_wait=BATCH_MAX_WAIT_MS / 1000.0,
+                                   name='analyze-batcher')
+    if metrics is not None:
+        metrics.gauge('batcher_queue_depth', lambda: analyze_batcher.queue_depth,
+                      'Requests waiting to be coalesced into a batch')
+
+# Optional profiling of 1 in EMOTION_PROFILE_EVERY /analyze requests: cProfile stats,
+# flame-graph stacks and per-stage allocations are written to EMOTION_PROFILE_DIR.
+# Profiled requests are scored on their own thread, without the batcher or deadline.
+PROFILE_EVERY = int(os.environ.get('EMOTION_PROFILE_EVERY', '0'))
+profiler = None
+if PROFILE_EVERY > 0:
+    profiler = PipelineProfiler(os.environ.get('EMOTION_PROFILE_DIR',
+                                               os.path.join(os.path.dirname(__file__), 'profiles')))
 
 # AI Models used in this application
 AI_MODELS = {
@@ -32,6 +151,15 @@ AI_MODELS = {
 # Feedback data storage location
 FEEDBACK_DIR = os.path.join(os.path.dirname(__file__), 'feedback_data')
 os.makedirs(FEEDBACK_DIR, exist_ok=True)
+FEEDBACK_DB = os.environ.get('EMOTION_FEEDBACK_DB', os.path.join(FEEDBACK_DIR, 'feedback.db'))
+FEEDBACK_PAGE_SIZE = 50
+
+# Feedback goes to an append-only SQLite log; legacy per-submission JSON
+# files in FEEDBACK_DIR are imported once on first start.
+feedback_store = FeedbackStore(FEEDBACK_DB)
+migrated = feedback_store.migrate_json_dir(FEEDBACK_DIR)
+if migrated:
+    logger.info(f"Imported {migrated} legacy feedback files into {FEEDBACK_DB}")
 
 # Convert sentiment value to a readable label
 def get_sentiment_label(sentiment_value):
@@ -47,6 +175,41 @@ def get_sentiment_label(sentiment_value):
     else:
         return "Neutral"
 
+def build_context(relationship, context=None):
+    """Describe the relationship context shown alongside an analysis."""
+    described = {
+        'relationship': relationship,
+        'trust_level': 'High' if relationship in ['friend', 'family'] else 'Medium' if relationship == 'colleague' else 'Low',
+        'formality': 'Formal' if relationship in ['colleague', 'stranger'] else 'Casual'
+    }
+    if context is not None:
+        # Judged values, including the shift from the session's conversation so far
+        described['trust_score'] = round(context.trust_level, 3)
+        described['formality_score'] = round(context.formality_level, 3)
+    return described
+
+def format_analysis(result, relationship):
+    """Build the JSON response body for one EmotionResult."""
+    sentiment_value = result.sentiment
+    sentiment_label = get_sentiment_label(sentiment_value)
+    
+    # Prepare response with consistent format for sentiment
+    response = {
+        'emotions': result.emotions,
+        'dominant_emotion': result.dominant_emotion,
+        'sentiment': {
+            'score': sentiment_value,
+            'label': sentiment_label
+        },
+        'context': build_context(relationship, result.context),
+        'degraded': result.degraded,
+    }
+    
+    # For backward compatibility
+    response['sentiment_value'] = sentiment_value
+    response['sentiment_label'] = sentiment_label
+    return response
+
 app = Flask(__name__, 
            static_url_path='', 
            static_folder='static')
@@ -56,61 +219,293 @@ def index():
     """Render the main page."""
     return render_template('index.html', ai_models=AI_MODELS)
 
+def validate_item(item):
+    """Return an error message if a request body or bulk item is not a usable analysis request, or None."""
+    if not isinstance(item, dict):
+        return 'Item must be an object'
+    if not item.get('text') or not isinstance(item.get('text'), str):
+        return 'No text provided'
+    if not isinstance(item.get('relationship', 'stranger'), str):
+        return 'relationship must be a string'
+    if not isinstance(item.get('sessionId', ''), (str, type(None))):
+        return 'sessionId must be a string'
+    return None
+
+def validate_delta(data):
+    """Return an error message if a request body is not a usable /analyze/delta request, or None."""
+    if not isinstance(data, dict) or not data.get('sessionId'):
+        return 'No sessionId provided'
+    if not isinstance(data['sessionId'], str):
+        return 'sessionId must be a string'
+    if not isinstance(data.get('relationship', 'stranger'), str):
+        return 'relationship must be a string'
+    if not isinstance(data.get('text'), (str, type(None))):
+        return 'text must be a string'
+    if data.get('text') is not None:
+        return None
+    version = data.get('version')
+    if version is not None and (not isinstance(version, int) or isinstance(version, bool)):
+        return 'version must be an integer'
+    edits = data.get('edits') or []
+    if not isinstance(edits, list):
+        return 'edits must be a list'
+    for edit in edits:
+        if not isinstance(edit, dict):
+            return 'Each edit must be an object'
+        for field in ('start', 'end'):
+            if not isinstance(edit.get(field), int) or isinstance(edit.get(field), bool):
+                return f'Edit {field} must be an integer'
+        if not isinstance(edit.get('text', ''), str):
+            return 'Edit text must be a string'
+    return None
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """Analyze text and return emotion distribution."""
+    timer = StageTimer(metrics, 'request_seconds', {'endpoint': 'analyze'})
+    deadline = time.monotonic() + DEADLINE_MS / 1000.0 if DEADLINE_MS else None
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        error = validate_item(data)
+        if error is not None:
+            count_request('analyze', 400)
+            return jsonify({'error': error}), 400
         
-        if not data or not data.get('text'):
-            return jsonify({'error': 'No text provided'}), 400
-            
         text = data.get('text')
         relationship = data.get('relationship', 'stranger')
         session_id = data.get('sessionId', None)
+        if MAX_TEXT_CHARS and len(text) > MAX_TEXT_CHARS:
+            count_request('analyze', 413)
+            return jsonify({'error': f'Text is longer than {MAX_TEXT_CHARS} characters'}), 413
+        timer.mark('parse')
+        
+        # Log the request with session ID for tracking; the text itself is not logged
+        logger.debug("Analyzing %d chars with relationship: %s, session_id: %s",
+                     len(text), relationship, session_id)
+        
+        # Analyze text (coalesced with concurrent requests when batching is on)
+        with admission.admit(session_id):
+            if profiler is not None and profiler.sample(PROFILE_EVERY):
+                result = score_profiled(text, relationship, session_id)
+            elif analyze_batcher is not None:
+                degrade = analyze_batcher.queue_depth >= DEGRADE_QUEUE_DEPTH
+                result = score_coalesced((text, relationship, session_id, deadline, degrade), deadline)
+            else:
+                result = calculator.calculate_emotion(text, relationship=relationship,
+                                                      session_id=session_id, deadline=deadline)
+        timer.mark('score')
+        
+        response = format_analysis(result, relationship)
+        response['ai_models'] = AI_MODELS
+        body = jsonify(response)
+        timer.mark('serialize')
+        
+        count_request('analyze', 200)
+        return body
+    except Overloaded as e:
+        return overloaded_response('analyze', e)
+    except InputTooLarge as e:
+        count_request('analyze', 413)
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        logger.error("Error in /analyze: %s", e)
+        count_request('analyze', 500)
+        return jsonify({'error': str(e)}), 500
+
+def overloaded_response(endpoint, error):
+    """Build the 429 (per-session limit) or 503 (server at capacity) response for a rejected request."""
+    status = 429 if error.per_key else 503
+    count_request(endpoint, status)
+    response = jsonify({'error': str(error)})
+    response.headers['Retry-After'] = str(math.ceil(error.retry_after))
+    return response, status
+
+def score_coalesced(item, deadline):
+    """Score an item through the batcher, giving up once it is a full budget past its deadline."""
+    future = analyze_batcher.submit(item)
+    timeout = None
+    if deadline is not None:
+        timeout = max(deadline - time.monotonic(), 0.0) + DEADLINE_MS / 1000.0
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        # Drop the item if it has not been picked up, so the batcher does not do wasted work
+        future.cancel()
+        raise Overloaded('Timed out waiting for the analysis', admission.retry_after)
+
+def score_profiled(text, relationship, session_id):
+    """Score a sampled request on this thread under the profiler."""
+    with profiler.profile(calculator, f'analyze-{os.getpid()}') as run:
+        result = calculator.calculate_emotion(text, relationship=relationship, session_id=session_id)
+    if run is not None:
+        logger.info("Profiled an /analyze request into %s", ', '.join(run.paths))
+    return result
+
+@app.route('/analyze/delta', methods=['POST'])
+def analyze_delta():
+    """Re-analyze a session's draft from an edit, re-running NLP only on changed sentences."""
+    timer = StageTimer(metrics, 'request_seconds', {'endpoint': 'analyze_delta'})
+    deadline = time.monotonic() + DEADLINE_MS / 1000.0 if DEADLINE_MS else None
+    try:
+        data = request.get_json(silent=True)
+        error = validate_delta(data)
+        if error is not None:
+            count_request('analyze_delta', 400)
+            return jsonify({'error': error}), 400
+        
+        # Either the full text, or edits {"start", "end", "text"} against "version"
+        text = data.get('text')
+        edits = None
+        if text is None:
+            edits = [(edit['start'], edit['end'], edit.get('text', ''))
+                     for edit in data.get('edits') or []]
+        relationship = data.get('relationship', 'stranger')
+        timer.mark('parse')
+        
+        try:
+            with admission.admit(data['sessionId']):
+                update = calculator.calculate_incremental(data['sessionId'], text=text, edits=edits,
+                                                          version=data.get('version'),
+                                                          relationship=relationship,
+                                                          deadline=deadline)
+        except DeltaConflict as e:
+            # The client is out of sync and should resend the full text
+            count_request('analyze_delta', 409)
+            return jsonify({'error': str(e), 'version': e.version}), 409
+        timer.mark('score')
+        
+        response = format_analysis(update.result, relationship)
+        response.update({'version': update.version, 'analyzed': update.analyzed,
+                         'reused': update.reused})
+        body = jsonify(response)
+        timer.mark('serialize')
         
-        # Create context with relationship info
-        context = {
-            'relationship': relationship,
-            'trust_level': 'High' if relationship in ['friend', 'family'] else 'Medium' if relationship == 'colleague' else 'Low',
-            'formality': 'Formal' if relationship in ['colleague', 'stranger'] else 'Casual'
-        }
-        
-        # Log the request with session ID for tracking
-        logger.info(f"Analyzing text: '{text}' with relationship: {relationship}, session_id: {session_id}")
-        
-        # Analyze text
-        semantic_results = semantic_analyzer.analyze_text(text)
-        emotion_scores = emotion_mapper.map_emotions(semantic_results, context)
-        
-        # Get dominant emotion
-        dominant_emotion = max(emotion_scores.items(), key=lambda x: x[1])[0]
-        
-        # Get sentiment value and label
-        sentiment_value = semantic_results.get('sentiment', 0)
-        sentiment_label = get_sentiment_label(sentiment_value)
-        
-        # Prepare response with consistent format for sentiment
-        response = {
-            'emotions': emotion_scores,
-            'dominant_emotion': dominant_emotion,
-            'sentiment': {
-                'score': sentiment_value,
-                'label': sentiment_label
-            },
-            'context': context,
-            'ai_models': AI_MODELS,
-        }
-        
-        # For backward compatibility
-        response['sentiment_value'] = sentiment_value
-        response['sentiment_label'] = sentiment_label
-        
-        return jsonify(response)
+        count_request('analyze_delta', 200)
+        return body
+    except Overloaded as e:
+        return overloaded_response('analyze_delta', e)
+    except InputTooLarge as e:
+        count_request('analyze_delta', 413)
+        return jsonify({'error': str(e)}), 413
+    except (KeyError, TypeError, ValueError) as e:
+        count_request('analyze_delta', 400)
+        return jsonify({'error': f'Invalid edit: {e}'}), 400
     except Exception as e:
-        logger.error(f"Error in /analyze: {str(e)}")
+        logger.error("Error in /analyze/delta: %s", e)
+        count_request('analyze_delta', 500)
         return jsonify({'error': str(e)}), 500
 
+def count_request(endpoint, status):
+    """Count a handled request when metrics are enabled."""
+    if metrics is not None:
+        metrics.inc('requests', labels={'endpoint': endpoint, 'status': str(status)})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose metrics in the Prometheus text format (EMOTION_METRICS=1)."""
+    if metrics is None:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def read_bulk_items():
+    """Yield (index, item or error message) pairs from a JSON array or NDJSON request body."""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        lines = (line for line in request.stream if line.strip())
+        for index, line in enumerate(lines):
+            try:
+                yield index, json.loads(line)
+            except ValueError as e:
+                yield index, f"Invalid JSON: {e}"
+        return
+    
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of items or an NDJSON body')
+    for index, item in enumerate(data):
+        yield index, item
+
+def validate_bulk_item(item):
+    """Return an error message for an unusable bulk item, or None."""
+    if isinstance(item, str):
+        return item
+    error = validate_item(item)
+    if error is None and MAX_TEXT_CHARS and len(item['text']) > MAX_TEXT_CHARS:
+        error = f'Text is longer than {MAX_TEXT_CHARS} characters'
+    return error
+
+def score_bulk_chunk(chunk):
+    """Score valid items of a chunk together, isolating failures to single items."""
+    texts = [item['text'] for _, item in chunk]
+    relationships = [item.get('relationship', 'stranger') for _, item in chunk]
+    session_ids = [item.get('sessionId') for _, item in chunk]
+    # The stream is open-ended, so each chunk gets its own deadline
+    deadline = time.monotonic() + DEADLINE_MS / 1000.0 if DEADLINE_MS else None
+    try:
+        return calculator.calculate_emotions(texts, relationships=relationships,
+                                             batch_size=BULK_CHUNK_SIZE,
+                                             session_ids=session_ids, deadline=deadline)
+    except Exception:
+        # Fall back to one call per item so one bad item does not fail the others
+        results = []
+        for text, relationship, session_id in zip(texts, relationships, session_ids):
+            try:
+                results.append(calculator.calculate_emotion(text, relationship=relationship,
+                                                            session_id=session_id,
+                                                            deadline=deadline))
+            except Exception as e:
+                results.append(e)
+        return results
+
+def analyze_bulk(items):
+    """Yield one NDJSON line per item, scoring valid items in chunks."""
+    for chunk in iter(lambda: list(itertools.islice(items, BULK_CHUNK_SIZE)), []):
+        valid = []
+        for index, item in chunk:
+            error = validate_bulk_item(item)
+            if error is not None:
+                yield json.dumps({'index': index, 'error': error}) + '\n'
+            else:
+                valid.append((index, item))
+        
+        if not valid:
+            continue
+        for (index, item), result in zip(valid, score_bulk_chunk(valid)):
+            line = {'index': index, 'sessionId': item.get('sessionId')}
+            if isinstance(result, Exception):
+                logger.error("Error in /analyze/batch item %d: %s", index, result)
+                line['error'] = str(result)
+            else:
+                line.update(format_analysis(result, item.get('relationship', 'stranger')))
+            yield json.dumps(line) + '\n'
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Analyze many texts and stream NDJSON results as each chunk finishes."""
+    try:
+        items = read_bulk_items()
+        first = next(items, None)
+    except ValueError as e:
+        count_request('analyze_batch', 400)
+        return jsonify({'error': str(e)}), 400
+    
+    if first is None:
+        count_request('analyze_batch', 200)
+        return Response('', mimetype='application/x-ndjson')
+    
+    # The whole request holds one admission slot until its response is closed
+    slot = admission.admit()
+    try:
+        slot.__enter__()
+    except Overloaded as e:
+        return overloaded_response('analyze_batch', e)
+    count_request('analyze_batch', 200)
+    items = itertools.chain([first], items)
+    response = Response(stream_with_context(analyze_bulk(items)), mimetype='application/x-ndjson')
+    response.call_on_close(lambda: slot.__exit__(None, None, None))
+    return response
+
 @app.route('/feedback', methods=['POST'])
 def feedback():
     """Store user feedback for model improvement."""
@@ -123,50 +518,44 @@ def feedback():
         # Add timestamp if not provided
         if 'timestamp' not in data:
             data['timestamp'] = datetime.now().isoformat()
-            
-        # Generate unique filename based on session ID and timestamp
+        
+        # Append feedback to the store
         session_id = data.get('sessionId', 'unknown')
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"feedback_{session_id}_{timestamp}.json"
+        feedback_store.add(data)
         
-        # Write feedback to file
-        with open(os.path.join(FEEDBACK_DIR, filename), 'w') as f:
-            json.dump(data, f, indent=2)
-            
         logger.info(f"Feedback received from session {session_id}: Rating {data.get('rating', 'none')}")
         
         return jsonify({'success': True, 'message': 'Feedback received, thank you!'})
-        
+    
     except Exception as e:
         app.logger.error(f"Error storing feedback: {str(e)}")
         return jsonify({'error': str(e)}), 500
-        
+
 @app.route('/feedback/report', methods=['GET'])
 def feedback_report():
     """Generate a report of collected feedback (admin only)."""
     # This would typically have authentication, but we'll skip it for simplicity
     try:
-        # Read all feedback files
-        feedback_files = [f for f in os.listdir(FEEDBACK_DIR) if f.endswith('.json')]
-        feedback_data = []
-        
-        for filename in feedback_files:
-            try:
-                with open(os.path.join(FEEDBACK_DIR, filename), 'r') as f:
-                    data = json.load(f)
-                    feedback_data.append(data)
-            except Exception as e:
-                logger.error(f"Error reading feedback file {filename}: {str(e)}")
+        page = max(request.args.get('page', 1, type=int), 1)
+        session_id = request.args.get('session') or None
         
-        # Generate some simple stats
-        total_entries = len(feedback_data)
-        avg_rating = sum(entry.get('rating', 0) for entry in feedback_data) / total_entries if total_entries > 0 else 0
+        # Stats come from aggregates maintained on every insert
+        summary = feedback_store.summary()
+        feedback_data = feedback_store.page(page=page, per_page=FEEDBACK_PAGE_SIZE,
+                                            session_id=session_id)
+        matching = summary['total_entries'] if session_id is None else feedback_store.count(session_id)
+        total_pages = max((matching + FEEDBACK_PAGE_SIZE - 1) // FEEDBACK_PAGE_SIZE, 1)
         
         return render_template('feedback_report.html', 
                               feedback_data=feedback_data, 
-                              total_entries=total_entries,
-                              avg_rating=avg_rating)
-                              
+                              total_entries=summary['total_entries'],
+                              avg_rating=summary['avg_rating'],
+                              rating_histogram=summary['rating_histogram'],
+                              comment_count=summary['comment_count'],
+                              page=page,
+                              total_pages=total_pages,
+                              session_id=session_id)
+    
     except Exception as e:
         app.logger.error(f"Error generating feedback report: {str(e)}")
         return jsonify({'error': str(e)}), 500